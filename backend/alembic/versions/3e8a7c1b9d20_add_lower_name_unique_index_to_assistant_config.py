@@ -0,0 +1,58 @@
+"""add_lower_name_unique_index_to_assistant_config
+
+Revision ID: 3e8a7c1b9d20
+Revises: b9a1c0d2e3f4
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3e8a7c1b9d20"
+down_revision = "b9a1c0d2e3f4"
+branch_labels = None
+depends_on = None
+
+
+def _assert_no_case_insensitive_duplicates(table: str) -> None:
+    """仅大小写不同的重名会让 lower(name) 唯一索引创建失败；先给出可操作的提示，而不是静默改名。"""
+    if op.get_context().as_sql:
+        # --sql 离线模式无法查询数据
+        return
+    rows = op.get_bind().execute(
+        sa.text(
+            f"SELECT lower(name) AS key, string_agg(name, ', ' ORDER BY name) AS names "
+            f"FROM {table} GROUP BY lower(name) HAVING count(*) > 1"
+        )
+    ).all()
+    if rows:
+        conflicts = "; ".join(f"[{row.names}]" for row in rows)
+        raise RuntimeError(
+            f"Cannot add a case-insensitive unique index on {table}.name: "
+            f"rename or delete these case-only duplicates first: {conflicts}"
+        )
+
+
+def upgrade() -> None:
+    _assert_no_case_insensitive_duplicates("assistant_tool")
+    _assert_no_case_insensitive_duplicates("assistant_skill")
+    op.create_index(
+        "uq_assistant_tool_lower_name",
+        "assistant_tool",
+        [sa.text("lower(name)")],
+        unique=True,
+    )
+    op.create_index(
+        "uq_assistant_skill_lower_name",
+        "assistant_skill",
+        [sa.text("lower(name)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_assistant_skill_lower_name", table_name="assistant_skill")
+    op.drop_index("uq_assistant_tool_lower_name", table_name="assistant_tool")
@@ -0,0 +1,61 @@
+"""add_claimable_partial_indexes_to_attachment_parse_outbox
+
+Revision ID: 5b7d2e9f1a34
+Revises: 3e8a7c1b9d20
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5b7d2e9f1a34"
+down_revision = "3e8a7c1b9d20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY 不能在事务内执行
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_attachment_parse_outbox_claimable",
+            "attachment_parse_outbox",
+            ["available_at", "created_at"],
+            postgresql_where=sa.text("status IN ('pending', 'processing')"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_attachment_parse_outbox_locked_at",
+            "attachment_parse_outbox",
+            ["locked_at"],
+            postgresql_where=sa.text("status = 'processing'"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_attachment_parse_outbox_pending",
+            table_name="attachment_parse_outbox",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_attachment_parse_outbox_pending",
+            "attachment_parse_outbox",
+            ["status", "available_at"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_attachment_parse_outbox_locked_at",
+            table_name="attachment_parse_outbox",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_attachment_parse_outbox_claimable",
+            table_name="attachment_parse_outbox",
+            postgresql_concurrently=True,
+        )
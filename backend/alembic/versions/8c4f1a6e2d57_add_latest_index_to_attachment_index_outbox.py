@@ -0,0 +1,48 @@
+"""add_latest_index_to_attachment_index_outbox
+
+Revision ID: 8c4f1a6e2d57
+Revises: 5b7d2e9f1a34
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8c4f1a6e2d57"
+down_revision = "5b7d2e9f1a34"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_attachment_outbox_attachment_latest",
+            "attachment_index_outbox",
+            ["attachment_id", sa.text("updated_at DESC"), sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+        # 新索引以 attachment_id 为前缀，已覆盖旧的单列索引
+        op.drop_index(
+            "idx_attachment_outbox_attachment_id",
+            table_name="attachment_index_outbox",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_attachment_outbox_attachment_id",
+            "attachment_index_outbox",
+            ["attachment_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_attachment_outbox_attachment_latest",
+            table_name="attachment_index_outbox",
+            postgresql_concurrently=True,
+        )
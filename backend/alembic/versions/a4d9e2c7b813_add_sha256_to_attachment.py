@@ -0,0 +1,24 @@
+"""add_sha256_to_attachment
+
+Revision ID: a4d9e2c7b813
+Revises: 8c4f1a6e2d57
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a4d9e2c7b813"
+down_revision = "8c4f1a6e2d57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("attachment", sa.Column("sha256", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("attachment", "sha256")
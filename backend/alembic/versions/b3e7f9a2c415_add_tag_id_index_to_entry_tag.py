@@ -0,0 +1,35 @@
+"""add_tag_id_index_to_entry_tag
+
+Revision ID: b3e7f9a2c415
+Revises: a4d9e2c7b813
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+
+
+revision = "b3e7f9a2c415"
+down_revision = "a4d9e2c7b813"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY 不能在事务内执行
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_entry_tag_tag_id",
+            "entry_tag",
+            ["tag_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_entry_tag_tag_id",
+            table_name="entry_tag",
+            postgresql_concurrently=True,
+        )
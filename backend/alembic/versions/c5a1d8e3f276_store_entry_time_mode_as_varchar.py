@@ -0,0 +1,44 @@
+"""store_entry_time_mode_as_varchar
+
+Revision ID: c5a1d8e3f276
+Revises: b3e7f9a2c415
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c5a1d8e3f276"
+down_revision = "b3e7f9a2c415"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "entry",
+        "time_mode",
+        type_=sa.String(length=8),
+        existing_nullable=False,
+        postgresql_using="time_mode::text",
+    )
+    op.create_check_constraint(
+        "ck_entry_time_mode",
+        "entry",
+        "time_mode IN ('NONE', 'POINT', 'RANGE')",
+    )
+    op.execute("DROP TYPE IF EXISTS timemode")
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_entry_time_mode", "entry", type_="check")
+    op.execute("CREATE TYPE timemode AS ENUM ('NONE', 'POINT', 'RANGE')")
+    op.alter_column(
+        "entry",
+        "time_mode",
+        type_=sa.Enum("NONE", "POINT", "RANGE", name="timemode"),
+        existing_nullable=False,
+        postgresql_using="time_mode::timemode",
+    )
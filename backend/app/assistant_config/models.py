@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, JSON, String, Text
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, JSON, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -45,6 +45,11 @@ class AssistantTool(UuidPrimaryKeyMixin, TimestampMixin, Base):
     timeout_seconds = Column(Integer, nullable=True)
     payload_wrapper = Column(String(64), nullable=True)
 
+    __table_args__ = (
+        # 名称大小写不敏感唯一：支撑 lower(name) 等值查重走索引
+        Index("uq_assistant_tool_lower_name", func.lower(name), unique=True),
+    )
+
 
 class AssistantSkill(UuidPrimaryKeyMixin, TimestampMixin, Base):
     """AI 助手技能配置"""
@@ -73,6 +78,11 @@ class AssistantSkill(UuidPrimaryKeyMixin, TimestampMixin, Base):
         order_by="AssistantSkillStep.step_order.asc()",
     )
 
+    __table_args__ = (
+        # 名称大小写不敏感唯一：支撑 lower(name) 等值查重走索引
+        Index("uq_assistant_skill_lower_name", func.lower(name), unique=True),
+    )
+
 
 class AssistantSkillStep(UuidPrimaryKeyMixin, TimestampMixin, Base):
     """AI 助手技能步骤"""
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import inspect
 from dataclasses import dataclass
 from typing import Any, get_args, get_origin
@@ -33,12 +34,42 @@ class SystemToolFullDefinition:
     json_schema: dict | None
 
 
+@dataclass(frozen=True)
+class NormalizedSkillStep:
+    """系统技能步骤的规范化视图：所有字段显式存在，热路径无需 getattr 兜底。"""
+    type: str
+    instruction: str | None
+    tool_name: str | None
+    args_from: str | None
+    args_template: str | None
+    output_mode: str | None
+    output_fields: Any
+    include_in_summary: bool
+
+    @classmethod
+    def from_step(cls, step: Any) -> "NormalizedSkillStep":
+        include_in_summary = getattr(step, "include_in_summary", True)
+        return cls(
+            type=step.type,
+            instruction=getattr(step, "instruction", None),
+            tool_name=getattr(step, "tool_name", None),
+            args_from=getattr(step, "args_from", None),
+            args_template=getattr(step, "args_template", None),
+            output_mode=getattr(step, "output_mode", None),
+            output_fields=getattr(step, "output_fields", None),
+            include_in_summary=True if include_in_summary is None else bool(include_in_summary),
+        )
+
+
 class ToolRegistry:
     """工具注册表 - 解析系统本地工具和数据库自定义工具"""
 
     # 内部系统工具：不对外展示，但仍可在运行时被内部逻辑调用
     INTERNAL_TOOL_NAMES: frozenset[str] = frozenset({"kb_search"})
 
+    # 系统工具定义的序列化结果缓存（代码定义不可变，进程内仅构建一次）
+    _definition_payload_cache: dict[str, dict] | None = None
+
     @staticmethod
     def list_system_tools() -> list[SystemToolDefinition]:
         from app.assistant import tools as assistant_tools
@@ -87,6 +118,40 @@ class ToolRegistry:
             ))
         return results
 
+    @classmethod
+    def system_tool_definition_payloads(cls) -> dict[str, dict]:
+        """返回按名称索引的系统工具定义（已序列化为 dict，不含 enabled 覆盖）。
+
+        返回缓存的深拷贝：嵌套的 input_params / json_schema 也不与缓存共享，调用方可自由修改。
+        """
+        if cls._definition_payload_cache is None:
+            cls._definition_payload_cache = {
+                d.name: {
+                    "name": d.name,
+                    "description": d.description or None,
+                    "kind": "local",
+                    "is_system": True,
+                    "input_params": [
+                        {
+                            "name": p.name,
+                            "description": p.description,
+                            "param_type": p.param_type,
+                            "required": p.required,
+                        }
+                        for p in (d.input_params or [])
+                    ],
+                    "returns": d.returns,
+                    "json_schema": d.json_schema,
+                }
+                for d in cls.list_system_tool_definitions()
+            }
+        return copy.deepcopy(cls._definition_payload_cache)
+
+    @classmethod
+    def clear_definition_cache(cls) -> None:
+        """清空系统工具定义缓存（工具模块变更或测试隔离时使用）。"""
+        cls._definition_payload_cache = None
+
     @staticmethod
     def resolve_system_tool(tool_name: str) -> Any | None:
         from app.assistant import tools as assistant_tools
@@ -310,11 +375,24 @@ class ToolRegistry:
 class SkillRegistry:
     """技能注册表 - 解析系统技能和数据库自定义技能"""
 
+    # 系统技能步骤规范化缓存：id(skill) -> (skill, steps)，保留 skill 引用以确保 id 不被复用
+    _normalized_steps_cache: dict[int, tuple[Any, tuple[NormalizedSkillStep, ...]]] = {}
+
     @staticmethod
     def list_system_skills() -> list[Any]:
         from app.assistant.skills.definitions import SKILLS
         return list(SKILLS)
 
+    @classmethod
+    def normalized_steps(cls, skill: Any) -> tuple[NormalizedSkillStep, ...]:
+        """返回系统技能定义的规范化步骤（按技能对象缓存）。"""
+        cached = cls._normalized_steps_cache.get(id(skill))
+        if cached is not None and cached[0] is skill:
+            return cached[1]
+        steps = tuple(NormalizedSkillStep.from_step(step) for step in (skill.steps or []))
+        cls._normalized_steps_cache[id(skill)] = (skill, steps)
+        return steps
+
     def __init__(self, db: Session):
         self.db = db
 
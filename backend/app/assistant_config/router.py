@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
 from app.assistant_config.schemas import (
@@ -13,7 +13,6 @@ from app.assistant_config.schemas import (
     AssistantToolResponse,
     AssistantToolUpdateRequest,
     ResetSkillRequest,
-    SystemToolDefinitionResponse,
     SystemToolEnabledUpdateRequest,
 )
 from app.assistant_config.service import AssistantConfigService
@@ -30,17 +29,15 @@ def list_system_tool_definitions(
     include_disabled: bool = Query(True, description="是否包含已禁用的系统工具"),
     include_schema: bool = Query(True, description="是否包含 JSON Schema"),
     db: Session = Depends(get_db),
-) -> ApiResponse:
+) -> Response:
     """获取系统工具完整定义（从代码获取，非数据库）。"""
     service = AssistantConfigService(db)
-    items = service.list_system_tool_definitions(
+    # 缓存中已是按响应模型序列化好的 JSON，直接拼入响应
+    body = service.system_tool_definitions_json(
         include_disabled=include_disabled,
         include_schema=include_schema,
     )
-    return ApiResponse.ok([
-        SystemToolDefinitionResponse.model_validate(i).model_dump(by_alias=True)
-        for i in items
-    ])
+    return ApiResponse.ok_json_raw(body)
 
 
 @router.put("/system-tools/{name}/enabled", response_model=ApiResponse)
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import time
+import uuid
 from typing import Any
 
 from app.assistant.skills.base import DEFAULT_SKILL_NAME, OutputFieldSpec
 from app.assistant.skills.converters import db_skill_to_definition_light
 
+from pydantic import TypeAdapter
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 from app.ai_provider.crypto import api_key_hint, encrypt_api_key
 from app.assistant_config.models import AssistantSkill, AssistantSkillStep, AssistantTool
@@ -16,8 +24,10 @@ from app.assistant_config.schemas import (
     AssistantSkillUpdateRequest,
     AssistantToolCreateRequest,
     AssistantToolUpdateRequest,
+    SystemToolDefinitionResponse,
 )
 from app.common.exceptions import ApiException
+from app.common.time import utcnow
 
 
 def serialize_output_fields(raw: Any) -> list[dict] | list[str] | None:
@@ -46,10 +56,85 @@ def serialize_output_fields(raw: Any) -> list[dict] | list[str] | None:
     return None
 
 
+# 系统工具覆盖记录需清空的 remote 配置字段（定义信息以代码为准，不落库）
+_REMOTE_TOOL_CONFIG_FIELDS = (
+    "description",
+    "input_params",
+    "endpoint_url",
+    "http_method",
+    "headers",
+    "query_params",
+    "body_type",
+    "body_content",
+    "auth_type",
+    "auth_header_name",
+    "auth_scheme",
+    "api_key_encrypted",
+    "api_key_hint",
+    "timeout_seconds",
+    "payload_wrapper",
+)
+
+
+_SYSTEM_TOOL_DEFINITIONS_ADAPTER = TypeAdapter(list[SystemToolDefinitionResponse])
+
+
+def _dialect_insert(db: Session):
+    """按当前连接方言返回支持 ON CONFLICT 的 insert 构造器（PostgreSQL / SQLite）。"""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+# 名称唯一性由两个索引共同保证：原有的 name 唯一索引（完全同名）与 lower(name) 唯一索引（仅大小写不同）；
+# PostgreSQL 按索引创建顺序检查，完全同名的并发插入先命中前者。
+# 表名.列名 形式用于 SQLite 的错误文本（"UNIQUE constraint failed: assistant_tool.name"）。
+_TOOL_NAME_UNIQUE_CONSTRAINTS = ("ix_assistant_tool_name", "uq_assistant_tool_lower_name", "assistant_tool.name")
+_SKILL_NAME_UNIQUE_CONSTRAINTS = ("ix_assistant_skill_name", "uq_assistant_skill_lower_name", "assistant_skill.name")
+
+
+def _violates_constraint(exc: IntegrityError, names: tuple[str, ...]) -> bool:
+    """IntegrityError 是否由给定约束 / 索引之一触发（psycopg2 取 diag，其余方言匹配错误文本）。"""
+    diag = getattr(exc.orig, "diag", None)
+    constraint_name = getattr(diag, "constraint_name", None)
+    if constraint_name:
+        return constraint_name in names
+    message = str(exc.orig)
+    return any(name in message for name in names)
+
+
 class AssistantConfigService:
+    # 进程内列表缓存：key 含 overlay 版本号，工具写路径递增版本即失效；
+    # TTL 兜底多进程部署下其他 worker 的写入。
+    LIST_CACHE_TTL_SECONDS: float = 5.0
+    LIST_CACHE_MAX_ENTRIES: int = 32
+    _overlay_version: int = 0
+    # 值为 (写入时间, 定义列表, 预序列化的 camelCase JSON)
+    _list_cache: dict[tuple, tuple[float, list[dict], bytes]] = {}
+
+    # 本进程已同步的系统定义版本：代码定义未变化时，列表接口跳过同步
+    _synced_tools_version: str | None = None
+    _synced_skills_version: str | None = None
+
     def __init__(self, db: Session):
         self.db = db
 
+    @staticmethod
+    def _definitions_version(items: Any) -> str:
+        return hashlib.blake2b(repr(sorted(items)).encode("utf-8"), digest_size=16).hexdigest()
+
+    @classmethod
+    def reset_sync_state(cls) -> None:
+        """标记系统工具/技能需要重新同步（写操作可能引入需清理的记录时调用）。"""
+        cls._synced_tools_version = None
+        cls._synced_skills_version = None
+
+    @classmethod
+    def invalidate_list_cache(cls) -> None:
+        """递增 overlay 版本并清空列表缓存（任何工具写操作提交后调用）。"""
+        cls._overlay_version += 1
+        cls._list_cache.clear()
+
     # -------------------------
     # System seed / sync
     # -------------------------
@@ -67,49 +152,46 @@ class AssistantConfigService:
 
         system_names = {t.name for t in system if getattr(t, "name", None)}
         internal_names = set(ToolRegistry.INTERNAL_TOOL_NAMES or [])
+        # 预先转为有序 tuple：避免每个 IN 子句重复构造，且参数顺序稳定便于语句缓存命中
+        system_names_t = tuple(sorted(system_names))
+        internal_names_t = tuple(sorted(internal_names))
 
         # 清理内部工具：不应出现在 DB 可配置工具列表/覆盖表里
-        if internal_names:
+        if internal_names_t:
             (
                 self.db.query(AssistantTool)
                 .filter(
                     (AssistantTool.is_system.is_(True)) | (AssistantTool.kind == "local"),
-                    AssistantTool.name.in_(tuple(internal_names)),
+                    AssistantTool.name.in_(internal_names_t),
                 )
                 .delete(synchronize_session=False)
             )
 
         # 清理：系统工具从代码定义获取，DB 中已移除的系统工具需要删除，避免在 UI/配置中继续出现
         stale_names: list[str] = []
-        if system_names:
-            stale_names_query = (
-                self.db.query(AssistantTool.name)
-                .filter(
+        if system_names_t:
+            # DELETE ... RETURNING：删除与获取被删名称合并为一次往返
+            stale_stmt = (
+                delete(AssistantTool)
+                .where(
                     (AssistantTool.is_system.is_(True))
-                    | (AssistantTool.kind == "local")  # 历史遗留：kind=local 但未标记 is_system
+                    | (AssistantTool.kind == "local"),  # 历史遗留：kind=local 但未标记 is_system
+                    ~AssistantTool.name.in_(system_names_t),
                 )
-                .filter(~AssistantTool.name.in_(tuple(system_names)))
+                .returning(AssistantTool.name)
             )
-            if internal_names:
-                stale_names_query = stale_names_query.filter(~AssistantTool.name.in_(tuple(internal_names)))
-
-            stale_names = [str(n) for (n,) in stale_names_query.all() if n]
-            if stale_names:
-                (
-                    self.db.query(AssistantTool)
-                    .filter(
-                        (AssistantTool.is_system.is_(True)) | (AssistantTool.kind == "local"),
-                        AssistantTool.name.in_(tuple(stale_names)),
-                    )
-                    .delete(synchronize_session=False)
-                )
+            if internal_names_t:
+                stale_stmt = stale_stmt.where(~AssistantTool.name.in_(internal_names_t))
+
+            deleted = self.db.execute(stale_stmt, execution_options={"synchronize_session": False})
+            stale_names = [str(n) for (n,) in deleted.all() if n]
 
             # 清理历史遗留：enabled=True 的系统工具落库记录不再需要（默认启用），仅保留 enabled=False 覆盖
             (
                 self.db.query(AssistantTool)
                 .filter(
                     (AssistantTool.is_system.is_(True)) | (AssistantTool.kind == "local"),
-                    AssistantTool.name.in_(tuple(system_names)),
+                    AssistantTool.name.in_(system_names_t),
                     AssistantTool.enabled.is_(True),
                 )
                 .delete(synchronize_session=False)
@@ -118,7 +200,13 @@ class AssistantConfigService:
         # 同时清理 skills.tools 里引用的已删除工具名，避免“技能配置里仍存在已删除工具”
         removed_names = internal_names.union(stale_names)
         if removed_names:
-            skills = self.db.query(AssistantSkill).all()
+            # 仅加载 tools 列，避免为清理引用而物化 system_prompt / intent_examples 等大字段
+            skills = (
+                self.db.query(AssistantSkill)
+                .options(load_only(AssistantSkill.id, AssistantSkill.tools))
+                .filter(AssistantSkill.tools.isnot(None))
+                .all()
+            )
             for skill in skills:
                 tools = getattr(skill, "tools", None)
                 if not isinstance(tools, list):
@@ -132,6 +220,7 @@ class AssistantConfigService:
         except IntegrityError as exc:
             self.db.rollback()
             raise ApiException(status_code=409, code=40910, message="Sync system tools failed") from exc
+        self.invalidate_list_cache()
 
     def list_system_tool_definitions(
         self,
@@ -139,50 +228,62 @@ class AssistantConfigService:
         include_disabled: bool = True,
         include_schema: bool = True,
     ) -> list[dict]:
-        """返回系统工具完整定义：从代码提取，DB 仅用于 overlay enabled 状态。"""
-        from app.assistant_config.schemas import InputParamSchema
+        """返回系统工具完整定义：从代码提取，DB 仅用于 overlay enabled 状态。
 
-        definitions = ToolRegistry.list_system_tool_definitions()
-        names = [d.name for d in definitions]
+        返回缓存的深拷贝，调用方修改不会影响缓存。
+        """
+        items, _ = self._system_tool_definitions(include_disabled, include_schema)
+        return copy.deepcopy(items)
 
-        enabled_by_name: dict[str, bool] = {n: True for n in names}
+    def system_tool_definitions_json(
+        self,
+        *,
+        include_disabled: bool = True,
+        include_schema: bool = True,
+    ) -> bytes:
+        """同 list_system_tool_definitions，但返回预序列化的 camelCase JSON（缓存有效期内只序列化一次）。"""
+        _, body = self._system_tool_definitions(include_disabled, include_schema)
+        return body
+
+    def _system_tool_definitions(self, include_disabled: bool, include_schema: bool) -> tuple[list[dict], bytes]:
+        cls = type(self)
+        key = ("system_tool_definitions", include_disabled, include_schema, cls._overlay_version)
+        cached = cls._list_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < cls.LIST_CACHE_TTL_SECONDS:
+            return cached[1], cached[2]
+
+        payloads = ToolRegistry.system_tool_definition_payloads()
+        names = tuple(sorted(payloads))
+
+        enabled_by_name: dict[str, bool] = dict.fromkeys(names, True)
         if names:
-            rows = (
-                self.db.query(AssistantTool.name, AssistantTool.enabled)
-                .filter(
-                    AssistantTool.name.in_(tuple(names)),
+            rows = self.db.execute(
+                select(AssistantTool.name, AssistantTool.enabled).where(
+                    AssistantTool.name.in_(names),
                     AssistantTool.kind == "local",  # 仅使用 DB 里的 enabled 覆盖，不落库定义信息
                 )
-                .all()
             )
-            for name, enabled in rows:
-                enabled_by_name[str(name)] = bool(enabled)
+            enabled_by_name.update({str(name): bool(enabled) for name, enabled in rows})
 
         result: list[dict] = []
-        for d in definitions:
-            enabled = enabled_by_name.get(d.name, True)
+        for name, payload in payloads.items():
+            enabled = enabled_by_name.get(name, True)
             if not include_disabled and not enabled:
                 continue
 
-            result.append({
-                "name": d.name,
-                "description": d.description or None,
-                "kind": "local",
-                "is_system": True,
-                "enabled": enabled,
-                "input_params": [
-                    InputParamSchema(
-                        name=p.name,
-                        description=p.description,
-                        param_type=p.param_type,
-                        required=p.required,
-                    )
-                    for p in (d.input_params or [])
-                ],
-                "returns": d.returns,
-                "json_schema": d.json_schema if include_schema else None,
-            })
-        return result
+            item = {**payload, "enabled": enabled}
+            if not include_schema:
+                item["json_schema"] = None
+            result.append(item)
+
+        if len(cls._list_cache) >= cls.LIST_CACHE_MAX_ENTRIES:
+            cls._list_cache.clear()
+        # 定义来自代码，只在写入缓存时按响应模型校验、序列化一次
+        body = _SYSTEM_TOOL_DEFINITIONS_ADAPTER.dump_json(
+            _SYSTEM_TOOL_DEFINITIONS_ADAPTER.validate_python(result), by_alias=True
+        )
+        cls._list_cache[key] = (time.monotonic(), result, body)
+        return result, body
 
     def sync_system_skills(self) -> None:
         """同步系统技能到数据库"""
@@ -190,12 +291,17 @@ class AssistantConfigService:
         if not system_skills:
             return
 
+        # 一次查询取回所有同名记录，避免逐个技能 SELECT（N+1）
+        names = [s.name for s in system_skills]
+        existing_by_name = {
+            row.name: row
+            for row in self.db.execute(
+                select(AssistantSkill).where(AssistantSkill.name.in_(names))
+            ).scalars()
+        }
+
         for s in system_skills:
-            existing = (
-                self.db.query(AssistantSkill)
-                .filter(AssistantSkill.name == s.name)
-                .first()
-            )
+            existing = existing_by_name.get(s.name)
             if not existing:
                 # 构建 kb_config
                 kb_config_data = None
@@ -220,12 +326,12 @@ class AssistantConfigService:
                         instruction=step.instruction,
                         tool_name=step.tool_name,
                         args_from=step.args_from,
-                        args_template=getattr(step, "args_template", None),
-                        output_mode=getattr(step, "output_mode", None),
-                        output_fields=serialize_output_fields(getattr(step, "output_fields", None)),
-                        include_in_summary=getattr(step, "include_in_summary", True),
+                        args_template=step.args_template,
+                        output_mode=step.output_mode,
+                        output_fields=serialize_output_fields(step.output_fields),
+                        include_in_summary=step.include_in_summary,
                     )
-                    for i, step in enumerate(s.steps)
+                    for i, step in enumerate(SkillRegistry.normalized_steps(s))
                 ]
                 self.db.add(skill)
             else:
@@ -256,7 +362,12 @@ class AssistantConfigService:
     # -------------------------
     def list_tools(self, sync_system: bool = True, include_disabled: bool = False) -> list[AssistantTool]:
         if sync_system:
-            self.sync_system_tools()
+            version = self._definitions_version(
+                (t.name, t.description or "") for t in ToolRegistry.list_system_tools()
+            )
+            if AssistantConfigService._synced_tools_version != version:
+                self.sync_system_tools()
+                AssistantConfigService._synced_tools_version = version
         # 仅返回自定义（remote）工具；系统工具定义不落库
         q = (
             self.db.query(AssistantTool)
@@ -274,56 +385,48 @@ class AssistantConfigService:
         if name not in system_names:
             raise ApiException(status_code=404, code=40413, message=f"System tool not found: {name}")
 
-        record = self.db.query(AssistantTool).filter(AssistantTool.name == name).first()
-
         # 启用：删除覆盖（恢复默认 True）
         if enabled:
+            record = self.db.query(AssistantTool).filter(AssistantTool.name == name).first()
             if record is not None:
                 # 避免误删同名 remote 工具（理论上不应发生）
                 if (record.kind or "").lower() == "remote" and not record.is_system:
                     raise ApiException(status_code=409, code=40914, message=f"Tool name conflict: {name}")
                 self.db.delete(record)
             self.db.commit()
+            self.invalidate_list_cache()
             return
 
-        # 禁用：写入/更新覆盖记录
-        if record is None:
-            self.db.add(
-                AssistantTool(
-                    name=name,
-                    description=None,
-                    kind="local",
-                    is_system=True,
-                    enabled=False,
-                )
-            )
-        else:
-            if (record.kind or "").lower() == "remote" and not record.is_system:
+        # 禁用：单条 upsert 写入/覆盖记录，不落库定义信息
+        values = {
+            "name": name,
+            "kind": "local",
+            "is_system": True,
+            "enabled": False,
+            **dict.fromkeys(_REMOTE_TOOL_CONFIG_FIELDS),
+        }
+        stmt = _dialect_insert(self.db)(AssistantTool).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AssistantTool.name],
+            set_={**values, "updated_at": utcnow()},
+            # 同名 remote 工具不覆盖（理论上不应发生）
+            where=AssistantTool.is_system.is_(True) | (func.lower(AssistantTool.kind) != "remote"),
+        )
+        try:
+            result = self.db.execute(stmt)
+            if result.rowcount == 0:
                 raise ApiException(status_code=409, code=40914, message=f"Tool name conflict: {name}")
-            record.kind = "local"
-            record.is_system = True
-            record.enabled = False
-            # 不落库定义信息
-            record.description = None
-            record.input_params = None
-            record.endpoint_url = None
-            record.http_method = None
-            record.headers = None
-            record.query_params = None
-            record.body_type = None
-            record.body_content = None
-            record.auth_type = None
-            record.auth_header_name = None
-            record.auth_scheme = None
-            record.api_key_encrypted = None
-            record.api_key_hint = None
-            record.timeout_seconds = None
-            record.payload_wrapper = None
-
-        self.db.commit()
+            self.db.commit()
+            self.invalidate_list_cache()
+        except IntegrityError as exc:
+            self.db.rollback()
+            raise ApiException(status_code=409, code=40914, message=f"Tool name conflict: {name}") from exc
+        except ApiException:
+            self.db.rollback()
+            raise
 
     def get_tool(self, id: UUID) -> AssistantTool:
-        tool = self.db.query(AssistantTool).filter(AssistantTool.id == id).first()
+        tool = self.db.get(AssistantTool, id)
         if not tool:
             raise ApiException(status_code=404, code=40410, message=f"Tool not found: {id}")
         return tool
@@ -332,7 +435,11 @@ class AssistantConfigService:
         if request.kind == "local":
             raise ApiException(status_code=400, code=40010, message="kind=local is reserved for system tools")
 
-        existing = self.db.query(AssistantTool).filter(AssistantTool.name.ilike(request.name)).first()
+        existing = self.db.execute(
+            select(literal(1))
+            .where(func.lower(AssistantTool.name) == request.name.lower())
+            .limit(1)
+        ).scalar()
         if existing:
             raise ApiException(status_code=400, code=40011, message=f"Tool name already exists: {request.name}")
 
@@ -371,7 +478,13 @@ class AssistantConfigService:
             self.db.commit()
         except IntegrityError as exc:
             self.db.rollback()
+            # 并发创建同名工具时由 lower(name) 唯一索引兜底；其他约束失败保持原错误码
+            if _violates_constraint(exc, _TOOL_NAME_UNIQUE_CONSTRAINTS):
+                raise ApiException(
+                    status_code=400, code=40011, message=f"Tool name already exists: {request.name}"
+                ) from exc
             raise ApiException(status_code=409, code=40912, message="Create tool failed") from exc
+        self.invalidate_list_cache()
         self.db.refresh(tool)
         return tool
 
@@ -415,7 +528,8 @@ class AssistantConfigService:
                 tool.timeout_seconds = request.timeout_seconds
             if request.payload_wrapper is not None:
                 tool.payload_wrapper = request.payload_wrapper
-            if request.api_key is not None:
+            # 前端回传的脱敏占位值（即当前 hint）视为未修改，跳过重复加密
+            if request.api_key is not None and request.api_key != tool.api_key_hint:
                 tool.api_key_encrypted = encrypt_api_key(request.api_key)
                 tool.api_key_hint = api_key_hint(request.api_key)
 
@@ -424,6 +538,10 @@ class AssistantConfigService:
         except IntegrityError as exc:
             self.db.rollback()
             raise ApiException(status_code=409, code=40913, message="Update tool failed") from exc
+        self.invalidate_list_cache()
+        if tool.is_system:
+            # 系统工具 enabled=True 记录需由同步清理
+            AssistantConfigService._synced_tools_version = None
         self.db.refresh(tool)
         return tool
 
@@ -433,28 +551,37 @@ class AssistantConfigService:
             raise ApiException(status_code=400, code=40013, message="System tool cannot be deleted")
         self.db.delete(tool)
         self.db.commit()
+        self.invalidate_list_cache()
 
     # -------------------------
     # Skills CRUD
     # -------------------------
     def list_skills(self, sync_system: bool = True, include_disabled: bool = False) -> list[AssistantSkill]:
         if sync_system:
-            self.sync_system_skills()
+            version = self._definitions_version(
+                (s.name, s.description or "", s.mode or "", s.system_prompt or "")
+                for s in SkillRegistry.list_system_skills()
+            )
+            if AssistantConfigService._synced_skills_version != version:
+                self.sync_system_skills()
+                AssistantConfigService._synced_skills_version = version
         q = self.db.query(AssistantSkill).order_by(AssistantSkill.created_at.desc())
         if not include_disabled:
             q = q.filter(AssistantSkill.enabled.is_(True))
         return q.all()
 
     def get_skill(self, id: UUID) -> AssistantSkill:
-        skill = self.db.query(AssistantSkill).filter(AssistantSkill.id == id).first()
+        skill = self.db.get(AssistantSkill, id)
         if not skill:
             raise ApiException(status_code=404, code=40411, message=f"Skill not found: {id}")
         return skill
 
     def create_skill(self, request: AssistantSkillCreateRequest) -> AssistantSkill:
-        existing = self.db.query(AssistantSkill).filter(
-            AssistantSkill.name.ilike(request.name)
-        ).first()
+        existing = self.db.execute(
+            select(literal(1))
+            .where(func.lower(AssistantSkill.name) == request.name.lower())
+            .limit(1)
+        ).scalar()
         if existing:
             raise ApiException(status_code=400, code=40020, message=f"Skill name exists: {request.name}")
 
@@ -477,10 +604,10 @@ class AssistantConfigService:
                 tool_name=step.tool_name,
                 args_from=step.args_from,
                 args_template=step.args_template,
-                output_mode=getattr(step, "output_mode", None),
-                output_fields=serialize_output_fields(getattr(step, "output_fields", None)),
+                output_mode=step.output_mode,
+                output_fields=serialize_output_fields(step.output_fields),
                 include_in_summary=step.include_in_summary if step.include_in_summary is not None else True,
-                kb_config=getattr(step, "kb_config", None),
+                kb_config=step.kb_config,
             )
             for i, step in enumerate(request.steps)
         ]
@@ -489,7 +616,11 @@ class AssistantConfigService:
             self.db.commit()
         except IntegrityError as exc:
             self.db.rollback()
+            # 并发创建同名技能时由 lower(name) 唯一索引兜底；其他约束失败保持原错误码
+            if _violates_constraint(exc, _SKILL_NAME_UNIQUE_CONSTRAINTS):
+                raise ApiException(status_code=400, code=40020, message=f"Skill name exists: {request.name}") from exc
             raise ApiException(status_code=409, code=40920, message="Create skill failed") from exc
+        AssistantConfigService._synced_skills_version = None
         self.db.refresh(skill)
         return skill
 
@@ -525,10 +656,10 @@ class AssistantConfigService:
                         tool_name=step.tool_name,
                         args_from=step.args_from,
                         args_template=step.args_template,
-                        output_mode=getattr(step, "output_mode", None),
-                        output_fields=serialize_output_fields(getattr(step, "output_fields", None)),
+                        output_mode=step.output_mode,
+                        output_fields=serialize_output_fields(step.output_fields),
                         include_in_summary=step.include_in_summary if step.include_in_summary is not None else True,
-                        kb_config=getattr(step, "kb_config", None),
+                        kb_config=step.kb_config,
                     )
                     for i, step in enumerate(request.steps)
                 ]
@@ -567,10 +698,10 @@ class AssistantConfigService:
                         tool_name=step.tool_name,
                         args_from=step.args_from,
                         args_template=step.args_template,
-                        output_mode=getattr(step, "output_mode", None),
-                        output_fields=serialize_output_fields(getattr(step, "output_fields", None)),
+                        output_mode=step.output_mode,
+                        output_fields=serialize_output_fields(step.output_fields),
                         include_in_summary=step.include_in_summary if step.include_in_summary is not None else True,
-                        kb_config=getattr(step, "kb_config", None),
+                        kb_config=step.kb_config,
                     )
                     for i, step in enumerate(request.steps)
                 ]
@@ -580,6 +711,7 @@ class AssistantConfigService:
         except IntegrityError as exc:
             self.db.rollback()
             raise ApiException(status_code=409, code=40921, message="Update skill failed") from exc
+        AssistantConfigService._synced_skills_version = None
         self.db.refresh(skill)
         return skill
 
@@ -621,12 +753,12 @@ class AssistantConfigService:
                 instruction=step.instruction,
                 tool_name=step.tool_name,
                 args_from=step.args_from,
-                args_template=getattr(step, "args_template", None),
-                output_mode=getattr(step, "output_mode", None),
-                output_fields=serialize_output_fields(getattr(step, "output_fields", None)),
-                include_in_summary=getattr(step, "include_in_summary", True),
+                args_template=step.args_template,
+                output_mode=step.output_mode,
+                output_fields=serialize_output_fields(step.output_fields),
+                include_in_summary=step.include_in_summary,
             )
-            for i, step in enumerate(default.steps)
+            for i, step in enumerate(SkillRegistry.normalized_steps(default))
         ]
         skill.enabled = enabled
 
@@ -635,6 +767,7 @@ class AssistantConfigService:
         except IntegrityError as exc:
             self.db.rollback()
             raise ApiException(status_code=409, code=40922, message="Reset skill failed") from exc
+        AssistantConfigService._synced_skills_version = None
         self.db.refresh(skill)
         return skill
 
@@ -644,133 +777,135 @@ class AssistantConfigService:
             raise ApiException(status_code=400, code=40022, message="System skill cannot be deleted")
         self.db.delete(skill)
         self.db.commit()
+        AssistantConfigService._synced_skills_version = None
 
     def reset_all_system_skills(self, confirm: bool) -> dict:
         """重置所有系统技能到默认配置，并清理已下线的系统技能"""
         if not confirm:
             raise ApiException(status_code=400, code=40023, message="confirm=true required")
 
-        from app.assistant.skills.definitions import SKILLS, get_skill_by_name
+        from app.assistant.skills.definitions import SKILLS
 
-        # 获取代码侧系统技能名称集合
-        default_names = {s.name for s in SKILLS}
+        # 代码侧系统技能（按名称索引）
+        defaults_by_name = {s.name: s for s in SKILLS}
 
-        # 获取 DB 中所有系统技能
-        db_system_skills = (
-            self.db.query(AssistantSkill)
-            .filter(AssistantSkill.is_system.is_(True))
-            .all()
-        )
+        # 获取 DB 中所有系统技能：仅查询所需列，不加载 ORM 对象与 steps
+        db_system_skills = self.db.execute(
+            select(AssistantSkill.id, AssistantSkill.name, AssistantSkill.enabled)
+            .where(AssistantSkill.is_system.is_(True))
+        ).all()
 
-        reset_count = 0
-        deleted_count = 0
-        created_count = 0
+        reset_rows: list[dict] = []
+        step_rows: list[dict] = []
+        deleted_ids: list[Any] = []
         affected: list[dict] = []
 
-        # 处理 DB 中已存在的系统技能
-        for skill in db_system_skills:
-            if skill.name in default_names:
-                # 重置到默认配置
-                default = get_skill_by_name(skill.name)
-                if default:
-                    self._reset_skill_to_default(skill, default)
-                    reset_count += 1
-                    affected.append({"name": skill.name, "id": str(skill.id), "action": "reset"})
+        # 处理 DB 中已存在的系统技能：分区为“重置”与“已下线删除”
+        for skill_id, name, enabled in db_system_skills:
+            default = defaults_by_name.get(name)
+            if default is not None:
+                reset_rows.append({
+                    "id": skill_id,
+                    **self._default_skill_values(default),
+                    # 保留 enabled 状态（general_chat 强制启用）
+                    "enabled": True if name == DEFAULT_SKILL_NAME else enabled,
+                })
+                step_rows.extend(self._default_step_rows(skill_id, default))
+                affected.append({"name": name, "id": str(skill_id), "action": "reset"})
             else:
-                # 已下线的系统技能，删除
-                for old_step in skill.steps:
-                    self.db.delete(old_step)
-                self.db.delete(skill)
-                deleted_count += 1
-                affected.append({"name": skill.name, "id": str(skill.id), "action": "deleted"})
+                deleted_ids.append(skill_id)
+                affected.append({"name": name, "id": str(skill_id), "action": "deleted"})
+
+        # 旧 steps 一次性删除（重置与下线技能均需清理，避免唯一约束冲突）
+        if db_system_skills:
+            self.db.execute(
+                delete(AssistantSkillStep).where(
+                    AssistantSkillStep.skill_id.in_([row.id for row in db_system_skills])
+                ),
+                execution_options={"synchronize_session": False},
+            )
+        if deleted_ids:
+            self.db.execute(
+                delete(AssistantSkill).where(AssistantSkill.id.in_(deleted_ids)),
+                execution_options={"synchronize_session": False},
+            )
+        if reset_rows:
+            self.db.execute(update(AssistantSkill), reset_rows)
 
-        # 创建缺失的系统技能
-        existing_names = {s.name for s in db_system_skills}
+        # 创建缺失的系统技能：主键在应用侧生成，技能与 steps 各一次批量写入
+        existing_names = {row.name for row in db_system_skills}
+        created_rows: list[dict] = []
         for s in SKILLS:
-            if s.name not in existing_names:
-                kb_config_data = None
-                if getattr(s, "kb", None) is not None:
-                    kb_config_data = {"enabled": bool(s.kb.enabled)}
-
-                skill = AssistantSkill(
-                    name=s.name,
-                    description=s.description,
-                    intent_examples=s.intent_examples,
-                    tools=s.tools,
-                    mode=s.mode,
-                    system_prompt=s.system_prompt,
-                    kb_config=kb_config_data,
-                    is_system=True,
-                    enabled=True,
-                )
-                skill.steps = [
-                    AssistantSkillStep(
-                        step_order=i,
-                        type=step.type,
-                        instruction=step.instruction,
-                        tool_name=step.tool_name,
-                        args_from=step.args_from,
-                        args_template=getattr(step, "args_template", None),
-                        output_mode=getattr(step, "output_mode", None),
-                        output_fields=serialize_output_fields(getattr(step, "output_fields", None)),
-                        include_in_summary=getattr(step, "include_in_summary", True),
-                    )
-                    for i, step in enumerate(s.steps)
-                ]
-                self.db.add(skill)
-                created_count += 1
-                affected.append({"name": s.name, "id": None, "action": "created"})
-
+            if s.name in existing_names:
+                continue
+            skill_id = uuid.uuid4()
+            kb_config_data = None
+            if getattr(s, "kb", None) is not None:
+                kb_config_data = {"enabled": bool(s.kb.enabled)}
+            created_rows.append({
+                "id": skill_id,
+                "name": s.name,
+                "description": s.description,
+                "intent_examples": s.intent_examples,
+                "tools": s.tools,
+                "mode": s.mode,
+                "system_prompt": s.system_prompt,
+                "kb_config": kb_config_data,
+                "is_system": True,
+                "enabled": True,
+            })
+            step_rows.extend(self._default_step_rows(skill_id, s))
+            affected.append({"name": s.name, "id": str(skill_id), "action": "created"})
         try:
+            if created_rows:
+                self.db.execute(insert(AssistantSkill), created_rows)
+            # 重置与新建技能的 steps 合并为一次批量写入
+            if step_rows:
+                self.db.execute(insert(AssistantSkillStep), step_rows)
             self.db.commit()
         except IntegrityError as exc:
             self.db.rollback()
             raise ApiException(status_code=409, code=40923, message="Reset all skills failed") from exc
+        AssistantConfigService._synced_skills_version = None
 
         return {
-            "resetCount": reset_count,
-            "deletedCount": deleted_count,
-            "createdCount": created_count,
+            "resetCount": len(reset_rows),
+            "deletedCount": len(deleted_ids),
+            "createdCount": len(created_rows),
             "affected": affected,
         }
 
-    def _reset_skill_to_default(self, skill: AssistantSkill, default) -> None:
-        """内部方法：将技能重置到默认配置"""
-        # 保留 enabled 状态（general_chat 强制启用）
-        enabled = skill.enabled
-        if skill.name == DEFAULT_SKILL_NAME:
-            enabled = True
-
-        skill.description = default.description
-        skill.intent_examples = default.intent_examples
-        skill.tools = default.tools
-        skill.mode = default.mode
-        skill.system_prompt = default.system_prompt
-
-        # 重置 kb_config
+    @staticmethod
+    def _default_skill_values(default) -> dict:
+        """内部方法：系统技能默认配置中可复位的标量字段"""
         if getattr(default, "kb", None) is not None:
-            skill.kb_config = {"enabled": bool(default.kb.enabled)}
+            kb_config = {"enabled": bool(default.kb.enabled)}
         else:
-            skill.kb_config = {"enabled": False}
-
-        # 删除旧 steps
-        for old_step in skill.steps:
-            self.db.delete(old_step)
-        self.db.flush()
+            kb_config = {"enabled": False}
+        return {
+            "description": default.description,
+            "intent_examples": default.intent_examples,
+            "tools": default.tools,
+            "mode": default.mode,
+            "system_prompt": default.system_prompt,
+            "kb_config": kb_config,
+        }
 
-        # 创建新 steps
-        skill.steps = [
-            AssistantSkillStep(
-                step_order=i,
-                type=step.type,
-                instruction=step.instruction,
-                tool_name=step.tool_name,
-                args_from=step.args_from,
-                args_template=getattr(step, "args_template", None),
-                output_mode=getattr(step, "output_mode", None),
-                output_fields=serialize_output_fields(getattr(step, "output_fields", None)),
-                include_in_summary=getattr(step, "include_in_summary", True),
-            )
-            for i, step in enumerate(default.steps)
+    @staticmethod
+    def _default_step_rows(skill_id: Any, default) -> list[dict]:
+        """内部方法：构建系统技能默认 steps 的批量插入行"""
+        return [
+            {
+                "skill_id": skill_id,
+                "step_order": i,
+                "type": step.type,
+                "instruction": step.instruction,
+                "tool_name": step.tool_name,
+                "args_from": step.args_from,
+                "args_template": step.args_template,
+                "output_mode": step.output_mode,
+                "output_fields": serialize_output_fields(step.output_fields),
+                "include_in_summary": step.include_in_summary,
+            }
+            for i, step in enumerate(SkillRegistry.normalized_steps(default))
         ]
-        skill.enabled = enabled
@@ -0,0 +1,59 @@
+"""ASGI guard that rejects oversized attachment uploads before the body is read."""
+from __future__ import annotations
+
+import re
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.common.responses import ApiJSONResponse, ApiResponse
+from app.config import get_settings
+
+# multipart 的 Content-Length 还包含 boundary / 表单字段，预留余量避免临界大小的误拒；
+# 精确的大小限制仍由 service 层的 _CountingReader 在上传过程中保证
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024
+
+_UPLOAD_PATH = re.compile(r"^/api/attachments/(?:entry/[^/]+(?:/stream)?|upload/[^/]+)/?$")
+
+
+class UploadSizeLimitMiddleware:
+    """Answer 413 from the Content-Length header alone for attachment upload routes.
+
+    FastAPI parses (and spools) multipart bodies before any dependency or route code
+    runs, so the check has to happen here to avoid reading an oversized body at all.
+    Requests without Content-Length (chunked) pass through and are limited mid-stream.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("POST", "PUT")
+            or not _UPLOAD_PATH.match(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = None
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                content_length = value
+                break
+
+        max_size_mb = get_settings().docling_max_file_size_mb
+        if (
+            content_length is not None
+            and content_length.isdigit()
+            and int(content_length) > max_size_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES
+        ):
+            response = ApiJSONResponse(
+                status_code=413,
+                content=ApiResponse.fail_content(41300, f"File too large. Maximum size is {max_size_mb}MB"),
+                # 未读取请求体，关闭连接以免客户端继续发送
+                headers={"Connection": "close"},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -18,6 +18,8 @@ class Attachment(UuidPrimaryKeyMixin, TimestampMixin, Base):
     file_path = Column(String(512), nullable=False)
     size = Column("file_size", BigInteger, nullable=False)
     content_type = Column("mime_type", String(128), nullable=False)
+    # 上传时随流计算的内容摘要（hex）；历史数据为空
+    sha256 = Column(String(64), nullable=True)
 
     # Knowledge graph indexing fields
     index_to_knowledge_graph = Column(Boolean, nullable=True, default=False)
@@ -43,6 +45,17 @@ class AttachmentParseOutbox(UuidPrimaryKeyMixin, TimestampMixin, Base):
     last_error = Column(Text, nullable=True)
 
     __table_args__ = (
-        Index("idx_attachment_parse_outbox_pending", "status", "available_at"),
+        # 与 claim_batch 的 WHERE/ORDER BY 对齐的部分索引；attempts 由查询时精确过滤
+        Index(
+            "idx_attachment_parse_outbox_claimable",
+            "available_at",
+            "created_at",
+            postgresql_where=text("status IN ('pending', 'processing')"),
+        ),
+        Index(
+            "idx_attachment_parse_outbox_locked_at",
+            "locked_at",
+            postgresql_where=text("status = 'processing'"),
+        ),
         Index("idx_attachment_parse_outbox_attachment_id", "attachment_id"),
     )
@@ -7,17 +7,104 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from uuid import UUID
 
-from sqlalchemy import and_, or_
+from sqlalchemy import DateTime, Integer, bindparam, func, insert, select, text, update
 from sqlalchemy.orm import Session
 
 from app.attachment.models import AttachmentParseOutbox
 
 logger = logging.getLogger(__name__)
 
+# 入队后通过 pg_notify 唤醒空闲的解析 worker（见 worker._OutboxListener）
+NOTIFY_CHANNEL = "attachment_parse_outbox"
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
+class OutboxClaim:
+    """已认领 outbox 行的轻量快照（worker 只需要这几列）。"""
+
+    id: UUID
+    attachment_id: UUID
+    entry_id: UUID
+    attempts: int
+
+
+@dataclass(frozen=True, slots=True)
 class ClaimResult:
-    claimed: list[AttachmentParseOutbox]
+    claimed: list[OutboxClaim]
+
+
+@dataclass(frozen=True)
+class ParseCompletion:
+    """单条 outbox 的处理结果，供 mark_batch 批量落库。
+
+    action: succeeded | retry | dead
+    """
+
+    outbox_id: UUID
+    action: str
+    error_message: str | None = None
+    next_available_at: datetime | None = None
+
+
+# 认领条件：可用的 pending，或锁已过期的 processing（worker 崩溃恢复）
+_CLAIM_PREDICATE = text(
+    "attempts < :max_attempts AND available_at <= :now AND ("
+    "status = 'pending' OR (status = 'processing' AND (locked_at IS NULL OR locked_at <= :lock_deadline))"
+    ")"
+).bindparams(
+    bindparam("max_attempts", type_=Integer),
+    bindparam("now", type_=DateTime(timezone=True)),
+    bindparam("lock_deadline", type_=DateTime(timezone=True)),
+)
+
+# 子查询锁定候选行（SKIP LOCKED），外层 UPDATE ... RETURNING 一次完成认领；
+# 语句在模块级构建一次，每次调用只绑定参数
+_CLAIM_STMT = (
+    update(AttachmentParseOutbox)
+    .where(
+        AttachmentParseOutbox.id.in_(
+            select(AttachmentParseOutbox.id)
+            .where(_CLAIM_PREDICATE)
+            .order_by(
+                AttachmentParseOutbox.available_at.asc(),
+                AttachmentParseOutbox.created_at.asc(),
+            )
+            .limit(bindparam("batch_size", type_=Integer))
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+    )
+    .values(
+        status="processing",
+        locked_at=bindparam("now"),
+        locked_by=bindparam("worker_id"),
+        attempts=AttachmentParseOutbox.attempts + 1,
+    )
+    .returning(
+        AttachmentParseOutbox.id,
+        AttachmentParseOutbox.attachment_id,
+        AttachmentParseOutbox.entry_id,
+        AttachmentParseOutbox.attempts,
+        AttachmentParseOutbox.available_at,
+        AttachmentParseOutbox.created_at,
+    )
+)
+
+
+MAX_ERROR_LENGTH = 4000
+
+
+def truncate_error(message: str | None) -> str | None:
+    """截断错误信息防止表膨胀；未超长时直接返回原串，不做切片复制。"""
+    if not message:
+        return None
+    if len(message) <= MAX_ERROR_LENGTH:
+        return message
+    return message[:MAX_ERROR_LENGTH]
+
+
+# 2 的幂次表（指数上限 10），热路径只需一次下标访问
+_BACKOFF_POWERS = tuple(1 << i for i in range(11))
 
 
 def compute_backoff(
@@ -25,9 +112,12 @@ def compute_backoff(
     base_sec: float = 5.0,
     cap_sec: float = 300.0,
 ) -> timedelta:
-    delay = min(cap_sec, base_sec * (2 ** min(attempts - 1, 10)))
-    jitter = random.uniform(0, delay * 0.1)
-    return timedelta(seconds=delay + jitter)
+    """Decorrelated jitter：在 [base, 3 * prev] 区间随机取值并封顶。
+
+    prev 由 attempts 推导为 base * 2^(attempts-1)，无需额外持久化上一次的等待时长。
+    """
+    prev = base_sec * _BACKOFF_POWERS[min(max(attempts - 1, 0), 10)]
+    return timedelta(seconds=min(cap_sec, random.uniform(base_sec, prev * 3)))
 
 
 class AttachmentParseOutboxRepo:
@@ -35,6 +125,19 @@ class AttachmentParseOutboxRepo:
         self.db = db
         self.worker_id = worker_id
 
+    def enqueue_many(self, items: list[dict]) -> None:
+        """批量写入待解析 outbox 行（一次 executemany），由调用方提交事务。
+
+        Args:
+            items: 每项至少包含 attachment_id / entry_id，其余列使用模型默认值
+        """
+        if not items:
+            return
+        self.db.execute(insert(AttachmentParseOutbox), items)
+        if self.db.get_bind().dialect.name == "postgresql":
+            # NOTIFY 随事务提交才投递，回滚则不会误唤醒
+            self.db.execute(select(func.pg_notify(NOTIFY_CHANNEL, "")))
+
     def claim_batch(
         self,
         *,
@@ -46,41 +149,31 @@ class AttachmentParseOutboxRepo:
     ) -> ClaimResult:
         lock_deadline = now - timedelta(seconds=lock_ttl_sec)
 
-        query = (
-            self.db.query(AttachmentParseOutbox)
-            .filter(
-                AttachmentParseOutbox.attempts < max_attempts,
-                AttachmentParseOutbox.available_at <= now,
-                or_(
-                    AttachmentParseOutbox.status == "pending",
-                    and_(
-                        AttachmentParseOutbox.status == "processing",
-                        or_(
-                            AttachmentParseOutbox.locked_at.is_(None),
-                            AttachmentParseOutbox.locked_at <= lock_deadline,
-                        ),
-                    ),
-                ),
-            )
-            .order_by(
-                AttachmentParseOutbox.available_at.asc(),
-                AttachmentParseOutbox.created_at.asc(),
-            )
-            .with_for_update(skip_locked=True)
-            .limit(batch_size)
-        )
-
-        rows = query.all()
-        for row in rows:
-            row.status = "processing"
-            row.locked_at = now
-            row.locked_by = worker_id
-            row.attempts = (row.attempts or 0) + 1
-
+        # 只取 worker 需要的列，不构造 ORM 实例、不进入 identity map
+        rows = self.db.execute(
+            _CLAIM_STMT,
+            {
+                "max_attempts": max_attempts,
+                "now": now,
+                "lock_deadline": lock_deadline,
+                "batch_size": batch_size,
+                "worker_id": worker_id,
+            },
+            execution_options={"synchronize_session": False},
+        ).all()
         self.db.commit()
-        return ClaimResult(claimed=rows)
 
-    def mark_succeeded(self, *, outbox_id: UUID) -> bool:
+        # RETURNING 不保证顺序，按认领优先级恢复
+        rows.sort(key=lambda row: (row.available_at, row.created_at))
+        return ClaimResult(
+            claimed=[
+                OutboxClaim(id=row.id, attachment_id=row.attachment_id, entry_id=row.entry_id, attempts=row.attempts)
+                for row in rows
+            ]
+        )
+
+    def _mark(self, action: str, outbox_id: UUID, **values) -> bool:
+        """单条 UPDATE ... RETURNING：仅当本 worker 仍持有锁时更新（防止 late-ack 竞态）。"""
         filters = [
             AttachmentParseOutbox.id == outbox_id,
             AttachmentParseOutbox.status == "processing",
@@ -88,18 +181,23 @@ class AttachmentParseOutboxRepo:
         if self.worker_id:
             filters.append(AttachmentParseOutbox.locked_by == self.worker_id)
 
-        row = self.db.query(AttachmentParseOutbox).filter(*filters).first()
-        if row:
-            row.status = "succeeded"
-            row.locked_at = None
-            row.locked_by = None
-            row.last_error = None
-            self.db.commit()
+        stmt = (
+            update(AttachmentParseOutbox)
+            .where(*filters)
+            .values(locked_at=None, locked_by=None, **values)
+            .returning(AttachmentParseOutbox.id)
+        )
+        updated = self.db.execute(stmt, execution_options={"synchronize_session": False}).first()
+        self.db.commit()
+        if updated is not None:
             return True
 
-        logger.warning("mark_succeeded failed", extra={"outbox_id": str(outbox_id)})
+        logger.warning("%s failed", action, extra={"outbox_id": str(outbox_id)})
         return False
 
+    def mark_succeeded(self, *, outbox_id: UUID) -> bool:
+        return self._mark("mark_succeeded", outbox_id, status="succeeded", last_error=None)
+
     def mark_retry(
         self,
         *,
@@ -107,42 +205,80 @@ class AttachmentParseOutboxRepo:
         next_available_at: datetime,
         error_message: str,
     ) -> bool:
-        filters = [
-            AttachmentParseOutbox.id == outbox_id,
-            AttachmentParseOutbox.status == "processing",
-        ]
-        if self.worker_id:
-            filters.append(AttachmentParseOutbox.locked_by == self.worker_id)
+        return self._mark(
+            "mark_retry",
+            outbox_id,
+            status="pending",
+            available_at=next_available_at,
+            last_error=truncate_error(error_message),
+        )
 
-        row = self.db.query(AttachmentParseOutbox).filter(*filters).first()
-        if row:
-            row.status = "pending"
-            row.locked_at = None
-            row.locked_by = None
-            row.available_at = next_available_at
-            row.last_error = error_message[:4000] if error_message else None
-            self.db.commit()
-            return True
+    def mark_dead(self, *, outbox_id: UUID, error_message: str) -> bool:
+        return self._mark("mark_dead", outbox_id, status="dead", last_error=truncate_error(error_message))
 
-        logger.warning("mark_retry failed", extra={"outbox_id": str(outbox_id)})
-        return False
+    def mark_batch(self, completions: list[ParseCompletion]) -> set[UUID]:
+        """批量写回一批 outbox 的处理结果，整批一次提交。
+
+        先锁定仍由本 worker 持有的 processing 行（防止 late-ack 竞态），再按结果分区：
+        succeeded 一条 IN 更新，retry/dead 各一次 executemany。
+
+        Returns:
+            实际更新的 outbox id 集合（锁已丢失的条目不包含在内）
+        """
+        if not completions:
+            return set()
 
-    def mark_dead(self, *, outbox_id: UUID, error_message: str) -> bool:
         filters = [
-            AttachmentParseOutbox.id == outbox_id,
+            AttachmentParseOutbox.id.in_([c.outbox_id for c in completions]),
             AttachmentParseOutbox.status == "processing",
         ]
         if self.worker_id:
             filters.append(AttachmentParseOutbox.locked_by == self.worker_id)
+        owned = set(
+            self.db.scalars(select(AttachmentParseOutbox.id).where(*filters).with_for_update())
+        )
 
-        row = self.db.query(AttachmentParseOutbox).filter(*filters).first()
-        if row:
-            row.status = "dead"
-            row.locked_at = None
-            row.locked_by = None
-            row.last_error = error_message[:4000] if error_message else None
-            self.db.commit()
-            return True
+        succeeded_ids: list[UUID] = []
+        retry_rows: list[dict] = []
+        dead_rows: list[dict] = []
+        for c in completions:
+            if c.outbox_id not in owned:
+                logger.warning(
+                    "mark_batch skipped: lock lost or message not found",
+                    extra={"outbox_id": str(c.outbox_id), "worker_id": self.worker_id, "action": c.action},
+                )
+                continue
+            if c.action == "succeeded":
+                succeeded_ids.append(c.outbox_id)
+            elif c.action == "retry":
+                retry_rows.append({
+                    "id": c.outbox_id,
+                    "status": "pending",
+                    "locked_at": None,
+                    "locked_by": None,
+                    "available_at": c.next_available_at,
+                    "last_error": truncate_error(c.error_message),
+                })
+            else:
+                dead_rows.append({
+                    "id": c.outbox_id,
+                    "status": "dead",
+                    "locked_at": None,
+                    "locked_by": None,
+                    "last_error": truncate_error(c.error_message),
+                })
 
-        logger.warning("mark_dead failed", extra={"outbox_id": str(outbox_id)})
-        return False
+        if succeeded_ids:
+            self.db.execute(
+                update(AttachmentParseOutbox)
+                .where(AttachmentParseOutbox.id.in_(succeeded_ids))
+                .values(status="succeeded", locked_at=None, locked_by=None, last_error=None),
+                execution_options={"synchronize_session": False},
+            )
+        if retry_rows:
+            self.db.execute(update(AttachmentParseOutbox), retry_rows)
+        if dead_rows:
+            self.db.execute(update(AttachmentParseOutbox), dead_rows)
+
+        self.db.commit()
+        return owned
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import importlib
+import importlib.util
 import json
 import logging
 import os
+import re
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
@@ -25,13 +27,15 @@ class ParseError(Exception):
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".xlsx", ".pptx", ".png", ".jpg", ".jpeg"}
 
 
-def _parse_csv_list(value: str) -> list[str]:
-    """Parse comma-separated string into list."""
+@lru_cache(maxsize=32)
+def _parse_csv_list(value: str) -> tuple[str, ...]:
+    """Parse comma-separated string into an (immutable, cached) tuple."""
     if not value:
-        return []
-    return [item.strip() for item in value.split(",") if item.strip()]
+        return ()
+    return tuple(item.strip() for item in value.split(",") if item.strip())
 
 
+@lru_cache(maxsize=32)
 def _normalize_chat_completions_url(value: str) -> str:
     """Normalize URL to OpenAI-compatible chat completions endpoint."""
     url = (value or "").strip()
@@ -48,13 +52,16 @@ def _normalize_chat_completions_url(value: str) -> str:
     return f"{url}/v1/chat/completions"
 
 
+# 模块导入时探测一次；find_spec 只定位模块，不执行 ONNX runtime 的初始化
+try:
+    _RAPIDOCR_AVAILABLE = importlib.util.find_spec("rapidocr_onnxruntime") is not None
+except Exception:
+    _RAPIDOCR_AVAILABLE = False
+
+
 def _rapidocr_is_available() -> bool:
     """Check if RapidOCR is installed."""
-    try:
-        importlib.import_module("rapidocr_onnxruntime")
-        return True
-    except Exception:
-        return False
+    return _RAPIDOCR_AVAILABLE
 
 
 @lru_cache(maxsize=4)
@@ -102,8 +109,60 @@ def _resolve_rapidocr_model_paths(
     )
 
 
-@lru_cache(maxsize=4)
-def _get_docling_converter(
+# 进程内常驻的 DocumentConverter；由 warm_converter() 在 worker 启动时预热
+_CONVERTER_SINGLETON = None
+_CONVERTER_KEY: tuple | None = None
+
+
+def _docling_converter_options(settings) -> dict[str, Any]:
+    """从 settings 提取构建 converter 所需的配置（顺序固定，可直接作为缓存键）。"""
+    return {
+        "ocr_enabled": bool(settings.docling_ocr_enabled),
+        "ocr_force_full_page_ocr": bool(settings.docling_ocr_force_full_page_ocr),
+        "ocr_langs": str(settings.docling_ocr_langs or ""),
+        "ocr_det_model_path": str(settings.docling_ocr_det_model_path or ""),
+        "ocr_rec_model_path": str(settings.docling_ocr_rec_model_path or ""),
+        "ocr_cls_model_path": str(settings.docling_ocr_cls_model_path or ""),
+        "ocr_modelscope_enabled": bool(settings.docling_ocr_modelscope_enabled),
+        "ocr_modelscope_repo_id": str(settings.docling_ocr_modelscope_repo_id or ""),
+        "picture_description_enabled": bool(settings.docling_picture_description_enabled),
+        "picture_description_url": str(settings.docling_picture_description_url or ""),
+        "picture_description_api_key": str(settings.docling_picture_description_api_key or ""),
+        "picture_description_model": str(settings.docling_picture_description_model or ""),
+        "picture_description_prompt": str(settings.docling_picture_description_prompt or ""),
+        "picture_description_timeout_sec": float(settings.docling_picture_description_timeout_sec),
+        "picture_description_concurrency": int(settings.docling_picture_description_concurrency),
+        "picture_description_params_json": str(settings.docling_picture_description_params_json or ""),
+    }
+
+
+def _get_docling_converter():
+    """Return the process-wide DocumentConverter, building it on first use or config change."""
+    global _CONVERTER_SINGLETON, _CONVERTER_KEY
+
+    options = _docling_converter_options(get_settings())
+    key = tuple(options.values())
+    if _CONVERTER_SINGLETON is None or key != _CONVERTER_KEY:
+        _CONVERTER_SINGLETON = _build_docling_converter(**options)
+        _CONVERTER_KEY = key
+    return _CONVERTER_SINGLETON
+
+
+def warm_converter() -> bool:
+    """Build the DocumentConverter ahead of the first parse (worker startup hook).
+
+    Returns:
+        True if the converter is ready, False if warm-up failed (parse will retry lazily)
+    """
+    try:
+        _get_docling_converter()
+        return True
+    except Exception as exc:
+        logger.warning("Docling converter warm-up failed: %s", exc)
+        return False
+
+
+def _build_docling_converter(
     *,
     ocr_enabled: bool,
     ocr_force_full_page_ocr: bool,
@@ -122,7 +181,7 @@ def _get_docling_converter(
     picture_description_concurrency: int,
     picture_description_params_json: str,
 ):
-    """Build and cache DocumentConverter with pipeline options."""
+    """Build DocumentConverter with pipeline options."""
     try:
         from docling.datamodel.base_models import InputFormat
         from docling.datamodel.pipeline_options import (
@@ -140,7 +199,7 @@ def _get_docling_converter(
     if ocr_enabled:
         pipeline_options.do_ocr = True
         if _rapidocr_is_available():
-            langs = _parse_csv_list(ocr_langs) or ["english", "chinese"]
+            langs = list(_parse_csv_list(ocr_langs)) or ["english", "chinese"]
             det, rec, cls = _resolve_rapidocr_model_paths(
                 det_model_path=ocr_det_model_path,
                 rec_model_path=ocr_rec_model_path,
@@ -259,13 +318,15 @@ def _get_docling_converter(
     )
 
 
+_NON_RETRYABLE_RE = re.compile(
+    r"max_num_pages|max_file_size|file too large|too large|page_range",
+    re.IGNORECASE,
+)
+
+
 def _is_non_retryable_error(message: str) -> bool:
     """Check if error indicates a non-retryable condition."""
-    msg = (message or "").lower()
-    return any(
-        needle in msg
-        for needle in ("max_num_pages", "max_file_size", "file too large", "too large", "page_range")
-    )
+    return bool(message) and _NON_RETRYABLE_RE.search(message) is not None
 
 
 def parse_document(file_path: str, content_type: str, *, max_pages: int | None = None) -> str:
@@ -293,24 +354,7 @@ def parse_document(file_path: str, content_type: str, *, max_pages: int | None =
     resolved_max_file_size = int(settings.docling_max_file_size_mb) * 1024 * 1024
 
     try:
-        converter = _get_docling_converter(
-            ocr_enabled=bool(settings.docling_ocr_enabled),
-            ocr_force_full_page_ocr=bool(settings.docling_ocr_force_full_page_ocr),
-            ocr_langs=str(settings.docling_ocr_langs or ""),
-            ocr_det_model_path=str(settings.docling_ocr_det_model_path or ""),
-            ocr_rec_model_path=str(settings.docling_ocr_rec_model_path or ""),
-            ocr_cls_model_path=str(settings.docling_ocr_cls_model_path or ""),
-            ocr_modelscope_enabled=bool(settings.docling_ocr_modelscope_enabled),
-            ocr_modelscope_repo_id=str(settings.docling_ocr_modelscope_repo_id or ""),
-            picture_description_enabled=bool(settings.docling_picture_description_enabled),
-            picture_description_url=str(settings.docling_picture_description_url or ""),
-            picture_description_api_key=str(settings.docling_picture_description_api_key or ""),
-            picture_description_model=str(settings.docling_picture_description_model or ""),
-            picture_description_prompt=str(settings.docling_picture_description_prompt or ""),
-            picture_description_timeout_sec=float(settings.docling_picture_description_timeout_sec),
-            picture_description_concurrency=int(settings.docling_picture_description_concurrency),
-            picture_description_params_json=str(settings.docling_picture_description_params_json or ""),
-        )
+        converter = _CONVERTER_SINGLETON or _get_docling_converter()
 
         result = converter.convert(
             file_path,
@@ -318,7 +362,12 @@ def parse_document(file_path: str, content_type: str, *, max_pages: int | None =
             max_file_size=resolved_max_file_size,
         )
         text = result.document.export_to_markdown()
-        return text.strip() if text else ""
+        # 先释放转换结果（含页面图像等中间数据），再做 strip，避免峰值时两者同时驻留
+        del result
+        if not text:
+            return ""
+        # 无首尾空白时 strip() 直接返回原对象，不会再复制一份大字符串
+        return text.strip()
     except Exception as e:
         retryable = not _is_non_retryable_error(str(e))
         logger.exception("Document parsing failed: %s", file_path)
@@ -1,10 +1,8 @@
 """Attachment preview utilities."""
 
-from pathlib import Path
-
 # Extensions allowed for inline preview (images and PDF)
 # Note: SVG is excluded by default due to XSS risks (can contain scripts)
-INLINE_PREVIEW_EXTENSIONS = {
+INLINE_PREVIEW_EXTENSIONS = frozenset({
     ".pdf",
     ".png",
     ".jpg",
@@ -13,10 +11,10 @@ INLINE_PREVIEW_EXTENSIONS = {
     ".webp",
     ".bmp",
     # ".svg",  # Disabled: SVG can contain scripts, use download instead
-}
+})
 
 # Text extensions that can be read directly as markdown
-TEXT_EXTENSIONS = {".txt", ".md", ".markdown"}
+TEXT_EXTENSIONS = frozenset({".txt", ".md", ".markdown"})
 
 # Extension to canonical MIME type mapping
 EXTENSION_TO_MIME = {
@@ -37,24 +35,44 @@ EXTENSION_TO_MIME = {
 MAX_TEXT_PREVIEW_SIZE = 2 * 1024 * 1024
 
 
+def get_file_suffix(filename: str) -> str:
+    """Get file extension from filename, preserving case.
+
+    与 ``Path(filename).suffix`` 语义一致，但不构造 Path 对象。
+    """
+    name = filename[filename.rfind("/") + 1:]
+    i = name.rfind(".")
+    if i <= 0 or i == len(name) - 1:
+        return ""
+    return name[i:]
+
+
 def get_file_extension(filename: str) -> str:
     """Get lowercase file extension from filename."""
-    return Path(filename).suffix.lower()
+    return get_file_suffix(filename).lower()
 
 
-def is_inline_previewable(filename: str) -> bool:
+def is_inline_previewable(filename: str, *, ext: str | None = None) -> bool:
     """Check if file can be previewed inline (images, PDF)."""
-    ext = get_file_extension(filename)
+    if ext is None:
+        ext = get_file_extension(filename)
     return ext in INLINE_PREVIEW_EXTENSIONS
 
 
-def is_text_file(filename: str) -> bool:
+def is_text_file(filename: str, *, ext: str | None = None) -> bool:
     """Check if file is a text file that can be read directly."""
-    ext = get_file_extension(filename)
+    if ext is None:
+        ext = get_file_extension(filename)
     return ext in TEXT_EXTENSIONS
 
 
-def get_canonical_mime_type(filename: str, fallback: str = "application/octet-stream") -> str:
+def get_canonical_mime_type(
+    filename: str,
+    fallback: str = "application/octet-stream",
+    *,
+    ext: str | None = None,
+) -> str:
     """Get canonical MIME type based on file extension."""
-    ext = get_file_extension(filename)
+    if ext is None:
+        ext = get_file_extension(filename)
     return EXTENSION_TO_MIME.get(ext, fallback)
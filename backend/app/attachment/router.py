@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from functools import lru_cache, partial
 from urllib.parse import quote
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, File, Form, Header, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.common.responses import ApiResponse
@@ -13,6 +15,7 @@ from app.database import get_db
 from app.attachment.schemas import AttachmentResponse, AttachmentMarkdownResponse
 from app.attachment.service import AttachmentService
 from app.attachment.preview import (
+    get_file_extension,
     is_inline_previewable,
     is_text_file,
     get_canonical_mime_type,
@@ -21,38 +24,48 @@ from app.attachment.preview import (
 
 router = APIRouter(prefix="/api/attachments", tags=["attachments"])
 
+# 附件自身的列（不含 kg_index_*）及其 camelCase 别名，模块加载时计算一次
+_KG_FIELDS = ("kg_index_status", "kg_index_attempts", "kg_index_last_error", "kg_index_updated_at")
+_ATTACHMENT_FIELD_ALIASES = tuple(
+    (name, field.alias or name)
+    for name, field in AttachmentResponse.model_fields.items()
+    if name not in _KG_FIELDS
+)
+
+
 def _attachment_to_response(*, attachment, kg_outbox=None) -> dict:
-    resp = AttachmentResponse.model_validate(attachment)
-    if kg_outbox is not None:
-        resp.kg_index_status = getattr(kg_outbox, "status", None)
-        resp.kg_index_attempts = getattr(kg_outbox, "attempts", None)
-        resp.kg_index_last_error = getattr(kg_outbox, "last_error", None)
-        resp.kg_index_updated_at = getattr(kg_outbox, "updated_at", None)
-    return resp.model_dump(by_alias=True)
+    """直接从 ORM 属性组装响应 dict，列表接口不再逐行 model_validate + model_dump。
+
+    输出与 AttachmentResponse(...).model_dump(by_alias=True) 一致。
+    """
+    data = {alias: getattr(attachment, name, None) for name, alias in _ATTACHMENT_FIELD_ALIASES}
+    data["kgIndexStatus"] = getattr(kg_outbox, "status", None)
+    data["kgIndexAttempts"] = getattr(kg_outbox, "attempts", None)
+    data["kgIndexLastError"] = getattr(kg_outbox, "last_error", None)
+    data["kgIndexUpdatedAt"] = getattr(kg_outbox, "updated_at", None)
+    return data
 
 
 @router.get("", response_model=ApiResponse)
-def list_attachments(db: Session = Depends(get_db)) -> ApiResponse:
+def list_attachments(db: Session = Depends(get_db)) -> Response:
     service = AttachmentService(db)
-    attachments = service.find_all()
-    kg_map = service.get_latest_kg_index_map([a.id for a in attachments])
-    return ApiResponse.ok([_attachment_to_response(attachment=a, kg_outbox=kg_map.get(a.id)) for a in attachments])
+    rows = service.find_all_with_kg()
+    return ApiResponse.ok_json([_attachment_to_response(attachment=a, kg_outbox=kg) for a, kg in rows])
 
 
 @router.get("/{id}", response_model=ApiResponse)
-def get_attachment(id: UUID, db: Session = Depends(get_db)) -> ApiResponse:
+def get_attachment(id: UUID, db: Session = Depends(get_db)) -> Response:
     service = AttachmentService(db)
     attachment = service.find_by_id(id)
     kg_map = service.get_latest_kg_index_map([attachment.id])
-    return ApiResponse.ok(_attachment_to_response(attachment=attachment, kg_outbox=kg_map.get(attachment.id)))
+    return ApiResponse.ok_json(_attachment_to_response(attachment=attachment, kg_outbox=kg_map.get(attachment.id)))
 
 
 @router.get("/entry/{entry_id}", response_model=ApiResponse)
-def get_attachments_by_entry(entry_id: UUID, db: Session = Depends(get_db)) -> ApiResponse:
+def get_attachments_by_entry(entry_id: UUID, db: Session = Depends(get_db)) -> Response:
     service = AttachmentService(db)
-    attachments = service.find_by_entry(entry_id)
-    kg_map = service.get_latest_kg_index_map([a.id for a in attachments])
-    return ApiResponse.ok([_attachment_to_response(attachment=a, kg_outbox=kg_map.get(a.id)) for a in attachments])
+    rows = service.find_by_entry_with_kg(entry_id)
+    return ApiResponse.ok_json([_attachment_to_response(attachment=a, kg_outbox=kg) for a, kg in rows])
 
 
 @router.post("/entry/{entry_id}", response_model=ApiResponse)
@@ -68,7 +81,30 @@ async def upload_attachment(
         file,
         index_to_knowledge_graph=index_to_knowledge_graph,
     )
-    kg_map = service.get_latest_kg_index_map([attachment.id])
+    kg_map = await run_in_threadpool(service.get_latest_kg_index_map, [attachment.id])
+    return ApiResponse.ok(_attachment_to_response(attachment=attachment, kg_outbox=kg_map.get(attachment.id)))
+
+
+@router.put("/entry/{entry_id}/stream", response_model=ApiResponse)
+async def upload_attachment_stream(
+    entry_id: UUID,
+    request: Request,
+    filename: str = Query(..., min_length=1),
+    index_to_knowledge_graph: bool = Query(default=False),
+    db: Session = Depends(get_db),
+) -> ApiResponse:
+    """Raw-body upload: the request body is piped to MinIO without multipart spooling."""
+    content_length = request.headers.get("content-length") or ""
+    service = AttachmentService(db)
+    attachment = await service.upload_stream(
+        entry_id,
+        request.stream(),
+        filename=filename,
+        content_type=request.headers.get("content-type"),
+        content_length=int(content_length) if content_length.isdigit() else None,
+        index_to_knowledge_graph=index_to_knowledge_graph,
+    )
+    kg_map = await run_in_threadpool(service.get_latest_kg_index_map, [attachment.id])
     return ApiResponse.ok(_attachment_to_response(attachment=attachment, kg_outbox=kg_map.get(attachment.id)))
 
 
@@ -81,63 +117,134 @@ async def upload_attachment_legacy(
     return await upload_attachment(entry_id=entry_id, file=file, db=db)
 
 
-@router.get("/{id}/download")
-async def download_attachment(id: UUID, db: Session = Depends(get_db)) -> StreamingResponse:
-    service = AttachmentService(db)
-    attachment = service.find_by_id(id)
-    stream, stat = service.get_object_stream(attachment.file_path)
+@lru_cache(maxsize=1024)
+def _content_disposition(disposition: str, filename: str) -> str:
+    """RFC 5987 Content-Disposition；热门附件的预览/下载复用同一编码结果。"""
+    return f"{disposition}; filename*=UTF-8''{quote(filename, safe='')}"
 
-    headers = {
-        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(attachment.original_filename, safe='')}",
-    }
-    size = getattr(stat, "size", None)
-    if size is not None:
+
+def _object_response(service, stream, info, byte_range, *, media_type: str, headers: dict) -> StreamingResponse:
+    """Build a (possibly partial) streaming response for a storage object."""
+    headers["Accept-Ranges"] = "bytes"
+    size = getattr(info, "size", None)
+    status_code = 200
+    if byte_range is not None:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        status_code = 206
+    elif size is not None:
         headers["Content-Length"] = str(size)
 
     return StreamingResponse(
         content=service.iter_stream(stream),
-        media_type=attachment.content_type,
+        status_code=status_code,
+        media_type=media_type,
         headers=headers,
     )
 
 
+@router.get("/{id}/download")
+async def download_attachment(
+    id: UUID,
+    db: Session = Depends(get_db),
+    range_header: str | None = Header(default=None, alias="Range"),
+) -> Response:
+    service = AttachmentService(db)
+    # async 路由内的同步 DB / MinIO 调用放到线程池，避免阻塞事件循环；
+    # 下载只用到不可变字段，优先命中进程内快照缓存
+    attachment = await run_in_threadpool(service.get_snapshot, id)
+    content_disposition = _content_disposition("attachment", attachment.original_filename)
+
+    # 配置了公网 MinIO 地址时直接跳转到预签名 URL，文件字节不再经过后端
+    presigned_url = service.presigned_download_url(
+        attachment.file_path,
+        content_type=attachment.content_type,
+        content_disposition=content_disposition,
+    )
+    if presigned_url is not None:
+        return RedirectResponse(presigned_url, status_code=307)
+
+    stream, info, byte_range = await run_in_threadpool(
+        partial(service.get_object_stream, attachment.file_path, range_header=range_header)
+    )
+
+    headers = {"Content-Disposition": content_disposition}
+    return _object_response(service, stream, info, byte_range, media_type=attachment.content_type, headers=headers)
+
+
 @router.get("/{id}/view")
-async def view_attachment(id: UUID, db: Session = Depends(get_db)) -> StreamingResponse:
-    """Inline preview for images and PDF files."""
+async def view_attachment(
+    id: UUID,
+    db: Session = Depends(get_db),
+    range_header: str | None = Header(default=None, alias="Range"),
+) -> StreamingResponse:
+    """Inline preview for images and PDF files.
+
+    Honours single-range requests so PDF viewers can fetch pages on demand.
+    """
     service = AttachmentService(db)
-    attachment = service.find_by_id(id)
+    attachment = await run_in_threadpool(service.get_snapshot, id)
 
-    if not is_inline_previewable(attachment.original_filename):
+    ext = get_file_extension(attachment.original_filename)
+    if not is_inline_previewable(attachment.original_filename, ext=ext):
         raise ApiException(
             status_code=415,
             code=41510,
             message="Unsupported attachment type for inline preview",
         )
 
-    stream, stat = service.get_object_stream(attachment.file_path)
+    stream, info, byte_range = await run_in_threadpool(
+        partial(service.get_object_stream, attachment.file_path, range_header=range_header)
+    )
 
-    mime_type = get_canonical_mime_type(attachment.original_filename, attachment.content_type)
+    mime_type = get_canonical_mime_type(attachment.original_filename, attachment.content_type, ext=ext)
     headers = {
-        "Content-Disposition": f"inline; filename*=UTF-8''{quote(attachment.original_filename, safe='')}",
+        "Content-Disposition": _content_disposition("inline", attachment.original_filename),
         "X-Content-Type-Options": "nosniff",
     }
-    size = getattr(stat, "size", None)
-    if size is not None:
-        headers["Content-Length"] = str(size)
+    return _object_response(service, stream, info, byte_range, media_type=mime_type, headers=headers)
 
-    return StreamingResponse(
-        content=service.iter_stream(stream),
-        media_type=mime_type,
-        headers=headers,
-    )
+
+def _markdown_etag(attachment) -> str:
+    """附件文件本身不可变，markdown 响应只随附件行的解析字段变化。
+
+    用 updated_at 作版本：解析状态、解析结果和错误信息（如 failed → 重试 → failed）的任何写入都会刷新它。
+    """
+    updated_at = attachment.updated_at
+    version = int(updated_at.timestamp() * 1_000_000) if updated_at else 0
+    return f'W/"{attachment.id}-{attachment.parse_status or "none"}-{version}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
 
 
 @router.get("/{id}/markdown", response_model=ApiResponse)
-def get_attachment_markdown(id: UUID, db: Session = Depends(get_db)) -> ApiResponse:
-    """Get markdown content for text/document preview."""
+def get_attachment_markdown(
+    id: UUID,
+    response: Response,
+    db: Session = Depends(get_db),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> ApiResponse | Response:
+    """Get markdown content for text/document preview.
+
+    Responses carry a weak ETag and must be revalidated; a matching If-None-Match
+    returns 304 without reading the file or serializing the markdown again.
+    """
     service = AttachmentService(db)
     attachment = service.find_by_id(id)
 
+    etag = _markdown_etag(attachment)
+    # no-cache：浏览器每次都带 ETag 回源校验，前端轮询解析状态时不会读到过期的缓存
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+
     response_data = AttachmentMarkdownResponse(
         attachment_id=attachment.id,
         state="unsupported",
@@ -169,14 +276,18 @@ def get_attachment_markdown(id: UUID, db: Session = Depends(get_db)) -> ApiRespo
 
 
 @router.get("/download/{id}", include_in_schema=False)
-async def download_attachment_legacy(id: UUID, db: Session = Depends(get_db)) -> StreamingResponse:
-    return await download_attachment(id=id, db=db)
+async def download_attachment_legacy(
+    id: UUID,
+    db: Session = Depends(get_db),
+    range_header: str | None = Header(default=None, alias="Range"),
+) -> Response:
+    return await download_attachment(id=id, db=db, range_header=range_header)
 
 
 @router.delete("/{id}", response_model=ApiResponse)
-def delete_attachment(id: UUID, db: Session = Depends(get_db)) -> ApiResponse:
+async def delete_attachment(id: UUID, db: Session = Depends(get_db)) -> ApiResponse:
     service = AttachmentService(db)
-    service.delete(id)
+    await service.delete(id)
     return ApiResponse.ok(None, "Attachment deleted successfully")
 
 
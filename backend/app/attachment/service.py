@@ -1,65 +1,335 @@
 from __future__ import annotations
 
+import hashlib
+import threading
+import time
 import uuid
-from pathlib import Path
-from typing import List
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import partial
+from typing import AsyncIterator, List
 from uuid import UUID
 
+import anyio
+import anyio.from_thread
+import anyio.to_thread
 from fastapi import UploadFile
 from minio.error import S3Error
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, true
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Bundle, Session, aliased
 
 from app.common.exceptions import ApiException
-from app.common.storage import get_minio_client, remove_object_safe, StorageError
-from app.attachment.models import Attachment, AttachmentParseOutbox
+from app.common.storage import get_minio_client, get_public_minio_client, remove_object_safe, StorageError
+from app.attachment.models import Attachment
+from app.attachment.outbox_repo import AttachmentParseOutboxRepo
 from app.attachment.parser import SUPPORTED_EXTENSIONS as SUPPORTED_PARSE_EXTENSIONS
+from app.attachment.preview import get_file_suffix
 from app.config import get_settings
 
 
+# S3 multipart 的最小分片大小
+_MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+def _upload_part_size(settings, file_size: int) -> int:
+    """按文件大小选择分片：已知且超过阈值时用大分片，减少分片数与请求往返。"""
+    part_mb = settings.minio_part_size_mb
+    if file_size > settings.minio_large_file_threshold_mb * 1024 * 1024:
+        part_mb = settings.minio_large_part_size_mb
+    return max(_MIN_PART_SIZE, part_mb * 1024 * 1024)
+
+
+# 删除存储对象的重试：最多 3 次，间隔 0.2s、0.4s（await 期间不占用线程池）
+_DELETE_ATTEMPTS = 3
+_DELETE_BACKOFF_BASE_SEC = 0.2
+
+
+def _kg_index_columns(outbox_model) -> tuple:
+    """响应只用到 outbox 的这几列（见 router._attachment_to_response），无需整行 ORM 实例。"""
+    return (
+        outbox_model.attachment_id,
+        outbox_model.status,
+        outbox_model.attempts,
+        outbox_model.last_error,
+        outbox_model.updated_at,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ObjectInfo:
+    """对象元信息（取自 GET 响应头，替代 stat_object）。"""
+
+    size: int | None
+    content_type: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class AttachmentSnapshot:
+    """附件上传后不再变化的字段，供预览/下载轮询使用。"""
+
+    id: UUID
+    entry_id: UUID
+    original_filename: str
+    content_type: str
+    file_path: str
+
+
+class _UploadTooLarge(Exception):
+    """Raised from inside the storage upload once the body exceeds the size limit."""
+
+
+class _CountingReader:
+    """File-like wrapper that counts and hashes bytes handed to the storage client and enforces a limit.
+
+    The SHA-256 digest is computed in the same pass as the upload, so no second read is needed.
+    """
+
+    def __init__(self, raw, *, limit: int | None = None) -> None:
+        self._raw = raw
+        self._limit = limit
+        self._hash = hashlib.sha256()
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self.bytes_read += len(data)
+        if self._limit is not None and self.bytes_read > self._limit:
+            raise _UploadTooLarge()
+        self._hash.update(data)
+        return data
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class _AsyncChunkReader:
+    """Blocking ``read(n)`` over an async byte iterator (e.g. ``Request.stream()``).
+
+    Must be read from a worker thread started by anyio; each refill hops back to the event loop.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks.__aiter__()
+        self._buffer = bytearray()
+        self._pos = 0
+        self._eof = False
+
+    async def _next_chunk(self) -> bytes | None:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size < 0 or len(self._buffer) - self._pos < size):
+            chunk = anyio.from_thread.run(self._next_chunk)
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer += chunk
+        available = len(self._buffer) - self._pos
+        n = available if size < 0 else min(size, available)
+        data = bytes(self._buffer[self._pos:self._pos + n])
+        self._pos += n
+        # 已消费部分过半时再整体压缩，避免每次 read 都移动剩余数据
+        if self._pos * 2 >= len(self._buffer):
+            del self._buffer[:self._pos]
+            self._pos = 0
+        return data
+
+
+# 列表接口只需要的列（不含 parsed_text 等大字段），也不触发 Attachment.entry 的 joined eager load
+_SUMMARY_BUNDLE = Bundle(
+    "attachment",
+    Attachment.id,
+    Attachment.entry_id,
+    Attachment.filename,
+    Attachment.original_filename,
+    Attachment.content_type,
+    Attachment.size,
+    Attachment.created_at,
+    Attachment.index_to_knowledge_graph,
+    Attachment.parse_status,
+    Attachment.parsed_at,
+    Attachment.parse_last_error,
+)
+
+
 class AttachmentService:
+    # 进程内快照缓存（id -> (写入时间, AttachmentSnapshot)），LRU + TTL；
+    # 缓存字段不可变，TTL 只用于兜底其他进程的删除
+    SNAPSHOT_CACHE_TTL_SECONDS: float = 10.0
+    SNAPSHOT_CACHE_MAX_ENTRIES: int = 4096
+    _snapshot_cache: "OrderedDict[UUID, tuple[float, AttachmentSnapshot]]" = OrderedDict()
+    _snapshot_lock = threading.Lock()
+
     def __init__(self, db: Session):
         self.db = db
 
+    @classmethod
+    def invalidate_snapshot_cache(cls, id: UUID | None = None) -> None:
+        """删除单个附件的快照；不传 id 时清空整个缓存。"""
+        with cls._snapshot_lock:
+            if id is None:
+                cls._snapshot_cache.clear()
+            else:
+                cls._snapshot_cache.pop(id, None)
+
+    def get_snapshot(self, id: UUID) -> AttachmentSnapshot:
+        """Immutable attachment fields, served from the per-process cache when fresh.
+
+        Raises 404 like find_by_id when the attachment does not exist.
+        """
+        cls = type(self)
+        now = time.monotonic()
+        with cls._snapshot_lock:
+            cached = cls._snapshot_cache.get(id)
+            if cached is not None and now - cached[0] < cls.SNAPSHOT_CACHE_TTL_SECONDS:
+                cls._snapshot_cache.move_to_end(id)
+                return cached[1]
+
+        attachment = self.find_by_id(id)
+        snapshot = AttachmentSnapshot(
+            id=attachment.id,
+            entry_id=attachment.entry_id,
+            original_filename=attachment.original_filename,
+            content_type=attachment.content_type,
+            file_path=attachment.file_path,
+        )
+        with cls._snapshot_lock:
+            cls._snapshot_cache[id] = (now, snapshot)
+            cls._snapshot_cache.move_to_end(id)
+            while len(cls._snapshot_cache) > cls.SNAPSHOT_CACHE_MAX_ENTRIES:
+                cls._snapshot_cache.popitem(last=False)
+        return snapshot
+
     def get_latest_kg_index_map(self, attachment_ids: list[UUID]) -> dict[UUID, object]:
         """Return latest AttachmentIndexOutbox row per attachment_id (best-effort).
 
-        Uses PostgreSQL DISTINCT ON for efficient single-row-per-group retrieval.
+        Values are column-only Rows (attachment_id, status, attempts, last_error,
+        updated_at) rather than ORM instances; nothing enters the identity map.
+        One query for the whole batch: PostgreSQL uses DISTINCT ON over the
+        (attachment_id, updated_at DESC, created_at DESC) index; other dialects use the
+        ROW_NUMBER() variant (see get_latest_kg_index_map_window).
         Note: returns an empty map if the outbox table is not available (e.g. DB not migrated yet).
         """
         if not attachment_ids:
             return {}
+        if self.db.get_bind().dialect.name != "postgresql":
+            return self.get_latest_kg_index_map_window(attachment_ids)
 
         try:
             from app.lightrag.models import AttachmentIndexOutbox
         except Exception:
             return {}
 
+        stmt = (
+            select(*_kg_index_columns(AttachmentIndexOutbox))
+            .where(AttachmentIndexOutbox.attachment_id.in_(attachment_ids))
+            .order_by(
+                AttachmentIndexOutbox.attachment_id.asc(),
+                AttachmentIndexOutbox.updated_at.desc(),
+                AttachmentIndexOutbox.created_at.desc(),
+            )
+            .distinct(AttachmentIndexOutbox.attachment_id)
+        )
+
+        try:
+            rows = self.db.execute(stmt).all()
+        except Exception:
+            # Most commonly: relation/table doesn't exist yet. Do not break attachment UI.
+            return {}
+        return {row.attachment_id: row for row in rows}
+
+    def get_latest_kg_index_map_window(self, attachment_ids: list[UUID]) -> dict[UUID, object]:
+        """Same result as get_latest_kg_index_map, via ROW_NUMBER() OVER (PARTITION BY attachment_id).
+
+        The database keeps only rank 1 per attachment, so no duplicate rows are hydrated;
+        works on any dialect with window functions (PostgreSQL, SQLite >= 3.25).
+        """
+        if not attachment_ids:
+            return {}
+
         try:
-            from sqlalchemy import func
-
-            # Use DISTINCT ON to get latest row per attachment_id efficiently
-            rows = (
-                self.db.query(AttachmentIndexOutbox)
-                .filter(AttachmentIndexOutbox.attachment_id.in_(attachment_ids))
-                .distinct(AttachmentIndexOutbox.attachment_id)
-                .order_by(
-                    AttachmentIndexOutbox.attachment_id.asc(),
-                    AttachmentIndexOutbox.updated_at.desc(),
-                    AttachmentIndexOutbox.created_at.desc(),
-                )
-                .all()
+            from app.lightrag.models import AttachmentIndexOutbox
+        except Exception:
+            return {}
+
+        ranked = select(
+            *_kg_index_columns(AttachmentIndexOutbox),
+            func.row_number()
+            .over(
+                partition_by=AttachmentIndexOutbox.attachment_id,
+                order_by=(AttachmentIndexOutbox.updated_at.desc(), AttachmentIndexOutbox.created_at.desc()),
             )
+            .label("rn"),
+        ).where(AttachmentIndexOutbox.attachment_id.in_(attachment_ids)).subquery("latest")
+        stmt = select(*(col for col in ranked.c if col.key != "rn")).where(ranked.c.rn == 1)
+
+        try:
+            rows = self.db.execute(stmt).all()
         except Exception:
             # Most commonly: relation/table doesn't exist yet. Do not break attachment UI.
             return {}
+        return {row.attachment_id: row for row in rows}
 
-        return {row.attachment_id: row for row in rows if row.attachment_id}
+    def _find_with_latest_kg(self, *criteria) -> list[tuple[object, object | None]]:
+        """Load attachment summaries together with their latest AttachmentIndexOutbox row in one query.
+
+        PostgreSQL uses LEFT JOIN LATERAL (... ORDER BY updated_at DESC LIMIT 1); other dialects
+        join on a correlated "latest id" subquery. Falls back to summaries without kg info if
+        the outbox table is not available.
+        """
+        from app.lightrag.models import AttachmentIndexOutbox
+
+        latest_order = (AttachmentIndexOutbox.updated_at.desc(), AttachmentIndexOutbox.created_at.desc())
+        if self.db.get_bind().dialect.name == "postgresql":
+            latest = (
+                select(AttachmentIndexOutbox)
+                .where(AttachmentIndexOutbox.attachment_id == Attachment.id)
+                .order_by(*latest_order)
+                .limit(1)
+                .lateral("latest_kg")
+            )
+            kg = aliased(AttachmentIndexOutbox, latest)
+            stmt = select(_SUMMARY_BUNDLE, kg).outerjoin(latest, true())
+        else:
+            latest_id = (
+                select(AttachmentIndexOutbox.id)
+                .where(AttachmentIndexOutbox.attachment_id == Attachment.id)
+                .order_by(*latest_order)
+                .limit(1)
+                .correlate(Attachment)
+                .scalar_subquery()
+            )
+            kg = AttachmentIndexOutbox
+            stmt = select(_SUMMARY_BUNDLE, kg).outerjoin(kg, kg.id == latest_id)
+
+        try:
+            return [(att, outbox) for att, outbox in self.db.execute(stmt.where(*criteria)).all()]
+        except DBAPIError:
+            # Most commonly: relation/table doesn't exist yet. Do not break attachment UI.
+            self.db.rollback()
+            return [(att, None) for att in self.find_all_summary(*criteria)]
+
+    def find_all_with_kg(self) -> list[tuple[object, object | None]]:
+        return self._find_with_latest_kg()
+
+    def find_by_entry_with_kg(self, entry_id: UUID) -> list[tuple[object, object | None]]:
+        return self._find_with_latest_kg(Attachment.entry_id == entry_id)
+
+    def find_all_summary(self, *criteria) -> list[object]:
+        """Attachment rows with only the AttachmentResponse columns (no parsed_text / entry)."""
+        return list(self.db.scalars(select(_SUMMARY_BUNDLE).where(*criteria)).all())
 
     def find_all(self) -> List[Attachment]:
         return self.db.query(Attachment).all()
 
     def find_by_id(self, id: UUID) -> Attachment:
-        attachment = self.db.query(Attachment).filter(Attachment.id == id).first()
+        # Session.get 先查 identity map：同一请求内重复取同一附件不会再发 SELECT
+        attachment = self.db.get(Attachment, id)
         if not attachment:
             raise ApiException(status_code=404, code=40400, message=f"Attachment not found: {id}")
         return attachment
@@ -73,14 +343,59 @@ class AttachmentService:
         file: UploadFile,
         *,
         index_to_knowledge_graph: bool = False,
+    ) -> Attachment:
+        try:
+            file.file.seek(0, 2)  # Seek to end
+            file_size = file.file.tell()
+            file.file.seek(0)  # Reset to beginning
+        except Exception:
+            file_size = 0  # Cannot determine size, will check after upload
+
+        return await self._store_upload(
+            entry_id,
+            data=file.file,
+            original_filename=file.filename or "file",
+            content_type=file.content_type,
+            file_size=file_size,
+            index_to_knowledge_graph=index_to_knowledge_graph,
+        )
+
+    async def upload_stream(
+        self,
+        entry_id: UUID,
+        chunks: AsyncIterator[bytes],
+        *,
+        filename: str,
+        content_type: str | None,
+        content_length: int | None = None,
+        index_to_knowledge_graph: bool = False,
+    ) -> Attachment:
+        """Upload a raw request body straight to MinIO without spooling it to a temp file."""
+        return await self._store_upload(
+            entry_id,
+            data=_AsyncChunkReader(chunks),
+            original_filename=filename or "file",
+            content_type=content_type,
+            file_size=content_length or 0,
+            index_to_knowledge_graph=index_to_knowledge_graph,
+        )
+
+    async def _store_upload(
+        self,
+        entry_id: UUID,
+        *,
+        data,
+        original_filename: str,
+        content_type: str | None,
+        file_size: int,
+        index_to_knowledge_graph: bool,
     ) -> Attachment:
         settings = get_settings()
-        original_filename = file.filename or "file"
-        file_ext = Path(original_filename).suffix
+        file_ext = get_file_suffix(original_filename)
         ext_lower = file_ext.lower()
         unique_filename = f"{uuid.uuid4()}{file_ext}"
         object_key = f"attachments/{entry_id}/{unique_filename}"
-        content_type = file.content_type or "application/octet-stream"
+        content_type = content_type or "application/octet-stream"
 
         # Validate file type BEFORE upload if indexing requested
         should_index = False
@@ -94,36 +409,41 @@ class AttachmentService:
             should_index = True
 
         # Validate file size BEFORE upload
-        max_size_bytes = settings.docling_max_file_size_mb * 1024 * 1024
-        try:
-            file.file.seek(0, 2)  # Seek to end
-            file_size = file.file.tell()
-            file.file.seek(0)  # Reset to beginning
-        except Exception:
-            file_size = 0  # Cannot determine size, will check after upload
-
+        max_size_mb = settings.docling_max_file_size_mb
+        max_size_bytes = max_size_mb * 1024 * 1024
+        too_large = ApiException(
+            status_code=413,
+            code=41300,
+            message=f"File too large. Maximum size is {max_size_mb}MB",
+        )
         if file_size > max_size_bytes:
-            raise ApiException(
-                status_code=413,
-                code=41300,
-                message=f"File too large. Maximum size is {settings.docling_max_file_size_mb}MB",
-            )
+            raise too_large
 
         try:
-            client, bucket = get_minio_client()
+            # 首次调用会探测 / 创建 bucket（网络往返），同样不能在事件循环上执行
+            client, bucket = await anyio.to_thread.run_sync(get_minio_client)
         except StorageError as exc:
             raise ApiException(status_code=500, code=50002, message="Storage service unavailable") from exc
 
-        # Upload to MinIO
+        # Upload to MinIO (blocking SDK call runs in a worker thread to keep the event loop free)
+        reader = _CountingReader(data, limit=max_size_bytes)
         try:
-            client.put_object(
-                bucket_name=bucket,
-                object_name=object_key,
-                data=file.file,
-                length=file_size if file_size > 0 else -1,
-                part_size=10 * 1024 * 1024,
-                content_type=content_type,
+            await anyio.to_thread.run_sync(
+                partial(
+                    client.put_object,
+                    bucket_name=bucket,
+                    object_name=object_key,
+                    data=reader,
+                    length=file_size if file_size > 0 else -1,
+                    part_size=_upload_part_size(settings, file_size),
+                    # 超过一个分片时，各分片由 SDK 线程池并发上传
+                    num_parallel_uploads=max(1, settings.minio_upload_parallelism),
+                    content_type=content_type,
+                )
             )
+        except _UploadTooLarge as exc:
+            await anyio.to_thread.run_sync(remove_object_safe, client, bucket, object_key)
+            raise too_large from exc
         except S3Error as exc:
             raise ApiException(
                 status_code=500,
@@ -131,21 +451,9 @@ class AttachmentService:
                 message="Failed to upload attachment",
             ) from exc
 
-        # Get actual file size if we couldn't determine it before
+        # Size unknown up front: use the byte count observed while uploading (no extra stat round-trip)
         if file_size == 0:
-            try:
-                stat = client.stat_object(bucket, object_key)
-                file_size = int(getattr(stat, "size", 0) or 0)
-                # Check size limit after upload if we couldn't check before
-                if file_size > max_size_bytes:
-                    remove_object_safe(client, bucket, object_key)
-                    raise ApiException(
-                        status_code=413,
-                        code=41300,
-                        message=f"File too large. Maximum size is {settings.docling_max_file_size_mb}MB",
-                    )
-            except S3Error:
-                pass
+            file_size = reader.bytes_read
 
         # Save to database (single transaction for atomicity)
         attachment = Attachment(
@@ -155,21 +463,27 @@ class AttachmentService:
             file_path=object_key,
             size=file_size,
             content_type=content_type,
+            sha256=reader.hexdigest(),
             index_to_knowledge_graph=should_index,
             parse_status="pending" if should_index else None,
         )
+        return await anyio.to_thread.run_sync(self._save_upload, attachment, client, bucket)
+
+    def _save_upload(self, attachment: Attachment, client, bucket: str) -> Attachment:
+        """Persist an uploaded attachment (and its parse outbox row) in one transaction.
+
+        Runs in a worker thread. Removes the stored object if the transaction fails.
+        """
+        object_key = attachment.file_path
         try:
             self.db.add(attachment)
             self.db.flush()  # Get attachment.id without committing
 
             # Create parse outbox if indexing requested (same transaction)
-            if should_index:
-                outbox = AttachmentParseOutbox(
-                    attachment_id=attachment.id,
-                    entry_id=entry_id,
-                    status="pending",
+            if attachment.index_to_knowledge_graph:
+                AttachmentParseOutboxRepo(self.db).enqueue_many(
+                    [{"attachment_id": attachment.id, "entry_id": attachment.entry_id, "status": "pending"}]
                 )
-                self.db.add(outbox)
 
             self.db.commit()
             self.db.refresh(attachment)
@@ -184,23 +498,38 @@ class AttachmentService:
             ) from exc
         return attachment
 
-    def delete(self, id: UUID) -> None:
-        attachment = self.find_by_id(id)
-        entry_id = attachment.entry_id
-        should_cleanup_index = bool(attachment.index_to_knowledge_graph)
+    async def delete(self, id: UUID) -> None:
+        """Remove the storage object (with retry/backoff), then the attachment row.
+
+        Blocking MinIO / DB calls run in worker threads; backoff waits are async sleeps,
+        so a slow MinIO does not pin threadpool threads between attempts.
+        """
+        attachment = await anyio.to_thread.run_sync(self.find_by_id, id)
 
         try:
-            client, bucket = get_minio_client()
+            client, bucket = await anyio.to_thread.run_sync(get_minio_client)
         except StorageError as exc:
             raise ApiException(status_code=500, code=50002, message="Storage service unavailable") from exc
 
-        if not remove_object_safe(client, bucket, attachment.file_path):
+        for attempt in range(_DELETE_ATTEMPTS):
+            if await anyio.to_thread.run_sync(remove_object_safe, client, bucket, attachment.file_path):
+                break
+            if attempt + 1 < _DELETE_ATTEMPTS:
+                await anyio.sleep(_DELETE_BACKOFF_BASE_SEC * (1 << attempt))
+        else:
             raise ApiException(
                 status_code=500,
                 code=50001,
                 message="Failed to delete attachment from storage",
             )
 
+        await anyio.to_thread.run_sync(self._delete_row, attachment)
+        self.invalidate_snapshot_cache(id)
+
+    def _delete_row(self, attachment: Attachment) -> None:
+        entry_id = attachment.entry_id
+        should_cleanup_index = bool(attachment.index_to_knowledge_graph)
+
         self.db.delete(attachment)
         if should_cleanup_index:
             from app.lightrag.models import AttachmentIndexOutbox
@@ -228,12 +557,9 @@ class AttachmentService:
         attachment.parse_status = "pending"
         attachment.parse_last_error = None
 
-        outbox = AttachmentParseOutbox(
-            attachment_id=attachment.id,
-            entry_id=attachment.entry_id,
-            status="pending",
+        AttachmentParseOutboxRepo(self.db).enqueue_many(
+            [{"attachment_id": attachment.id, "entry_id": attachment.entry_id, "status": "pending"}]
         )
-        self.db.add(outbox)
         self.db.commit()
         self.db.refresh(attachment)
 
@@ -271,16 +597,102 @@ class AttachmentService:
         self.db.refresh(attachment)
         return attachment
 
-    def get_object_stream(self, object_key: str):
+    @staticmethod
+    def _parse_range_spec(range_header: str | None) -> tuple[int | None, int | None] | None:
+        """Syntactic parse of a single ``bytes=`` range, without knowing the object size.
+
+        Returns (start, end) with end None for open ranges, (None, N) for suffix ranges,
+        or None when absent / malformed / multi-range.
+        """
+        if not range_header:
+            return None
+        unit, _, spec = range_header.strip().partition("=")
+        if unit.strip().lower() != "bytes" or "," in spec:
+            return None
+        first, sep, last = spec.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if not first:
+                # 后缀区间：bytes=-N 取最后 N 字节
+                suffix = int(last)
+                return (None, suffix) if suffix > 0 else None
+            start = int(first)
+            end = int(last) if last else None
+        except ValueError:
+            return None
+        if start < 0 or (end is not None and end < start):
+            return None
+        return start, end
+
+    @classmethod
+    def parse_byte_range(cls, range_header: str | None, size: int | None) -> tuple[int, int] | None:
+        """Parse a single ``bytes=`` Range header into an inclusive (start, end) pair.
+
+        Returns None when the header is absent, malformed, multi-range or unsatisfiable —
+        the caller then serves the full object (RFC 9110 allows ignoring Range).
+        """
+        spec = cls._parse_range_spec(range_header)
+        if spec is None or not size:
+            return None
+        start, end = spec
+        if start is None:
+            return max(0, size - end), size - 1
+        if start >= size:
+            return None
+        return start, size - 1 if end is None else min(end, size - 1)
+
+    @staticmethod
+    def _object_info(stream) -> tuple[ObjectInfo, tuple[int, int] | None]:
+        """Derive total size and served range from GET response headers (no HEAD needed)."""
+        headers = getattr(stream, "headers", None) or {}
+        content_type = headers.get("Content-Type")
+        content_range = headers.get("Content-Range")
+        if content_range:
+            # "bytes <start>-<end>/<total>"
+            try:
+                span, _, total = content_range.partition(" ")[2].partition("/")
+                first, _, last = span.partition("-")
+                size = int(total) if total and total != "*" else None
+                return ObjectInfo(size=size, content_type=content_type), (int(first), int(last))
+            except ValueError:
+                pass
+        length = headers.get("Content-Length")
+        size = int(length) if length and length.isdigit() else None
+        return ObjectInfo(size=size, content_type=content_type), None
+
+    def get_object_stream(self, object_key: str, *, range_header: str | None = None):
+        """Open an object stream; returns (stream, info, byte_range).
+
+        A single GET: size and the served range come from the response headers. Only
+        suffix ranges (``bytes=-N``) need the object size first and cost an extra HEAD.
+        byte_range is the inclusive (start, end) actually served, or None for the full object.
+        """
         try:
             client, bucket = get_minio_client()
         except StorageError as exc:
             raise ApiException(status_code=500, code=50002, message="Storage service unavailable") from exc
 
+        spec = self._parse_range_spec(range_header)
         try:
-            stat = client.stat_object(bucket, object_key)
-            stream = client.get_object(bucket, object_key)
-            return stream, stat
+            if spec is not None and spec[0] is None:
+                stat = client.stat_object(bucket, object_key)
+                byte_range = self.parse_byte_range(range_header, getattr(stat, "size", None))
+                spec = byte_range
+            if spec is None:
+                stream = client.get_object(bucket, object_key)
+            else:
+                start, end = spec
+                length = end - start + 1 if end is not None else 0
+                try:
+                    stream = client.get_object(bucket, object_key, offset=start, length=length)
+                except S3Error as exc:
+                    if getattr(exc, "code", "") != "InvalidRange":
+                        raise
+                    # 起点超出对象大小：忽略 Range，返回完整对象
+                    stream = client.get_object(bucket, object_key)
+            info, byte_range = self._object_info(stream)
+            return stream, info, byte_range
         except S3Error as exc:
             if getattr(exc, "code", "") in ("NoSuchKey", "NoSuchObject"):
                 raise ApiException(
@@ -295,7 +707,29 @@ class AttachmentService:
             ) from exc
 
     @staticmethod
-    def iter_stream(stream, chunk_size: int = 32 * 1024):
+    def presigned_download_url(object_key: str, *, content_type: str | None, content_disposition: str) -> str | None:
+        """Short-lived URL for fetching the object straight from MinIO.
+
+        Lets the browser download without the bytes passing through this process.
+        Returns None when no public endpoint is configured, in which case callers
+        fall back to proxying the stream.
+        """
+        client = get_public_minio_client()
+        if client is None:
+            return None
+        settings = get_settings()
+        response_headers = {"response-content-disposition": content_disposition}
+        if content_type:
+            response_headers["response-content-type"] = content_type
+        return client.presigned_get_object(
+            settings.minio_bucket,
+            object_key,
+            expires=timedelta(seconds=max(1, settings.minio_presign_expires_sec)),
+            response_headers=response_headers,
+        )
+
+    @staticmethod
+    def iter_stream(stream, chunk_size: int = 1024 * 1024):
         """Iterate over stream in chunks, ensuring proper cleanup."""
         try:
             for chunk in stream.stream(chunk_size):
@@ -317,23 +751,24 @@ class AttachmentService:
             raise ApiException(status_code=500, code=50002, message="Storage service unavailable") from exc
 
         try:
-            stat = client.stat_object(bucket, object_key)
-            file_size = getattr(stat, "size", 0) or 0
-            if file_size > max_size:
+            # 单次 GET，最多取 max_size + 1 字节：多出的那个字节即说明超限
+            stream = client.get_object(bucket, object_key, offset=0, length=max_size + 1)
+            try:
+                data = stream.read()
+            finally:
+                stream.close()
+                stream.release_conn()
+            if len(data) > max_size:
                 raise ApiException(
                     status_code=413,
                     code=41310,
                     message="Attachment text too large to preview",
                 )
-
-            stream = client.get_object(bucket, object_key)
-            try:
-                content = stream.read().decode("utf-8", errors="replace")
-            finally:
-                stream.close()
-                stream.release_conn()
-            return content
+            return data.decode("utf-8", errors="replace")
         except S3Error as exc:
+            if getattr(exc, "code", "") == "InvalidRange":
+                # 空对象无法满足 bytes=0-N
+                return ""
             if getattr(exc, "code", "") in ("NoSuchKey", "NoSuchObject"):
                 raise ApiException(
                     status_code=404,
@@ -6,21 +6,30 @@ Usage:
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import os
+import select
+import shutil
 import signal
 import socket
 import tempfile
-from dataclasses import dataclass
-from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, replace
 from threading import Event
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
 from app.common.time import utcnow
 from app.config import get_settings
 from app.database import SessionLocal
 
+if TYPE_CHECKING:
+    from app.attachment.outbox_repo import ParseCompletion
+
 logger = logging.getLogger(__name__)
 
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @dataclass
 class WorkerConfig:
@@ -30,6 +39,8 @@ class WorkerConfig:
     max_attempts: int
     lock_ttl_sec: int
     worker_id: str
+    processes: int = 1
+    max_batch_size: int = 8
 
 
 def build_worker_config() -> WorkerConfig:
@@ -42,9 +53,60 @@ def build_worker_config() -> WorkerConfig:
         max_attempts=settings.docling_worker_max_attempts,
         lock_ttl_sec=settings.docling_worker_lock_ttl_sec,
         worker_id=worker_id,
+        processes=max(1, int(settings.docling_worker_processes)),
+        max_batch_size=max(1, int(settings.docling_worker_max_batch_size)),
     )
 
 
+class _OutboxListener:
+    """独立的 LISTEN 连接：新任务入队时立即唤醒，超时则照常轮询（覆盖重试退避到期的行）。"""
+
+    def __init__(self) -> None:
+        self._conn = None
+
+    def open(self) -> bool:
+        from app.attachment.outbox_repo import NOTIFY_CHANNEL
+        from app.database import engine
+
+        if engine.dialect.name != "postgresql":
+            return False
+        try:
+            raw = engine.raw_connection()
+            # 长期占用，不归还连接池
+            raw.detach()
+            conn = raw.driver_connection
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        except Exception:
+            logger.warning("LISTEN setup failed; falling back to polling", exc_info=True)
+            return False
+        self._conn = conn
+        return True
+
+    def wait(self, timeout: float, stop_event: Event) -> None:
+        conn = self._conn
+        if conn is None:
+            stop_event.wait(timeout)
+            return
+        try:
+            select.select([conn], [], [], timeout)
+            conn.poll()
+            conn.notifies.clear()
+        except Exception:
+            logger.warning("LISTEN connection lost; falling back to polling", exc_info=True)
+            self.close()
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
 class Worker:
     def __init__(
         self,
@@ -54,25 +116,43 @@ class Worker:
     ) -> None:
         self.cfg = cfg
         self.session_factory = session_factory or SessionLocal
+        # 当前批量大小，按上一次认领的填充率在 [1, max_batch_size] 内自适应
+        self.batch_size = max(1, min(cfg.batch_size, cfg.max_batch_size))
 
     def run_forever(self, stop_event: Event) -> int:
         logger.info("parse worker starting", extra={"worker_id": self.cfg.worker_id})
 
-        while not stop_event.is_set():
-            try:
-                processed = self.run_once()
-                if processed == 0:
-                    stop_event.wait(self.cfg.poll_interval_ms / 1000.0)
-            except Exception:
-                logger.exception("worker run_once error")
-                stop_event.wait(self.cfg.poll_interval_ms / 1000.0)
+        # 仅默认 SessionLocal（PostgreSQL）时启用 LISTEN 唤醒；其他情况退化为定时轮询
+        listener = _OutboxListener() if self.session_factory is SessionLocal else None
+        if listener is not None and not listener.open():
+            listener = None
+        poll_sec = self.cfg.poll_interval_ms / 1000.0
+
+        try:
+            while not stop_event.is_set():
+                try:
+                    processed = self.run_once()
+                    if processed == 0:
+                        if listener is not None:
+                            listener.wait(poll_sec, stop_event)
+                        else:
+                            stop_event.wait(poll_sec)
+                except Exception:
+                    logger.exception("worker run_once error")
+                    stop_event.wait(poll_sec)
+        finally:
+            if listener is not None:
+                listener.close()
 
         logger.info("parse worker stopped", extra={"worker_id": self.cfg.worker_id})
         return 0
 
     def run_once(self) -> int:
-        from app.attachment.models import Attachment, AttachmentParseOutbox
-        from app.attachment.outbox_repo import AttachmentParseOutboxRepo, compute_backoff
+        from sqlalchemy import select, update
+        from sqlalchemy.orm import lazyload
+
+        from app.attachment.models import Attachment
+        from app.attachment.outbox_repo import AttachmentParseOutboxRepo
 
         now = utcnow()
         db = self.session_factory()
@@ -81,55 +161,131 @@ class Worker:
             repo = AttachmentParseOutboxRepo(db, worker_id=self.cfg.worker_id)
             result = repo.claim_batch(
                 now=now,
-                batch_size=self.cfg.batch_size,
+                batch_size=self.batch_size,
                 worker_id=self.cfg.worker_id,
                 lock_ttl_sec=self.cfg.lock_ttl_sec,
                 max_attempts=self.cfg.max_attempts,
             )
 
-            if not result.claimed:
+            claimed_count = len(result.claimed)
+            self._adapt_batch_size(claimed_count)
+            if not claimed_count:
                 return 0
 
-            for outbox in result.claimed:
-                self._process_one(db, repo, outbox, now)
+            # 整批附件一次性标记为 processing（供 UI 展示），而不是每条单独提交
+            attachment_ids = [outbox.attachment_id for outbox in result.claimed]
+            db.execute(
+                update(Attachment)
+                .where(Attachment.id.in_(attachment_ids))
+                .values(parse_status="processing"),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
 
-            return len(result.claimed)
+            # 一次 IN 查询预取整批附件（不连带 joined 加载 entry / tags）；
+            # 逐条提交后不过期重载，避免每条再查一次
+            db.expire_on_commit = False
+            attachments = {
+                attachment.id: attachment
+                for attachment in db.scalars(
+                    select(Attachment)
+                    .options(lazyload(Attachment.entry))
+                    .where(Attachment.id.in_(attachment_ids))
+                )
+            }
+
+            # 单线程后台顺序下载，下一条的下载与当前条的解析重叠
+            completions: list[ParseCompletion] = []
+            try:
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="parse-download") as pool:
+                    downloads: dict = {}
+                    for outbox in result.claimed:
+                        attachment = attachments.get(outbox.attachment_id)
+                        if attachment is not None:
+                            downloads[outbox.id] = pool.submit(
+                                self._download, attachment.file_path, attachment.original_filename
+                            )
+                    try:
+                        # 每条只提交附件状态，outbox 结果汇总后由 mark_batch 一次落库
+                        for outbox in result.claimed:
+                            completions.append(
+                                self._process_one(
+                                    db,
+                                    repo,
+                                    outbox,
+                                    attachments.get(outbox.attachment_id),
+                                    now,
+                                    downloads.get(outbox.id),
+                                )
+                            )
+                    finally:
+                        _discard_downloads(downloads.values())
+            finally:
+                # 中途抛错时已提交的条目也要写回结果，否则锁过期后会被重新认领、重复解析和入队索引；
+                # 先回滚失败条目残留的事务，保证会话可用
+                db.rollback()
+                repo.mark_batch(completions)
+
+            return claimed_count
         finally:
             db.close()
 
-    def _process_one(self, db, repo, outbox, now) -> None:
-        from app.attachment.models import Attachment
-        from app.attachment.outbox_repo import compute_backoff
-        from app.attachment.parser import parse_document, ParseError
+    def _adapt_batch_size(self, claimed: int) -> None:
+        """填充率 >= 0.9 时翻倍（至上限），<= 0.25 时减半（至 1）。"""
+        ratio = claimed / self.batch_size
+        if ratio >= 0.9:
+            self.batch_size = min(self.cfg.max_batch_size, self.batch_size * 2)
+        elif ratio <= 0.25:
+            self.batch_size = max(1, self.batch_size // 2)
+
+    @staticmethod
+    def _download(object_key: str, original_filename: str) -> str:
+        """Download an attachment object into a temp file and return its path.
+
+        Only plain strings are passed in, so this is safe to run off the DB thread.
+        The temp file is removed again if the download fails.
+        """
+        from app.attachment.preview import get_file_extension
         from app.common.storage import get_minio_client
 
-        attachment = db.query(Attachment).filter(
-            Attachment.id == outbox.attachment_id
-        ).first()
-
-        if not attachment:
-            repo.mark_succeeded(outbox_id=outbox.id)
-            return
-
-        # Set status to 'processing' for UI visibility
-        attachment.parse_status = "processing"
-        db.commit()
-
-        try:
-            client, bucket = get_minio_client()
-            file_ext = Path(attachment.original_filename).suffix
-            with tempfile.NamedTemporaryFile(suffix=file_ext, delete=False) as tmp:
-                tmp_path = tmp.name
-                response = client.get_object(bucket, attachment.file_path)
+        client, bucket = get_minio_client()
+        with tempfile.NamedTemporaryFile(suffix=get_file_extension(original_filename), delete=False) as tmp:
+            try:
+                response = client.get_object(bucket, object_key)
                 try:
-                    for chunk in response.stream(32 * 1024):
-                        tmp.write(chunk)
+                    # 1 MiB 块直接从响应拷贝到临时文件，减少 Python 层循环次数
+                    shutil.copyfileobj(response, tmp, _DOWNLOAD_CHUNK_SIZE)
                 finally:
                     response.close()
                     response.release_conn()
+            except BaseException:
+                tmp.close()
+                with suppress(OSError):
+                    os.unlink(tmp.name)
+                raise
+        return tmp.name
+
+    def _process_one(
+        self, db, repo, outbox, attachment, now, download: Future[str] | None = None
+    ) -> ParseCompletion:
+        """Parse one claimed attachment.
+
+        ``attachment`` is the prefetched row (None if it was deleted); ``download`` is
+        the background download started by run_once, otherwise the file is fetched here.
+        """
+        from app.attachment.outbox_repo import ParseCompletion
+        from app.attachment.parser import parse_document, ParseError
+
+        if not attachment:
+            return ParseCompletion(outbox_id=outbox.id, action="succeeded")
+
+        try:
+            if download is not None:
+                tmp_path = download.result()
+            else:
+                tmp_path = self._download(attachment.file_path, attachment.original_filename)
         except Exception as e:
-            self._handle_error(db, repo, outbox, attachment, str(e), now)
-            return
+            return self._handle_error(db, repo, outbox, attachment, str(e), now)
 
         try:
             text = parse_document(tmp_path, attachment.content_type)
@@ -137,39 +293,49 @@ class Worker:
             attachment.parse_status = "completed"
             attachment.parsed_at = now
             attachment.parse_last_error = None
+            self._enqueue_attachment_index(db, attachment_id=outbox.attachment_id, entry_id=outbox.entry_id)
             db.commit()
 
-            repo.mark_succeeded(outbox_id=outbox.id)
-            self._enqueue_attachment_index(db, attachment_id=outbox.attachment_id, entry_id=outbox.entry_id)
             logger.info("parse succeeded", extra={"attachment_id": str(outbox.attachment_id)})
+            return ParseCompletion(outbox_id=outbox.id, action="succeeded")
         except ParseError as e:
-            self._handle_error(db, repo, outbox, attachment, str(e), now, retryable=e.retryable)
+            return self._handle_error(db, repo, outbox, attachment, str(e), now, retryable=e.retryable)
         except Exception as e:
-            self._handle_error(db, repo, outbox, attachment, str(e), now)
+            return self._handle_error(db, repo, outbox, attachment, str(e), now)
         finally:
             try:
                 os.unlink(tmp_path)
             except Exception:
                 pass
 
-    def _handle_error(self, db, repo, outbox, attachment, error_msg: str, now, *, retryable: bool = True) -> None:
-        from app.attachment.outbox_repo import compute_backoff
+    def _handle_error(
+        self, db, repo, outbox, attachment, error_msg: str, now, *, retryable: bool = True
+    ) -> ParseCompletion:
+        from app.attachment.outbox_repo import ParseCompletion, compute_backoff, truncate_error
 
-        attachment.parse_last_error = error_msg[:4000] if error_msg else None
+        # 丢弃失败条目未提交的修改；提交本身失败时会话处于待回滚状态，不回滚无法继续使用
+        db.rollback()
+        attachment.parse_last_error = truncate_error(error_msg)
 
         if not retryable or outbox.attempts >= self.cfg.max_attempts:
             attachment.parse_status = "failed"
             db.commit()
-            repo.mark_dead(outbox_id=outbox.id, error_message=error_msg)
             logger.warning("parse failed permanently", extra={"attachment_id": str(outbox.attachment_id)})
+            return ParseCompletion(outbox_id=outbox.id, action="dead", error_message=error_msg)
         else:
             attachment.parse_status = "pending"
             db.commit()
             backoff = compute_backoff(outbox.attempts)
-            repo.mark_retry(outbox_id=outbox.id, next_available_at=now + backoff, error_message=error_msg)
             logger.info("parse retry scheduled", extra={"attachment_id": str(outbox.attachment_id)})
+            return ParseCompletion(
+                outbox_id=outbox.id,
+                action="retry",
+                error_message=error_msg,
+                next_available_at=now + backoff,
+            )
 
     def _enqueue_attachment_index(self, db, *, attachment_id, entry_id) -> None:
+        """加入索引 outbox 行，随调用方的附件状态一并提交。"""
         from app.lightrag.models import AttachmentIndexOutbox
 
         outbox = AttachmentIndexOutbox(
@@ -179,7 +345,66 @@ class Worker:
             status="pending",
         )
         db.add(outbox)
-        db.commit()
+
+
+def _discard_downloads(downloads) -> None:
+    """Remove temp files of background downloads that were never parsed (e.g. after an error)."""
+    for future in downloads:
+        if future.cancel():
+            continue
+        try:
+            path = future.result()
+        except Exception:
+            continue
+        # 已解析的条目已自行删除临时文件
+        with suppress(OSError):
+            os.unlink(path)
+
+
+def _install_stop_handlers(stop_event: Event) -> None:
+    def handle_signal(signum, _frame):
+        logger.info("signal received", extra={"signal": signum})
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+
+def _run_child(cfg: WorkerConfig) -> None:
+    """fork 出的子进程入口：继承父进程已预热的 converter，只重建自身的 DB 连接。"""
+    from app.database import engine
+
+    # 父进程的连接池不能跨进程复用
+    engine.dispose(close=False)
+
+    child_cfg = replace(cfg, worker_id=f"{socket.gethostname()}:{os.getpid()}")
+    stop_event = Event()
+    _install_stop_handlers(stop_event)
+    raise SystemExit(Worker(child_cfg).run_forever(stop_event))
+
+
+def _run_forked(cfg: WorkerConfig) -> int:
+    """预热后 fork 多个子进程，模型权重以写时复制方式共享。"""
+    ctx = multiprocessing.get_context("fork")
+    procs = [
+        ctx.Process(target=_run_child, args=(cfg,), name=f"parse-worker-{i}")
+        for i in range(cfg.processes)
+    ]
+    for proc in procs:
+        proc.start()
+
+    def handle_signal(signum, _frame):
+        logger.info("signal received; stopping children", extra={"signal": signum})
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    for proc in procs:
+        proc.join()
+    return max((proc.exitcode or 0) for proc in procs)
 
 
 def main() -> None:
@@ -194,15 +419,18 @@ def main() -> None:
         logger.info("parse worker disabled")
         return
 
-    worker = Worker(cfg)
-    stop_event = Event()
+    # 启动时预热 Docling converter，避免首个解析任务承担构建开销；
+    # 多进程时在 fork 之前预热，子进程直接继承
+    from app.attachment.parser import warm_converter
 
-    def handle_signal(signum, _frame):
-        logger.info("signal received", extra={"signal": signum})
-        stop_event.set()
+    warm_converter()
 
-    signal.signal(signal.SIGINT, handle_signal)
-    signal.signal(signal.SIGTERM, handle_signal)
+    if cfg.processes > 1 and "fork" in multiprocessing.get_all_start_methods():
+        raise SystemExit(_run_forked(cfg))
+
+    worker = Worker(cfg)
+    stop_event = Event()
+    _install_stop_handlers(stop_event)
 
     exit_code = worker.run_forever(stop_event)
     raise SystemExit(exit_code)
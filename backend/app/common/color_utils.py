@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import hashlib
-import re
+from functools import lru_cache
 
 # Material Design 600 Series - optimized for text contrast on white/light backgrounds
 MATERIAL_600_PALETTE: tuple[str, ...] = (
@@ -28,14 +28,23 @@ MATERIAL_600_PALETTE: tuple[str, ...] = (
     "#546E7A",  # Blue Grey 600
 )
 
-_HEX_COLOR_RE = re.compile(r"^#[0-9A-Fa-f]{6}$")
+# 删除所有十六进制字符的转换表：合法的 RRGGBB 转换后为空串
+_HEX_DELETE_TABLE = str.maketrans("", "", "0123456789abcdefABCDEF")
 
 
 def is_valid_hex_color(value: str | None) -> bool:
     """Check if value is a valid #RRGGBB hex color."""
-    if not value:
+    if not value or len(value) != 7 or value[0] != "#":
         return False
-    return bool(_HEX_COLOR_RE.match(value))
+    return not value[1:].translate(_HEX_DELETE_TABLE)
+
+
+@lru_cache(maxsize=4096)
+def _material_600_color_for(raw: str) -> str:
+    # 保持 SHA-256 映射：已落库的标签颜色依赖它，换哈希会让同名标签换色
+    digest = hashlib.sha256(raw.encode("utf-8")).digest()
+    idx = int.from_bytes(digest[:4], "big") % len(MATERIAL_600_PALETTE)
+    return MATERIAL_600_PALETTE[idx]
 
 
 def pick_material_600_color(key: str | None) -> str:
@@ -47,6 +56,4 @@ def pick_material_600_color(key: str | None) -> str:
     raw = (key or "").strip().lower()
     if not raw:
         return MATERIAL_600_PALETTE[0]
-    digest = hashlib.sha256(raw.encode("utf-8")).digest()
-    idx = int.from_bytes(digest[:4], "big") % len(MATERIAL_600_PALETTE)
-    return MATERIAL_600_PALETTE[idx]
+    return _material_600_color_for(raw)
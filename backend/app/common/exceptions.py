@@ -6,12 +6,11 @@ from typing import Any, Optional
 
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from starlette.requests import Request
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
 
-from app.common.responses import ApiResponse
+from app.common.responses import ApiJSONResponse, ApiResponse
 from app.common.request_context import get_request_id
 
 
@@ -33,72 +32,69 @@ def register_exception_handlers(app: FastAPI, *, debug: bool = False) -> None:
     logger = logging.getLogger(__name__)
 
     @app.exception_handler(ApiException)
-    async def api_exception_handler(request: Request, exc: ApiException) -> JSONResponse:
-        request_id = get_request_id() or getattr(request.state, "request_id", None)
+    async def api_exception_handler(request: Request, exc: ApiException) -> ApiJSONResponse:
         logger.warning(
             "api_exception request_id=%s method=%s path=%s status=%s code=%s message=%s",
-            request_id,
+            get_request_id(request),
             request.method,
             request.url.path,
             exc.status_code,
             exc.code,
             exc.message,
         )
-        return JSONResponse(
+        return ApiJSONResponse(
             status_code=exc.status_code,
-            content=ApiResponse.fail(code=exc.code, message=exc.message, data=exc.details).model_dump(),
+            content=ApiResponse.fail_content(exc.code, exc.message, exc.details),
         )
 
     @app.exception_handler(RequestValidationError)
-    async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
-        request_id = get_request_id() or getattr(request.state, "request_id", None)
+    async def validation_exception_handler(request: Request, exc: RequestValidationError) -> ApiJSONResponse:
+        errors = exc.errors()
         logger.warning(
             "validation_error request_id=%s method=%s path=%s errors=%s",
-            request_id,
+            get_request_id(request),
             request.method,
             request.url.path,
-            exc.errors(),
+            errors,
         )
-        return JSONResponse(
+        return ApiJSONResponse(
             status_code=422,
-            content=ApiResponse.fail(code=42200, message="Validation Error", data=exc.errors()).model_dump(),
+            content=ApiResponse.fail_content(42200, "Validation Error", errors),
         )
 
     @app.exception_handler(StarletteHTTPException)
-    async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> JSONResponse:
+    async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> ApiJSONResponse:
         message = str(exc.detail) if exc.detail is not None else "HTTP Error"
-        request_id = get_request_id() or getattr(request.state, "request_id", None)
         logger.warning(
             "http_exception request_id=%s method=%s path=%s status=%s message=%s",
-            request_id,
+            get_request_id(request),
             request.method,
             request.url.path,
             exc.status_code,
             message,
         )
-        return JSONResponse(
+        return ApiJSONResponse(
             status_code=exc.status_code,
-            content=ApiResponse.fail(code=exc.status_code, message=message).model_dump(),
+            content=ApiResponse.fail_content(exc.status_code, message),
         )
 
     @app.exception_handler(Exception)
-    async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
-        request_id = get_request_id() or getattr(request.state, "request_id", None)
+    async def unhandled_exception_handler(request: Request, exc: Exception) -> ApiJSONResponse:
         logger.exception(
             "unhandled_exception request_id=%s method=%s path=%s",
-            request_id,
+            get_request_id(request),
             request.method,
             request.url.path,
         )
         details: Any | None = None
         if debug:
             details = {
-                "requestId": request_id,
+                "requestId": get_request_id(request),
                 "type": exc.__class__.__name__,
                 "message": str(exc),
                 "traceback": "".join(traceback.format_exception(type(exc), exc, exc.__traceback__)),
             }
-        return JSONResponse(
+        return ApiJSONResponse(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ApiResponse.fail(code=50000, message="Internal Server Error", data=details).model_dump(),
+            content=ApiResponse.fail_content(50000, "Internal Server Error", details),
         )
@@ -0,0 +1,27 @@
+"""ASGI middleware stack shared by the application (and its tests)."""
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.attachment.middleware import UploadSizeLimitMiddleware
+
+
+def install_middleware(app: FastAPI, *, cors_origins: list[str]) -> None:
+    """Register the pure-ASGI middleware in the order the app relies on.
+
+    Starlette makes the last-added middleware the outermost layer, so CORS is
+    added after the upload size guard: responses the guard sends on its own
+    (413) still pass through CORSMiddleware and carry the CORS headers.
+    """
+    # 超过大小上限的附件上传在读取请求体之前直接 413
+    app.add_middleware(UploadSizeLimitMiddleware)
+
+    if cors_origins:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=cors_origins,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
@@ -1,19 +1,17 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from uuid import UUID
 
 
+@lru_cache(maxsize=8192)
+def _parse_uuid(part: str) -> UUID:
+    # UUID 不可变，可安全复用；翻页 / 刷新时同一批 id 会反复出现
+    return UUID(part)
+
+
 def parse_uuid_csv(value: str | None) -> list[UUID]:
-    if value is None:
-        return []
-    raw = value.strip()
-    if not raw:
+    if not value:
         return []
-    items: list[UUID] = []
-    for part in raw.split(","):
-        part = part.strip()
-        if not part:
-            continue
-        items.append(UUID(part))
-    return items
+    return [_parse_uuid(part) for part in (p.strip() for p in value.split(",")) if part]
 
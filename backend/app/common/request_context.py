@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from contextvars import ContextVar, Token
+from typing import Any
 
 _request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
 
@@ -13,6 +14,16 @@ def reset_request_id(token: Token[str | None]) -> None:
     _request_id_var.reset(token)
 
 
-def get_request_id() -> str | None:
+def get_request_id(request: Any = None) -> str | None:
+    """Return the current request id.
+
+    HTTP requests carry it on ``request.state`` (set by the request logging
+    middleware); the context variable is only a fallback for code running
+    outside a request, e.g. background workers that call set_request_id.
+    """
+    if request is not None:
+        request_id = getattr(request.state, "request_id", None)
+        if request_id:
+            return request_id
     return _request_id_var.get()
 
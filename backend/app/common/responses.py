@@ -2,7 +2,21 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
+from fastapi import Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class ApiJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic_core's serializer instead of stdlib json.
+
+    UUID / datetime / set values are encoded natively; any other unknown type
+    falls back to ``str()`` rather than failing the error response.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, fallback=str)
 
 
 class ApiResponse(BaseModel):
@@ -15,6 +29,35 @@ class ApiResponse(BaseModel):
     def ok(cls, data: Any = None, message: str = "OK") -> "ApiResponse":
         return cls(success=True, code=0, message=message, data=data)
 
+    @staticmethod
+    def ok_json(data: Any = None, message: str = "OK") -> Response:
+        """Serialize a success envelope straight to JSON bytes.
+
+        Skips building/validating an ApiResponse and FastAPI's response_model pass;
+        output is byte-identical to returning ``ApiResponse.ok(data, message)``.
+        """
+        body = to_json({"success": True, "code": 0, "message": message, "data": data})
+        return Response(content=body, media_type="application/json")
+
+    @staticmethod
+    def ok_json_raw(data_json: bytes, message: str = "OK") -> Response:
+        """Like ``ok_json`` but ``data_json`` is already-serialized JSON (e.g. from a cache).
+
+        The bytes are spliced into the envelope as-is, producing the same output as
+        ``ok_json(json.loads(data_json), message)``.
+        """
+        body = b'{"success":true,"code":0,"message":' + to_json(message) + b',"data":' + data_json + b"}"
+        return Response(content=body, media_type="application/json")
+
+    @staticmethod
+    def fail_content(code: int, message: str, data: Any = None) -> dict[str, Any]:
+        """Failure envelope as a plain dict, for error handlers.
+
+        Same shape as ``ApiResponse.fail(...).model_dump()`` without building and
+        validating a model on every error response.
+        """
+        return {"success": False, "code": code, "message": message, "data": data}
+
     @classmethod
     def fail(
         cls,
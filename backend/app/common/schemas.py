@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from pydantic import BaseModel, ConfigDict
 
 
+@lru_cache(maxsize=1024)
 def to_camel(value: str) -> str:
+    # 同名字段（id / created_at / type_id ...）在各模型间反复出现，构建 schema 时直接命中缓存
     head, *rest = value.split("_")
-    return head + "".join(word[:1].upper() + word[1:] for word in rest if word)
+    return head + "".join([word[0].upper() + word[1:] for word in rest if word])
 
 
 class CamelModel(BaseModel):
@@ -1,10 +1,15 @@
 """MinIO storage client singleton for attachment storage."""
 from __future__ import annotations
 
+import os
+from collections.abc import Iterable
 from functools import lru_cache
 from urllib.parse import urlparse
 
+import certifi
+import urllib3
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 
 from app.config import get_settings
@@ -15,6 +20,38 @@ class StorageError(Exception):
     pass
 
 
+def _build_http_client(maxsize: int) -> urllib3.PoolManager:
+    """Shared connection pool for the MinIO client.
+
+    Mirrors minio's default PoolManager (timeouts, TLS, retry on 5xx) but with a
+    larger per-host pool, so concurrent uploads/downloads reuse connections
+    instead of discarding them once the default 10-slot pool is full.
+    """
+    timeout = urllib3.Timeout(connect=30.0, read=300.0)
+    return urllib3.PoolManager(
+        num_pools=4,
+        maxsize=max(1, maxsize),
+        block=False,
+        timeout=timeout,
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+        retries=urllib3.Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+    )
+
+
+def _split_endpoint(endpoint: str, secure: bool) -> tuple[str, bool]:
+    """Accept both "host:port" and "http(s)://host:port" forms."""
+    if endpoint.startswith("http://") or endpoint.startswith("https://"):
+        parsed = urlparse(endpoint)
+        secure = parsed.scheme == "https"
+        endpoint = (parsed.netloc or parsed.path).rstrip("/")
+    return endpoint, secure
+
+
 @lru_cache(maxsize=1)
 def get_minio_client() -> tuple[Minio, str]:
     """Get MinIO client singleton and bucket name.
@@ -30,19 +67,20 @@ def get_minio_client() -> tuple[Minio, str]:
     if not endpoint:
         raise StorageError("MinIO endpoint is not configured")
 
-    secure = settings.minio_secure
-    if endpoint.startswith("http://") or endpoint.startswith("https://"):
-        parsed = urlparse(endpoint)
-        secure = parsed.scheme == "https"
-        endpoint = (parsed.netloc or parsed.path).rstrip("/")
-
+    endpoint, secure = _split_endpoint(endpoint, settings.minio_secure)
     access_key = (settings.minio_access_key or "").strip()
     secret_key = (settings.minio_secret_key or "").strip()
     bucket = (settings.minio_bucket or "").strip()
     if not access_key or not secret_key or not bucket:
         raise StorageError("MinIO credentials/bucket are not configured")
 
-    client = Minio(endpoint, access_key=access_key, secret_key=secret_key, secure=secure)
+    client = Minio(
+        endpoint,
+        access_key=access_key,
+        secret_key=secret_key,
+        secure=secure,
+        http_client=_build_http_client(settings.minio_pool_maxsize),
+    )
 
     # Check/create bucket once at startup
     try:
@@ -57,6 +95,34 @@ def get_minio_client() -> tuple[Minio, str]:
     return client, bucket
 
 
+@lru_cache(maxsize=1)
+def get_public_minio_client() -> Minio | None:
+    """Client bound to MINIO_PUBLIC_ENDPOINT, used only to sign presigned URLs.
+
+    The signature covers the host, so URLs handed to browsers must be signed for
+    the public address rather than the internal one. With the region fixed,
+    signing is purely local and this client never opens a connection.
+
+    Returns:
+        None if no public endpoint or credentials are configured
+    """
+    settings = get_settings()
+    endpoint = (settings.minio_public_endpoint or "").strip()
+    access_key = (settings.minio_access_key or "").strip()
+    secret_key = (settings.minio_secret_key or "").strip()
+    if not endpoint or not access_key or not secret_key:
+        return None
+
+    endpoint, secure = _split_endpoint(endpoint, settings.minio_secure)
+    return Minio(
+        endpoint,
+        access_key=access_key,
+        secret_key=secret_key,
+        secure=secure,
+        region=settings.minio_region or "us-east-1",
+    )
+
+
 def remove_object_safe(client: Minio, bucket: str, object_key: str) -> bool:
     """Remove object from MinIO, ignoring not-found errors.
 
@@ -73,3 +139,24 @@ def remove_object_safe(client: Minio, bucket: str, object_key: str) -> bool:
     except Exception:
         # Treat network/transport failures as non-fatal for best-effort cleanup.
         return False
+
+
+def remove_objects_safe(client: Minio, bucket: str, object_keys: Iterable[str]) -> set[str]:
+    """Remove many objects via multi-object DELETE (up to 1000 keys per request).
+
+    Returns:
+        Keys that could not be removed; not-found keys count as removed
+    """
+    keys = list(dict.fromkeys(object_keys))
+    if not keys:
+        return set()
+    failed: set[str] = set()
+    try:
+        # remove_objects 是惰性的：必须迭代完返回的错误生成器，删除请求才会真正发出
+        for error in client.remove_objects(bucket, [DeleteObject(key) for key in keys]):
+            if error.code not in ("NoSuchKey", "NoSuchObject"):
+                failed.add(error.name)
+    except Exception:
+        # 传输失败时无法区分已删除的批次，全部按失败处理（清理本就是尽力而为）
+        return set(keys)
+    return failed
@@ -3,26 +3,44 @@ from __future__ import annotations
 from collections.abc import Generator
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.config import get_settings
 
 settings = get_settings()
 
+
+def _engine_options(uri: str) -> dict:
+    """Pool sizing for server databases; SQLite (unit tests) keeps its default pool."""
+    if make_url(uri).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle_sec,
+        # LIFO 复用最近归还的连接，低峰期多余连接自然闲置并被回收，热连接保持温热
+        "pool_use_lifo": True,
+    }
+
+
+_database_uri = settings.sqlalchemy_database_uri()
+
 engine = create_engine(
-    settings.sqlalchemy_database_uri(),
+    _database_uri,
     pool_pre_ping=True,
-    future=True,
+    **_engine_options(_database_uri),
 )
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
-    future=True,
 )
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    pass
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import enum
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, String, Table, Text
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, String, Table, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -24,6 +24,8 @@ entry_tag = Table(
     Base.metadata,
     Column("entry_id", UUID(as_uuid=True), ForeignKey("entry.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", UUID(as_uuid=True), ForeignKey("tag.id", ondelete="CASCADE"), primary_key=True),
+    # 主键 (entry_id, tag_id) 只覆盖按条目查标签；按标签反查条目（标签筛选 / 删除标签）需要单独索引
+    Index("idx_entry_tag_tag_id", "tag_id"),
 )
 
 
@@ -33,12 +35,19 @@ class Entry(UuidPrimaryKeyMixin, TimestampMixin, Base):
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=True)
     type_id = Column(UUID(as_uuid=True), ForeignKey("entry_type.id"), nullable=False)
-    time_mode = Column(Enum(TimeMode), nullable=False, default=TimeMode.NONE)
+    # VARCHAR + CHECK 而非 PG 原生枚举类型；Python 侧仍映射为 TimeMode
+    time_mode = Column(
+        Enum(TimeMode, native_enum=False, length=8, create_constraint=True, name="ck_entry_time_mode"),
+        nullable=False,
+        default=TimeMode.NONE,
+    )
     time_at = Column(DateTime(timezone=True), nullable=True)
     time_from = Column(DateTime(timezone=True), nullable=True)
     time_to = Column(DateTime(timezone=True), nullable=True)
     summary = Column(Text, nullable=True)
 
     # Relationships
-    type = relationship(EntryType, lazy="joined")
-    tags = relationship(Tag, secondary=entry_tag, lazy="joined")
+    # selectin：整页条目的类型 / 标签各用一条 IN 查询加载，
+    # 避免 joined 给每行附加 entry_type 列并按标签数放大结果集
+    type = relationship(EntryType, lazy="selectin")
+    tags = relationship(Tag, secondary=entry_tag, lazy="selectin")
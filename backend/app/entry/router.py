@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
 from app.common.params import parse_uuid_csv
@@ -16,19 +16,30 @@ from app.entry.service import EntryService
 router = APIRouter(prefix="/api/entries", tags=["entries"])
 
 
+def _entry_to_response(entry) -> EntryResponse:
+    # 刚从数据库读出的行是可信数据，跳过校验直接构造；
+    # 模型由 ok_json 的 to_json 按别名直接写成 JSON，不再经过中间 dict
+    return EntryResponse.from_orm_fast(entry)
+
+
+def _entries_to_response(entries) -> list[EntryResponse]:
+    return [EntryResponse.from_orm_fast(entry) for entry in entries]
+
+
 @router.get("", response_model=ApiResponse)
 def search_entries(
     q: str | None = Query(default=None, alias="q"),
     type_id: UUID | None = Query(default=None, alias="typeId"),
-    tag_ids: str | None = Query(default=None, alias="tagIds"),
+    # 同时支持 ?tagIds=a,b 与重复参数 ?tagIds=a&tagIds=b
+    tag_ids: list[str] | None = Query(default=None, alias="tagIds"),
     time_from: datetime | None = Query(default=None, alias="timeFrom"),
     time_to: datetime | None = Query(default=None, alias="timeTo"),
     page: int = Query(default=0, ge=0),
     size: int = Query(default=20, ge=1, le=100),
     db: Session = Depends(get_db),
-) -> ApiResponse:
+) -> Response:
     try:
-        parsed_tag_ids = parse_uuid_csv(tag_ids)
+        parsed_tag_ids = parse_uuid_csv(",".join(tag_ids) if tag_ids else None)
     except ValueError:
         raise ApiException(status_code=422, code=42200, message="Validation Error", details={"tagIds": tag_ids})
 
@@ -49,8 +60,8 @@ def search_entries(
     page_size = result["size"]
     total_pages = result["total_pages"]
 
-    return ApiResponse.ok({
-        "content": [EntryResponse.model_validate(entry).model_dump(by_alias=True) for entry in result["content"]],
+    return ApiResponse.ok_json({
+        "content": _entries_to_response(result["content"]),
         "pageNumber": page_num,
         "pageSize": page_size,
         "totalElements": total,
@@ -62,10 +73,10 @@ def search_entries(
 
 
 @router.get("/{id}", response_model=ApiResponse)
-def get_entry(id: UUID, db: Session = Depends(get_db)) -> ApiResponse:
+def get_entry(id: UUID, db: Session = Depends(get_db)) -> Response:
     service = EntryService(db)
     entry = service.find_by_id(id)
-    return ApiResponse.ok(EntryResponse.model_validate(entry).model_dump(by_alias=True))
+    return ApiResponse.ok_json(_entry_to_response(entry))
 
 
 @router.get("/{id}/index-status", response_model=ApiResponse)
@@ -77,17 +88,17 @@ def get_entry_index_status(id: UUID, db: Session = Depends(get_db)) -> ApiRespon
 
 
 @router.post("", response_model=ApiResponse)
-def create_entry(request: EntryRequest, db: Session = Depends(get_db)) -> ApiResponse:
+def create_entry(request: EntryRequest, db: Session = Depends(get_db)) -> Response:
     service = EntryService(db)
     entry = service.create(request)
-    return ApiResponse.ok(EntryResponse.model_validate(entry).model_dump(by_alias=True))
+    return ApiResponse.ok_json(_entry_to_response(entry))
 
 
 @router.put("/{id}", response_model=ApiResponse)
-def update_entry(id: UUID, request: EntryRequest, db: Session = Depends(get_db)) -> ApiResponse:
+def update_entry(id: UUID, request: EntryRequest, db: Session = Depends(get_db)) -> Response:
     service = EntryService(db)
     entry = service.update(id, request)
-    return ApiResponse.ok(EntryResponse.model_validate(entry).model_dump(by_alias=True))
+    return ApiResponse.ok_json(_entry_to_response(entry))
 
 
 @router.delete("/{id}", response_model=ApiResponse)
@@ -98,7 +109,7 @@ def delete_entry(id: UUID, db: Session = Depends(get_db)) -> ApiResponse:
 
 
 @router.patch("/{id}/time", response_model=ApiResponse)
-def patch_entry_time(id: UUID, request: EntryTimePatch, db: Session = Depends(get_db)) -> ApiResponse:
+def patch_entry_time(id: UUID, request: EntryTimePatch, db: Session = Depends(get_db)) -> Response:
     service = EntryService(db)
     entry = service.patch_time(id, request)
-    return ApiResponse.ok(EntryResponse.model_validate(entry).model_dump(by_alias=True))
+    return ApiResponse.ok_json(_entry_to_response(entry))
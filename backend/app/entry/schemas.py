@@ -28,18 +28,19 @@ class EntryRequest(EntryBase):
 
     @model_validator(mode="after")
     def _validate_time_fields(self) -> "EntryRequest":
-        if self.time_mode == TimeMode.NONE:
-            raise ValueError("time_mode cannot be NONE")
-
-        if self.time_mode == TimeMode.POINT:
+        # 枚举成员是单例，用 is 比较；三种模式互斥，单条 if/elif 链即可
+        mode = self.time_mode
+        if mode is TimeMode.POINT:
             if self.time_at is None:
                 raise ValueError("time_at is required when time_mode=POINT")
-
-        if self.time_mode == TimeMode.RANGE:
-            if self.time_from is None or self.time_to is None:
+        elif mode is TimeMode.RANGE:
+            time_from, time_to = self.time_from, self.time_to
+            if time_from is None or time_to is None:
                 raise ValueError("time_from and time_to are required when time_mode=RANGE")
-            if self.time_from > self.time_to:
+            if time_from > time_to:
                 raise ValueError("time_from must be <= time_to")
+        else:
+            raise ValueError("time_mode cannot be NONE")
 
         return self
 
@@ -51,6 +52,30 @@ class EntryResponse(OrmModel, EntryBase):
     type: EntryTypeResponse
     tags: List[TagResponse] = Field(default_factory=list)
 
+    @classmethod
+    def from_orm_fast(cls, entry) -> "EntryResponse":
+        """Build from a trusted ORM Entry via model_construct, skipping validation.
+
+        Only for rows just loaded from the database; untrusted input still goes
+        through model_validate (e.g. EntryRequest).
+        """
+        data = {name: getattr(entry, name) for name in _ENTRY_SCALAR_FIELDS}
+        entry_type = entry.type
+        data["type"] = EntryTypeResponse.model_construct(
+            **{name: getattr(entry_type, name) for name in _ENTRY_TYPE_FIELDS}
+        )
+        data["tags"] = [
+            TagResponse.model_construct(**{name: getattr(tag, name) for name in _TAG_FIELDS})
+            for tag in entry.tags
+        ]
+        return cls.model_construct(**data)
+
+
+# from_orm_fast 读取的属性名，类定义后计算一次
+_ENTRY_SCALAR_FIELDS = tuple(name for name in EntryResponse.model_fields if name not in ("type", "tags"))
+_ENTRY_TYPE_FIELDS = tuple(EntryTypeResponse.model_fields)
+_TAG_FIELDS = tuple(TagResponse.model_fields)
+
 
 class EntrySearchRequest(CamelModel):
     keyword: Optional[str] = None
@@ -3,14 +3,14 @@ from __future__ import annotations
 from typing import List
 from uuid import UUID
 
-from sqlalchemy import and_, delete, or_
+from sqlalchemy import and_, delete, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.attachment.models import Attachment
 from app.common.exceptions import ApiException
 from app.common.time import utcnow
-from app.common.storage import get_minio_client, remove_object_safe, StorageError
+from app.common.storage import get_minio_client, remove_objects_safe, StorageError
 from app.entry.models import Entry, TimeMode
 from app.entry.schemas import EntryRequest, EntrySearchRequest, EntryTimePatch
 from app.entry_type.service import EntryTypeService
@@ -251,37 +251,38 @@ class EntryService:
             )
         )
 
-        attachments = self.db.query(Attachment).filter(Attachment.entry_id == id).all()
+        # 只取删除需要的列，不加载 parsed_text 等大字段和 joined 关系
+        attachments = self.db.execute(
+            select(Attachment.id, Attachment.file_path, Attachment.index_to_knowledge_graph)
+            .where(Attachment.entry_id == id)
+        ).all()
         if attachments:
-            from app.lightrag.models import AttachmentIndexOutbox
-
+            from app.attachment.service import AttachmentService
+            from app.lightrag.attachment_outbox_repo import AttachmentOutboxRepo
+
+            # 索引删除任务一次 executemany 入队，附件行一条 DELETE 删除
+            AttachmentOutboxRepo(self.db).enqueue_many(
+                [
+                    {"attachment_id": attachment.id, "entry_id": entry.id, "op": "delete", "status": "pending"}
+                    for attachment in attachments
+                    if attachment.index_to_knowledge_graph
+                ]
+            )
             try:
                 client, bucket = get_minio_client()
-                for attachment in attachments:
-                    if bool(attachment.index_to_knowledge_graph):
-                        self.db.add(
-                            AttachmentIndexOutbox(
-                                attachment_id=attachment.id,
-                                entry_id=entry.id,
-                                op="delete",
-                                status="pending",
-                            )
-                        )
-                    remove_object_safe(client, bucket, attachment.file_path)
-                    self.db.delete(attachment)
             except StorageError:
                 # Storage unavailable - still allow entry deletion, attachments will be orphaned
-                for attachment in attachments:
-                    if bool(attachment.index_to_knowledge_graph):
-                        self.db.add(
-                            AttachmentIndexOutbox(
-                                attachment_id=attachment.id,
-                                entry_id=entry.id,
-                                op="delete",
-                                status="pending",
-                            )
-                        )
-                    self.db.delete(attachment)
+                pass
+            else:
+                # 一次多对象 DELETE 请求代替逐个 remove_object
+                remove_objects_safe(client, bucket, [attachment.file_path for attachment in attachments])
+            # fetch：按实际删除的主键把 session 中已加载的附件实例一并标记为已删除
+            self.db.execute(
+                delete(Attachment).where(Attachment.entry_id == id),
+                execution_options={"synchronize_session": "fetch"},
+            )
+            for attachment in attachments:
+                AttachmentService.invalidate_snapshot_cache(attachment.id)
 
         self.db.execute(
             delete(Relation).where(or_(Relation.source_entry_id == id, Relation.target_entry_id == id))
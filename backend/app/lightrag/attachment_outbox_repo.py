@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from uuid import UUID
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, insert, or_
 from sqlalchemy.orm import Session
 
 from app.lightrag.models import AttachmentIndexOutbox
@@ -35,6 +35,16 @@ class AttachmentOutboxRepo:
         self.db = db
         self.worker_id = worker_id
 
+    def enqueue_many(self, items: list[dict]) -> None:
+        """批量写入附件索引 outbox 行（一次 executemany），由调用方提交事务。
+
+        Args:
+            items: 每项至少包含 attachment_id / entry_id / op / status，其余列使用模型默认值
+        """
+        if not items:
+            return
+        self.db.execute(insert(AttachmentIndexOutbox), items)
+
     def claim_batch(
         self,
         *,
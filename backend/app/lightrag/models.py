@@ -1,7 +1,7 @@
 """ORM models for LightRAG outbox and metadata."""
 from __future__ import annotations
 
-from sqlalchemy import DateTime, Index, Integer, String, Text
+from sqlalchemy import DateTime, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -49,6 +49,12 @@ class AttachmentIndexOutbox(UuidPrimaryKeyMixin, TimestampMixin, Base):
 
     __table_args__ = (
         Index("idx_attachment_outbox_pending_available", "status", "available_at"),
-        Index("idx_attachment_outbox_attachment_id", "attachment_id"),
+        # 支撑"每个附件最新一条 outbox"的查询（DISTINCT ON / 窗口函数按此顺序扫描）
+        Index(
+            "idx_attachment_outbox_attachment_latest",
+            "attachment_id",
+            text("updated_at DESC"),
+            text("created_at DESC"),
+        ),
         Index("idx_attachment_outbox_entry_id", "entry_id"),
     )
@@ -6,8 +6,8 @@ import time
 import uuid
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 
 if (os.environ.get("MINDATLAS_FAULTHANDLER") or "").strip().lower() in {"1", "true", "yes", "on"}:
     import faulthandler
@@ -20,8 +20,8 @@ if (os.environ.get("MINDATLAS_FAULTHANDLER") or "").strip().lower() in {"1", "tr
         pass
 
 from app.common.exceptions import register_exception_handlers
-from app.common.request_context import reset_request_id, set_request_id
-from app.common.responses import ApiResponse
+from app.common.middleware import install_middleware
+from app.common.responses import ApiJSONResponse, ApiResponse
 from app.config import get_settings
 from app.entry_type.router import router as entry_type_router
 from app.tag.router import router as tag_router
@@ -50,6 +50,8 @@ logging.basicConfig(
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan: startup and shutdown events."""
+    # 同步路由与 run_in_threadpool 共享该限流器；按配置放大以免在并发 IO 下排队
+    anyio.to_thread.current_default_thread_limiter().total_tokens = max(1, settings.api_threadpool_size)
     setup_scheduler()
     yield
     shutdown_scheduler()
@@ -59,17 +61,10 @@ app = FastAPI(
     title=settings.app_name,
     debug=settings.debug,
     lifespan=lifespan,
+    default_response_class=ApiJSONResponse,
 )
 
-cors_origins = settings.cors_origins_list()
-if cors_origins:
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=cors_origins,
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+install_middleware(app, cors_origins=settings.cors_origins_list)
 
 register_exception_handlers(app, debug=settings.debug)
 
@@ -78,8 +73,8 @@ register_exception_handlers(app, debug=settings.debug)
 async def request_logging_middleware(request, call_next):
     logger = logging.getLogger("app.request")
     request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    # request.state 随 ASGI scope 传递，无需每个请求再 set / reset ContextVar
     request.state.request_id = request_id
-    token = set_request_id(request_id)
     start = time.perf_counter()
     try:
         response = await call_next(request)
@@ -93,8 +88,6 @@ async def request_logging_middleware(request, call_next):
             duration_ms,
         )
         raise
-    finally:
-        reset_request_id(token)
 
     duration_ms = (time.perf_counter() - start) * 1000.0
     response.headers["x-request-id"] = request_id
@@ -28,9 +28,32 @@ def reset_caches() -> None:
         pass
 
     try:
-        from app.common.storage import get_minio_client
+        from app.common.storage import get_minio_client, get_public_minio_client
 
         get_minio_client.cache_clear()
+        get_public_minio_client.cache_clear()
+    except Exception:
+        pass
+
+    try:
+        from app.assistant_config.registry import ToolRegistry
+
+        ToolRegistry.clear_definition_cache()
+    except Exception:
+        pass
+
+    try:
+        from app.assistant_config.service import AssistantConfigService
+
+        AssistantConfigService.invalidate_list_cache()
+        AssistantConfigService.reset_sync_state()
+    except Exception:
+        pass
+
+    try:
+        from app.attachment.service import AttachmentService
+
+        AttachmentService.invalidate_snapshot_cache()
     except Exception:
         pass
 
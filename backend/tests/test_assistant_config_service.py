@@ -87,6 +87,31 @@ class AssistantConfigServiceTests(unittest.TestCase):
         rec2 = self.db.query(AssistantTool).filter(AssistantTool.name == "t1").first()
         self.assertIsNone(rec2)
 
+    def test_set_system_tool_disabled_upserts_override_and_guards_remote(self) -> None:
+        from app.assistant_config.models import AssistantTool  # noqa: E402
+        from app.assistant_config.service import AssistantConfigService  # noqa: E402
+
+        self.db.add(AssistantTool(name="t1", description="legacy", kind="local", is_system=False, enabled=True))
+        self.db.add(AssistantTool(name="t2", kind="remote", is_system=False, enabled=True))
+        self.db.commit()
+
+        svc = AssistantConfigService(self.db)
+        system = [_SysTool("t1", "d"), _SysTool("t2", "d")]
+        with patch("app.assistant_config.service.ToolRegistry.list_system_tools", return_value=system):
+            svc.set_system_tool_enabled("t1", enabled=False)
+            with self.assertRaises(ApiException) as ctx:
+                svc.set_system_tool_enabled("t2", enabled=False)
+        self.assertEqual(ctx.exception.code, 40914)
+
+        self.db.expire_all()
+        rec = self.db.query(AssistantTool).filter(AssistantTool.name == "t1").one()
+        self.assertTrue(rec.is_system)
+        self.assertFalse(rec.enabled)
+        self.assertIsNone(rec.description)
+        remote = self.db.query(AssistantTool).filter(AssistantTool.name == "t2").one()
+        self.assertEqual(remote.kind, "remote")
+        self.assertTrue(remote.enabled)
+
     def test_sync_system_tools_integrity_error_40910(self) -> None:
         from app.assistant_config.service import AssistantConfigService  # noqa: E402
 
@@ -100,6 +125,95 @@ class AssistantConfigServiceTests(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, 409)
         self.assertEqual(ctx.exception.code, 40910)
 
+    def test_list_system_tool_definitions_caches_payload_and_overlays_enabled(self) -> None:
+        from app.assistant_config.models import AssistantTool  # noqa: E402
+        from app.assistant_config.registry import SystemToolFullDefinition, SystemToolParamDefinition  # noqa: E402
+        from app.assistant_config.service import AssistantConfigService  # noqa: E402
+
+        defs = [
+            SystemToolFullDefinition(
+                name="t1",
+                description="d1",
+                input_params=[SystemToolParamDefinition(name="q", description=None, param_type="string", required=True)],
+                returns=None,
+                json_schema={"type": "object"},
+            ),
+            SystemToolFullDefinition(name="t2", description="", input_params=[], returns=None, json_schema=None),
+        ]
+        self.db.add(AssistantTool(name="t2", kind="local", is_system=True, enabled=False))
+        self.db.commit()
+
+        svc = AssistantConfigService(self.db)
+        with patch(
+            "app.assistant_config.registry.ToolRegistry.list_system_tool_definitions", return_value=defs
+        ) as m:
+            first = svc.list_system_tool_definitions(include_schema=False)
+            second = svc.list_system_tool_definitions(include_disabled=False)
+
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual([i["name"] for i in first], ["t1", "t2"])
+        self.assertEqual([i["enabled"] for i in first], [True, False])
+        self.assertIsNone(first[0]["json_schema"])
+        self.assertIsNone(first[1]["description"])
+        self.assertEqual(first[0]["input_params"][0]["name"], "q")
+        self.assertEqual([i["name"] for i in second], ["t1"])
+        self.assertEqual(second[0]["json_schema"], {"type": "object"})
+
+    def test_system_tool_definitions_are_isolated_from_cache_and_pre_serialized(self) -> None:
+        import json  # noqa: E402
+
+        from app.assistant_config.registry import (  # noqa: E402
+            SystemToolFullDefinition,
+            SystemToolParamDefinition,
+            ToolRegistry,
+        )
+        from app.assistant_config.schemas import SystemToolDefinitionResponse  # noqa: E402
+        from app.assistant_config.service import AssistantConfigService  # noqa: E402
+
+        defs = [
+            SystemToolFullDefinition(
+                name="t1",
+                description="d1",
+                input_params=[SystemToolParamDefinition(name="q", description=None, param_type="string", required=True)],
+                returns=None,
+                json_schema={"type": "object", "properties": {}},
+            )
+        ]
+        svc = AssistantConfigService(self.db)
+        with patch("app.assistant_config.registry.ToolRegistry.list_system_tool_definitions", return_value=defs):
+            ToolRegistry.system_tool_definition_payloads()["t1"]["input_params"][0]["name"] = "mutated"
+            items = svc.list_system_tool_definitions()
+            items[0]["json_schema"]["properties"]["x"] = {}
+            items[0]["input_params"].clear()
+
+            again = svc.list_system_tool_definitions()
+            body = svc.system_tool_definitions_json()
+
+        self.assertEqual(again[0]["input_params"][0]["name"], "q")
+        self.assertEqual(again[0]["json_schema"], {"type": "object", "properties": {}})
+        self.assertEqual(
+            json.loads(body),
+            [SystemToolDefinitionResponse.model_validate(i).model_dump(by_alias=True, mode="json") for i in again],
+        )
+        self.assertIn("inputParams", json.loads(body)[0])
+
+    def test_list_system_tool_definitions_cache_invalidated_by_writes(self) -> None:
+        from app.assistant_config.registry import SystemToolFullDefinition  # noqa: E402
+        from app.assistant_config.service import AssistantConfigService  # noqa: E402
+
+        defs = [SystemToolFullDefinition(name="t1", description="d", input_params=[], returns=None, json_schema=None)]
+        svc = AssistantConfigService(self.db)
+        with (
+            patch("app.assistant_config.registry.ToolRegistry.list_system_tool_definitions", return_value=defs),
+            patch("app.assistant_config.service.ToolRegistry.list_system_tools", return_value=[_SysTool("t1", "d")]),
+        ):
+            self.assertTrue(svc.list_system_tool_definitions()[0]["enabled"])
+            with patch.object(self.db, "execute", side_effect=AssertionError("cache miss")):
+                self.assertTrue(svc.list_system_tool_definitions()[0]["enabled"])
+
+            svc.set_system_tool_enabled("t1", enabled=False)
+            self.assertFalse(svc.list_system_tool_definitions()[0]["enabled"])
+
     def test_sync_system_skills_creates_records_and_backfills(self) -> None:
         from app.assistant_config.models import AssistantSkill  # noqa: E402
         from app.assistant_config.service import AssistantConfigService  # noqa: E402
@@ -274,3 +388,47 @@ class AssistantConfigServiceTests(unittest.TestCase):
             svc.delete_skill(skill.id)
         self.assertEqual(ctx.exception.status_code, 400)
         self.assertEqual(ctx.exception.code, 40022)
+
+    def test_reset_all_system_skills_resets_deletes_and_creates(self) -> None:
+        from app.assistant.skills.base import SkillDefinition, SkillStep  # noqa: E402
+        from app.assistant_config.models import AssistantSkill, AssistantSkillStep  # noqa: E402
+        from app.assistant_config.service import AssistantConfigService  # noqa: E402
+
+        defaults = [
+            SkillDefinition(
+                name="keep",
+                description="default",
+                intent_examples=["x"],
+                steps=[SkillStep(type="analysis", instruction="a"), SkillStep(type="summary")],
+            ),
+            SkillDefinition(name="new", description="n", intent_examples=[], steps=[SkillStep(type="summary")]),
+        ]
+
+        keep = AssistantSkill(name="keep", description="edited", is_system=True, enabled=False, mode="steps")
+        keep.steps = [AssistantSkillStep(step_order=0, type="tool", tool_name="t")]
+        retired = AssistantSkill(name="retired", description="d", is_system=True, enabled=True, mode="steps")
+        retired.steps = [AssistantSkillStep(step_order=0, type="summary")]
+        custom = AssistantSkill(name="custom", description="d", is_system=False, enabled=True, mode="steps")
+        self.db.add_all([keep, retired, custom])
+        self.db.commit()
+        keep_id = keep.id
+
+        svc = AssistantConfigService(self.db)
+        with self.assertRaises(ApiException) as ctx:
+            svc.reset_all_system_skills(confirm=False)
+        self.assertEqual(ctx.exception.code, 40023)
+
+        with patch("app.assistant.skills.definitions.SKILLS", defaults):
+            result = svc.reset_all_system_skills(confirm=True)
+
+        self.assertEqual((result["resetCount"], result["deletedCount"], result["createdCount"]), (1, 1, 1))
+        self.db.expire_all()
+        names = {s.name for s in self.db.query(AssistantSkill).all()}
+        self.assertEqual(names, {"keep", "new", "custom"})
+
+        reset = self.db.get(AssistantSkill, keep_id)
+        self.assertEqual(reset.description, "default")
+        self.assertFalse(reset.enabled)
+        self.assertEqual(reset.kb_config, {"enabled": False})
+        self.assertEqual([(s.step_order, s.type) for s in reset.steps], [(0, "analysis"), (1, "summary")])
+        self.assertEqual(self.db.query(AssistantSkillStep).count(), 3)
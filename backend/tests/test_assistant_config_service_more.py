@@ -50,6 +50,24 @@ class AssistantConfigServiceMoreTests(unittest.TestCase):
         svc.delete_tool(tool.id)
         self.assertEqual(self.db.query(AssistantTool).count(), 0)
 
+    def test_update_tool_skips_reencrypt_for_masked_api_key(self) -> None:
+        from app.assistant_config.schemas import AssistantToolCreateRequest, AssistantToolUpdateRequest  # noqa: E402
+        from app.assistant_config.service import AssistantConfigService  # noqa: E402
+
+        svc = AssistantConfigService(self.db)
+        with patch("app.assistant_config.service.encrypt_api_key", return_value="enc"):
+            tool = svc.create_tool(
+                AssistantToolCreateRequest(name="rt", kind="remote", endpoint_url="https://api.example.com", api_key="k-1234")
+            )
+        self.assertEqual(tool.api_key_hint, "****1234")
+
+        with patch("app.assistant_config.service.encrypt_api_key", return_value="enc2") as enc:
+            svc.update_tool(tool.id, AssistantToolUpdateRequest(api_key="****1234"))
+            enc.assert_not_called()
+            updated = svc.update_tool(tool.id, AssistantToolUpdateRequest(api_key="k2-1234"))
+            enc.assert_called_once_with("k2-1234")
+        self.assertEqual(updated.api_key_encrypted, "enc2")
+
     def test_create_update_delete_skill_non_system(self) -> None:
         from app.assistant_config.models import AssistantSkill  # noqa: E402
         from app.assistant_config.schemas import AssistantSkillStepInput  # noqa: E402
@@ -76,3 +94,80 @@ class AssistantConfigServiceMoreTests(unittest.TestCase):
 
         svc.delete_skill(created.id)
         self.assertEqual(self.db.query(AssistantSkill).count(), 0)
+
+    def test_create_tool_and_skill_name_collision_is_case_insensitive(self) -> None:
+        from app.assistant_config.schemas import AssistantSkillCreateRequest, AssistantToolCreateRequest  # noqa: E402
+        from app.assistant_config.service import AssistantConfigService  # noqa: E402
+        from app.common.exceptions import ApiException  # noqa: E402
+
+        svc = AssistantConfigService(self.db)
+        svc.create_tool(AssistantToolCreateRequest(name="rt", kind="remote", endpoint_url="https://api.example.com"))
+        with self.assertRaises(ApiException) as ctx:
+            svc.create_tool(AssistantToolCreateRequest(name="RT", kind="remote", endpoint_url="https://api.example.com"))
+        self.assertEqual(ctx.exception.code, 40011)
+
+        svc.create_skill(AssistantSkillCreateRequest(name="s_1", description="d", mode="agent", system_prompt="p"))
+        with self.assertRaises(ApiException) as ctx:
+            svc.create_skill(AssistantSkillCreateRequest(name="S_1", description="d", mode="agent", system_prompt="p"))
+        self.assertEqual(ctx.exception.code, 40020)
+        # `_` 不再被当作通配符
+        svc.create_skill(AssistantSkillCreateRequest(name="s-1", description="d", mode="agent", system_prompt="p"))
+
+    def test_create_integrity_error_maps_only_name_index_to_name_exists(self) -> None:
+        from types import SimpleNamespace  # noqa: E402
+
+        from sqlalchemy.exc import IntegrityError  # noqa: E402
+
+        from app.assistant_config.schemas import AssistantSkillCreateRequest, AssistantToolCreateRequest  # noqa: E402
+        from app.assistant_config.service import AssistantConfigService  # noqa: E402
+        from app.common.exceptions import ApiException  # noqa: E402
+
+        class FakePgError(Exception):
+            def __init__(self, constraint_name: str) -> None:
+                super().__init__("duplicate key value violates unique constraint")
+                self.diag = SimpleNamespace(constraint_name=constraint_name)
+
+        svc = AssistantConfigService(self.db)
+        tool_req = AssistantToolCreateRequest(name="rt", kind="remote", endpoint_url="https://api.example.com")
+        skill_req = AssistantSkillCreateRequest(name="s1", description="d", mode="agent", system_prompt="p")
+        cases = [
+            (svc.create_tool, tool_req, "assistant_tool", (400, 40011), (409, 40912)),
+            (svc.create_skill, skill_req, "assistant_skill", (400, 40020), (409, 40920)),
+        ]
+        for create, req, table, name_exists, other in cases:
+            for orig, expected in (
+                # PostgreSQL：完全同名先命中 name 唯一索引，仅大小写不同命中 lower(name) 索引
+                (FakePgError(f"ix_{table}_name"), name_exists),
+                (FakePgError(f"uq_{table}_lower_name"), name_exists),
+                (FakePgError(f"{table}_pkey"), other),
+                # SQLite 错误文本
+                (Exception(f"UNIQUE constraint failed: {table}.name"), name_exists),
+                (Exception(f"UNIQUE constraint failed: index 'uq_{table}_lower_name'"), name_exists),
+                (Exception("FOREIGN KEY constraint failed"), other),
+            ):
+                with self.subTest(table=table, orig=getattr(getattr(orig, "diag", None), "constraint_name", str(orig))):
+                    with patch.object(self.db, "commit", side_effect=IntegrityError("stmt", "params", orig)):
+                        with self.assertRaises(ApiException) as ctx:
+                            create(req)
+                    self.assertEqual((ctx.exception.status_code, ctx.exception.code), expected)
+
+    def test_list_tools_and_skills_sync_once_per_definition_version(self) -> None:
+        from app.assistant_config.service import AssistantConfigService  # noqa: E402
+
+        svc = AssistantConfigService(self.db)
+        with (
+            patch.object(AssistantConfigService, "sync_system_tools") as sync_tools,
+            patch.object(AssistantConfigService, "sync_system_skills") as sync_skills,
+        ):
+            svc.list_tools()
+            svc.list_tools()
+            svc.list_skills()
+            svc.list_skills()
+            self.assertEqual(sync_tools.call_count, 1)
+            self.assertEqual(sync_skills.call_count, 1)
+
+            AssistantConfigService.reset_sync_state()
+            svc.list_tools()
+            svc.list_skills()
+            self.assertEqual(sync_tools.call_count, 2)
+            self.assertEqual(sync_skills.call_count, 2)
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from tests._bootstrap import bootstrap_backend_imports, reset_caches
+from tests._db import make_session
+
+
+bootstrap_backend_imports()
+reset_caches()
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.attachment.middleware import MULTIPART_OVERHEAD_BYTES, UploadSizeLimitMiddleware  # noqa: E402
+from app.attachment.router import router as attachment_router  # noqa: E402
+from app.attachment.schemas import AttachmentResponse  # noqa: E402
+from app.common.exceptions import register_exception_handlers  # noqa: E402
+from app.database import get_db  # noqa: E402
+
+
+class AttachmentApiTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db = make_session()
+
+        from app.attachment.models import Attachment  # noqa: E402
+        from app.entry.models import Entry, TimeMode  # noqa: E402
+        from app.entry_type.models import EntryType  # noqa: E402
+        from app.lightrag.models import AttachmentIndexOutbox  # noqa: E402
+
+        et = EntryType(code="t", name="T", graph_enabled=True, ai_enabled=True, enabled=True)
+        self.db.add(et)
+        self.db.commit()
+
+        entry = Entry(
+            title="e",
+            content=None,
+            type_id=et.id,
+            time_mode=TimeMode.POINT,
+            time_at=datetime.now(timezone.utc),
+        )
+        self.db.add(entry)
+        self.db.commit()
+
+        self.indexed = Attachment(
+            entry_id=entry.id,
+            filename="a.pdf",
+            original_filename="a.pdf",
+            file_path="k/a.pdf",
+            size=3,
+            content_type="application/pdf",
+            index_to_knowledge_graph=True,
+            parse_status="completed",
+        )
+        self.plain = Attachment(
+            entry_id=entry.id,
+            filename="b.txt",
+            original_filename="b.txt",
+            file_path="k/b.txt",
+            size=1,
+            content_type="text/plain",
+            parse_status="pending",
+        )
+        self.db.add_all([self.indexed, self.plain])
+        self.db.commit()
+        self.db.add(
+            AttachmentIndexOutbox(
+                attachment_id=self.indexed.id,
+                entry_id=entry.id,
+                op="upsert",
+                status="dead",
+                attempts=2,
+                last_error="boom",
+            )
+        )
+        self.db.commit()
+
+        app = FastAPI()
+        app.add_middleware(UploadSizeLimitMiddleware)
+        register_exception_handlers(app)
+        app.include_router(attachment_router)
+
+        def _override_get_db():  # noqa: ANN001
+            yield self.db
+
+        app.dependency_overrides[get_db] = _override_get_db
+        self.client = TestClient(app)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_list_payload_matches_schema_dump(self) -> None:
+        resp = self.client.get("/api/attachments")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers["content-type"], "application/json")
+        self.assertTrue(resp.json()["success"])
+        self.assertEqual(resp.json()["code"], 0)
+        self.assertEqual(resp.json()["message"], "OK")
+        items = {item["id"]: item for item in resp.json()["data"]}
+
+        expected_plain = AttachmentResponse.model_validate(self.plain).model_dump(by_alias=True, mode="json")
+        self.assertEqual(items[str(self.plain.id)], expected_plain)
+
+        indexed = items[str(self.indexed.id)]
+        expected_indexed = AttachmentResponse.model_validate(self.indexed).model_dump(by_alias=True, mode="json")
+        for key in ("kgIndexStatus", "kgIndexAttempts", "kgIndexLastError", "kgIndexUpdatedAt"):
+            expected_indexed.pop(key)
+            self.assertIn(key, indexed)
+        self.assertEqual({k: v for k, v in indexed.items() if not k.startswith("kgIndex")}, expected_indexed)
+        self.assertEqual(indexed["kgIndexStatus"], "dead")
+        self.assertEqual(indexed["kgIndexAttempts"], 2)
+        self.assertEqual(indexed["kgIndexLastError"], "boom")
+
+    def test_download_and_view_encode_filename_in_content_disposition(self) -> None:
+        from app.attachment import service as attachment_service_module  # noqa: E402
+
+        self.indexed.original_filename = "报告 v1.pdf"
+        self.db.commit()
+
+        class FakeStream:
+            headers = {"Content-Length": "3"}
+
+            def stream(self, _chunk_size):
+                yield b"pdf"
+
+            def close(self) -> None:
+                pass
+
+            def release_conn(self) -> None:
+                pass
+
+        class FakeClient:
+            def get_object(self, _bucket, _key, **_kwargs):
+                return FakeStream()
+
+        with patch.object(attachment_service_module, "get_minio_client", return_value=(FakeClient(), "b")):
+            download = self.client.get(f"/api/attachments/{self.indexed.id}/download")
+            view = self.client.get(f"/api/attachments/{self.indexed.id}/view")
+
+        encoded = "%E6%8A%A5%E5%91%8A%20v1.pdf"
+        self.assertEqual(download.headers["content-disposition"], f"attachment; filename*=UTF-8''{encoded}")
+        self.assertEqual(view.headers["content-disposition"], f"inline; filename*=UTF-8''{encoded}")
+        self.assertEqual(view.content, b"pdf")
+
+    def test_download_redirects_to_presigned_url_when_public_endpoint_set(self) -> None:
+        from app.attachment import service as attachment_service_module  # noqa: E402
+
+        calls: list[tuple] = []
+
+        class FakePublicClient:
+            def presigned_get_object(self, bucket, key, *, expires, response_headers):
+                calls.append((key, expires.total_seconds(), response_headers))
+                return f"https://files.example.com/{bucket}/{key}?sig=1"
+
+        with (
+            patch.object(attachment_service_module, "get_public_minio_client", return_value=FakePublicClient()),
+            patch.object(attachment_service_module, "get_minio_client", side_effect=AssertionError("proxied")),
+        ):
+            resp = self.client.get(f"/api/attachments/{self.indexed.id}/download", follow_redirects=False)
+
+        self.assertEqual(resp.status_code, 307)
+        self.assertTrue(resp.headers["location"].startswith("https://files.example.com/"))
+        key, expires, response_headers = calls[0]
+        self.assertEqual(key, "k/a.pdf")
+        self.assertEqual(expires, 60)
+        self.assertEqual(response_headers["response-content-type"], "application/pdf")
+        self.assertEqual(response_headers["response-content-disposition"], "attachment; filename*=UTF-8''a.pdf")
+
+    def test_oversized_upload_rejected_from_content_length(self) -> None:
+        from types import SimpleNamespace
+
+        from app.attachment import middleware as middleware_module  # noqa: E402
+        from app.attachment.service import AttachmentService  # noqa: E402
+        from app.common.exceptions import ApiException  # noqa: E402
+
+        reached = ApiException(status_code=409, code=40900, message="route reached")
+        url = f"/api/attachments/entry/{self.indexed.entry_id}/stream?filename=a.txt"
+        with (
+            patch.object(middleware_module, "get_settings", return_value=SimpleNamespace(docling_max_file_size_mb=0)),
+            patch.object(AttachmentService, "upload_stream", side_effect=reached) as upload,
+        ):
+            resp = self.client.put(url, content=b"x" * (MULTIPART_OVERHEAD_BYTES + 1))
+            self.assertEqual(resp.status_code, 413)
+            self.assertEqual(resp.json()["code"], 41300)
+            upload.assert_not_called()
+
+            # 未超限的请求照常进入路由
+            resp = self.client.put(url, content=b"x" * MULTIPART_OVERHEAD_BYTES)
+            self.assertEqual(resp.status_code, 409)
+            upload.assert_called_once()
+
+    def test_ok_json_matches_model_envelope(self) -> None:
+        from app.common.responses import ApiResponse  # noqa: E402
+
+        resp = self.client.get(f"/api/attachments/{self.indexed.id}")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["data"]["id"], str(self.indexed.id))
+
+        payload = {"id": self.indexed.id, "at": datetime(2026, 1, 1, tzinfo=timezone.utc), "name": "报告"}
+        self.assertEqual(
+            ApiResponse.ok_json(payload).body,
+            ApiResponse.ok(payload).model_dump_json().encode(),
+        )
+
+    def test_markdown_etag_returns_304_until_parse_changes(self) -> None:
+        url = f"/api/attachments/{self.indexed.id}/markdown"
+
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["etag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(first.headers["cache-control"], "private, no-cache")
+
+        cached = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(cached.headers["etag"], etag)
+
+        self.indexed.parsed_text = "# parsed"
+        self.indexed.parsed_at = datetime.now(timezone.utc)
+        self.db.commit()
+
+        refreshed = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertNotEqual(refreshed.headers["etag"], etag)
+        self.assertEqual(refreshed.json()["data"]["markdown"], "# parsed")
+
+    def test_markdown_etag_changes_when_parse_error_changes(self) -> None:
+        url = f"/api/attachments/{self.indexed.id}/markdown"
+        self.indexed.parse_status = "failed"
+        self.indexed.parse_last_error = "first error"
+        self.db.commit()
+        etag = self.client.get(url).headers["etag"]
+
+        # 重试后再次失败：状态不变，只有错误信息变化
+        self.indexed.parse_last_error = "second error"
+        self.db.commit()
+
+        resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp.headers["etag"], etag)
+        self.assertEqual(resp.json()["data"]["parseLastError"], "second error")
+
+    def test_view_honours_range_header(self) -> None:
+        from app.attachment import service as attachment_service_module  # noqa: E402
+
+        calls: list[dict] = []
+
+        class FakeStream:
+            headers = {"Content-Range": "bytes 0-3/1000", "Content-Length": "4"}
+
+            def stream(self, _chunk_size):
+                yield b"0123"
+
+            def close(self) -> None:
+                pass
+
+            def release_conn(self) -> None:
+                pass
+
+        class FakeClient:
+            def stat_object(self, _bucket, _key):
+                raise AssertionError("stat_object should not be called")
+
+            def get_object(self, _bucket, _key, **kwargs):
+                calls.append(kwargs)
+                return FakeStream()
+
+        with patch.object(attachment_service_module, "get_minio_client", return_value=(FakeClient(), "b")):
+            resp = self.client.get(f"/api/attachments/{self.indexed.id}/view", headers={"Range": "bytes=0-3"})
+
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp.headers["content-range"], "bytes 0-3/1000")
+        self.assertEqual(resp.headers["accept-ranges"], "bytes")
+        self.assertEqual(resp.content, b"0123")
+        self.assertEqual(calls, [{"offset": 0, "length": 4}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+"""Unit tests for attachment parse outbox repo."""
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from tests._bootstrap import bootstrap_backend_imports, reset_caches
+from tests._db import make_session
+
+
+bootstrap_backend_imports()
+reset_caches()
+
+
+class AttachmentParseOutboxRepoTests(unittest.TestCase):
+    """Tests for AttachmentParseOutboxRepo claim/mark operations."""
+
+    def setUp(self) -> None:
+        self.db = make_session()
+
+        from app.attachment.models import Attachment
+        from app.entry.models import Entry, TimeMode
+        from app.entry_type.models import EntryType
+
+        entry_type = EntryType(code="test", name="Test", graph_enabled=True, ai_enabled=True, enabled=True)
+        self.db.add(entry_type)
+        self.db.commit()
+
+        self.entry = Entry(title="Test Entry", content="c", type_id=entry_type.id, time_mode=TimeMode.NONE)
+        self.db.add(self.entry)
+        self.db.commit()
+
+        self.attachment = Attachment(
+            entry_id=self.entry.id,
+            filename="a.pdf",
+            original_filename="a.pdf",
+            file_path="p/a.pdf",
+            size=1,
+            content_type="application/pdf",
+        )
+        self.db.add(self.attachment)
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def _add_outbox(self, **kwargs):
+        from app.attachment.models import AttachmentParseOutbox
+
+        outbox = AttachmentParseOutbox(attachment_id=self.attachment.id, entry_id=self.entry.id, **kwargs)
+        self.db.add(outbox)
+        self.db.commit()
+        return outbox.id
+
+    def test_claim_batch_claims_in_order_and_skips_active_locks(self) -> None:
+        from app.attachment.models import AttachmentParseOutbox
+        from app.attachment.outbox_repo import AttachmentParseOutboxRepo, OutboxClaim
+
+        now = datetime.now(timezone.utc)
+        later_id = self._add_outbox(status="pending", attempts=0, available_at=now - timedelta(seconds=5))
+        first_id = self._add_outbox(status="pending", attempts=1, available_at=now - timedelta(seconds=50))
+        stale_id = self._add_outbox(
+            status="processing", attempts=1, available_at=now - timedelta(seconds=60),
+            locked_at=now - timedelta(seconds=600), locked_by="dead-worker",
+        )
+        self._add_outbox(
+            status="processing", attempts=1, available_at=now - timedelta(seconds=60),
+            locked_at=now - timedelta(seconds=5), locked_by="other",
+        )
+        self._add_outbox(status="pending", attempts=3, available_at=now - timedelta(seconds=60))
+        self._add_outbox(status="pending", attempts=0, available_at=now + timedelta(seconds=60))
+
+        repo = AttachmentParseOutboxRepo(self.db)
+        result = repo.claim_batch(now=now, batch_size=10, worker_id="w1", lock_ttl_sec=300, max_attempts=3)
+
+        self.assertEqual([c.id for c in result.claimed], [stale_id, first_id, later_id])
+        self.assertEqual([c.attempts for c in result.claimed], [2, 2, 1])
+        self.assertIsInstance(result.claimed[0], OutboxClaim)
+        self.assertEqual(result.claimed[0].attachment_id, self.attachment.id)
+
+        row = self.db.get(AttachmentParseOutbox, later_id)
+        self.assertEqual(row.status, "processing")
+        self.assertEqual(row.locked_by, "w1")
+        self.assertIsNotNone(row.locked_at)
+
+    def test_enqueue_many_inserts_rows_with_model_defaults(self) -> None:
+        from app.attachment.models import AttachmentParseOutbox
+        from app.attachment.outbox_repo import AttachmentParseOutboxRepo
+
+        repo = AttachmentParseOutboxRepo(self.db)
+        repo.enqueue_many([
+            {"attachment_id": self.attachment.id, "entry_id": self.entry.id},
+            {"attachment_id": self.attachment.id, "entry_id": self.entry.id},
+        ])
+        repo.enqueue_many([])
+        self.db.commit()
+
+        rows = self.db.query(AttachmentParseOutbox).all()
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(len({r.id for r in rows}), 2)
+        self.assertEqual({r.status for r in rows}, {"pending"})
+        self.assertEqual({r.attempts for r in rows}, {0})
+        self.assertTrue(all(r.available_at is not None for r in rows))
+
+    def test_claim_batch_respects_batch_size(self) -> None:
+        from app.attachment.outbox_repo import AttachmentParseOutboxRepo
+
+        now = datetime.now(timezone.utc)
+        for i in range(3):
+            self._add_outbox(status="pending", attempts=0, available_at=now - timedelta(seconds=10 - i))
+
+        repo = AttachmentParseOutboxRepo(self.db)
+        first = repo.claim_batch(now=now, batch_size=2, worker_id="w1", lock_ttl_sec=300, max_attempts=3)
+        second = repo.claim_batch(now=now, batch_size=2, worker_id="w2", lock_ttl_sec=300, max_attempts=3)
+
+        self.assertEqual(len(first.claimed), 2)
+        self.assertEqual(len(second.claimed), 1)
+
+    def test_mark_methods_update_only_rows_owned_by_worker(self) -> None:
+        from app.attachment.models import AttachmentParseOutbox
+        from app.attachment.outbox_repo import AttachmentParseOutboxRepo
+
+        now = datetime.now(timezone.utc)
+        ids = [
+            self._add_outbox(status="pending", attempts=0, available_at=now - timedelta(seconds=10 - i))
+            for i in range(3)
+        ]
+        repo = AttachmentParseOutboxRepo(self.db, worker_id="w1")
+        repo.claim_batch(now=now, batch_size=10, worker_id="w1", lock_ttl_sec=300, max_attempts=3)
+
+        other = AttachmentParseOutboxRepo(self.db, worker_id="w2")
+        self.assertFalse(other.mark_succeeded(outbox_id=ids[0]))
+
+        self.assertTrue(repo.mark_succeeded(outbox_id=ids[0]))
+        self.assertFalse(repo.mark_succeeded(outbox_id=ids[0]))
+        self.assertTrue(repo.mark_retry(outbox_id=ids[1], next_available_at=now, error_message="boom"))
+        self.assertTrue(repo.mark_dead(outbox_id=ids[2], error_message=""))
+        self.db.expire_all()
+
+        rows = [self.db.get(AttachmentParseOutbox, i) for i in ids]
+        self.assertEqual([r.status for r in rows], ["succeeded", "pending", "dead"])
+        self.assertEqual([r.locked_by for r in rows], [None, None, None])
+        self.assertEqual(rows[1].last_error, "boom")
+        self.assertIsNone(rows[2].last_error)
+
+    def test_mark_batch_applies_each_action_and_skips_lost_locks(self) -> None:
+        from app.attachment.models import AttachmentParseOutbox
+        from app.attachment.outbox_repo import AttachmentParseOutboxRepo, ParseCompletion
+
+        now = datetime.now(timezone.utc)
+        ids = [
+            self._add_outbox(status="pending", attempts=0, available_at=now - timedelta(seconds=10 - i))
+            for i in range(4)
+        ]
+        repo = AttachmentParseOutboxRepo(self.db, worker_id="w1")
+        repo.claim_batch(now=now, batch_size=10, worker_id="w1", lock_ttl_sec=300, max_attempts=3)
+
+        # 模拟锁被其他 worker 接管
+        stolen = self.db.get(AttachmentParseOutbox, ids[3])
+        stolen.locked_by = "w2"
+        self.db.commit()
+
+        retry_at = now + timedelta(seconds=30)
+        updated = repo.mark_batch([
+            ParseCompletion(outbox_id=ids[0], action="succeeded"),
+            ParseCompletion(outbox_id=ids[1], action="retry", error_message="boom", next_available_at=retry_at),
+            ParseCompletion(outbox_id=ids[2], action="dead", error_message="x" * 5000),
+            ParseCompletion(outbox_id=ids[3], action="succeeded"),
+        ])
+        self.db.expire_all()
+
+        self.assertEqual(updated, set(ids[:3]))
+        rows = [self.db.get(AttachmentParseOutbox, i) for i in ids]
+        self.assertEqual([r.status for r in rows], ["succeeded", "pending", "dead", "processing"])
+        self.assertIsNone(rows[0].locked_by)
+        self.assertEqual(rows[1].last_error, "boom")
+        self.assertEqual(rows[1].available_at.replace(tzinfo=timezone.utc), retry_at)
+        self.assertEqual(len(rows[2].last_error), 4000)
+        self.assertEqual(rows[3].locked_by, "w2")
+
+
+class ComputeBackoffTests(unittest.TestCase):
+    def test_backoff_stays_within_decorrelated_window_and_cap(self) -> None:
+        from app.attachment.outbox_repo import compute_backoff
+
+        for attempts, upper in ((1, 15.0), (2, 30.0), (3, 60.0)):
+            for _ in range(50):
+                seconds = compute_backoff(attempts, base_sec=5.0, cap_sec=300.0).total_seconds()
+                self.assertGreaterEqual(seconds, 5.0)
+                self.assertLessEqual(seconds, upper)
+
+        for _ in range(50):
+            self.assertLessEqual(compute_backoff(50, base_sec=5.0, cap_sec=300.0).total_seconds(), 300.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+"""Unit tests for attachment preview helpers."""
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+
+from tests._bootstrap import bootstrap_backend_imports
+
+
+bootstrap_backend_imports()
+
+
+class AttachmentPreviewTests(unittest.TestCase):
+    def test_get_file_extension_matches_path_suffix(self) -> None:
+        from app.attachment.preview import get_file_extension, get_file_suffix
+
+        for name in ["a.PDF", ".bashrc", "a.", "noext", "a.tar.gz", "dir.x/file", "dir/.md", "..", "a..b", ""]:
+            with self.subTest(name=name):
+                self.assertEqual(get_file_suffix(name), Path(name).suffix)
+                self.assertEqual(get_file_extension(name), Path(name).suffix.lower())
+
+    def test_helpers_accept_precomputed_extension(self) -> None:
+        from app.attachment.preview import get_canonical_mime_type, is_inline_previewable, is_text_file
+
+        self.assertTrue(is_inline_previewable("x.bin", ext=".png"))
+        self.assertFalse(is_text_file("x.md", ext=".pdf"))
+        self.assertEqual(get_canonical_mime_type("x.bin", "fallback", ext=".md"), "text/markdown")
+        self.assertEqual(get_canonical_mime_type("x.bin", "fallback"), "fallback")
+
+
+if __name__ == "__main__":
+    unittest.main()
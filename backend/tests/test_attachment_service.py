@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import io
 import unittest
 from datetime import datetime, timezone
@@ -134,7 +135,7 @@ class AttachmentServiceTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(ctx.exception.code, 50002)
         rm.assert_called()
 
-    def test_delete_remove_object_failed_raises_50001(self) -> None:
+    async def test_delete_remove_object_failed_raises_50001(self) -> None:
         from app.attachment.models import Attachment  # noqa: E402
         from app.attachment.service import AttachmentService  # noqa: E402
         from app.attachment import service as attachment_service_module  # noqa: E402
@@ -154,14 +155,45 @@ class AttachmentServiceTests(unittest.IsolatedAsyncioTestCase):
 
         with (
             patch.object(attachment_service_module, "get_minio_client", return_value=(object(), "b")),
-            patch.object(attachment_service_module, "remove_object_safe", return_value=False),
+            patch.object(attachment_service_module, "remove_object_safe", return_value=False) as rm,
+            patch.object(attachment_service_module, "_DELETE_BACKOFF_BASE_SEC", 0),
         ):
             with self.assertRaises(ApiException) as ctx:
-                svc.delete(att.id)
+                await svc.delete(att.id)
         self.assertEqual(ctx.exception.status_code, 500)
         self.assertEqual(ctx.exception.code, 50001)
+        self.assertEqual(rm.call_count, 3)
+        self.assertIsNotNone(self.db.get(Attachment, att.id))
 
-    def test_delete_storage_unavailable_raises_50002(self) -> None:
+    async def test_delete_retries_transient_storage_failure(self) -> None:
+        from app.attachment.models import Attachment  # noqa: E402
+        from app.attachment.service import AttachmentService  # noqa: E402
+        from app.attachment import service as attachment_service_module  # noqa: E402
+
+        att = Attachment(
+            entry_id=self.entry.id,
+            filename="f",
+            original_filename="o",
+            file_path="k",
+            size=1,
+            content_type="text/plain",
+        )
+        self.db.add(att)
+        self.db.commit()
+        att_id = att.id
+
+        svc = AttachmentService(self.db)
+        with (
+            patch.object(attachment_service_module, "get_minio_client", return_value=(object(), "b")),
+            patch.object(attachment_service_module, "remove_object_safe", side_effect=[False, True]) as rm,
+            patch.object(attachment_service_module, "_DELETE_BACKOFF_BASE_SEC", 0),
+        ):
+            await svc.delete(att_id)
+
+        self.assertEqual(rm.call_count, 2)
+        self.assertIsNone(self.db.get(Attachment, att_id))
+
+    async def test_delete_storage_unavailable_raises_50002(self) -> None:
         from app.attachment.models import Attachment  # noqa: E402
         from app.attachment.service import AttachmentService  # noqa: E402
         from app.attachment import service as attachment_service_module  # noqa: E402
@@ -182,7 +214,7 @@ class AttachmentServiceTests(unittest.IsolatedAsyncioTestCase):
             attachment_service_module, "get_minio_client", side_effect=attachment_service_module.StorageError("down")
         ):
             with self.assertRaises(ApiException) as ctx:
-                svc.delete(att.id)
+                await svc.delete(att.id)
         self.assertEqual(ctx.exception.status_code, 500)
         self.assertEqual(ctx.exception.code, 50002)
 
@@ -198,7 +230,7 @@ class AttachmentServiceTests(unittest.IsolatedAsyncioTestCase):
                 self.code = code
 
         class FakeClient:
-            def stat_object(self, _bucket: str, _object_key: str):
+            def get_object(self, _bucket: str, _object_key: str, **_kwargs):
                 raise FakeS3Error("NoSuchKey")
 
         with (
@@ -222,7 +254,7 @@ class AttachmentServiceTests(unittest.IsolatedAsyncioTestCase):
                 self.code = code
 
         class FakeClient:
-            def stat_object(self, _bucket: str, _object_key: str):
+            def get_object(self, _bucket: str, _object_key: str, **_kwargs):
                 raise FakeS3Error("AccessDenied")
 
         with (
@@ -257,3 +289,361 @@ class AttachmentServiceTests(unittest.IsolatedAsyncioTestCase):
         with self.assertRaises(ApiException) as ctx:
             svc.find_by_id(UUID("00000000-0000-0000-0000-000000000001"))
         self.assertEqual(ctx.exception.status_code, 404)
+
+    def test_get_latest_kg_index_map_returns_newest_row_per_attachment(self) -> None:
+        from datetime import timedelta
+
+        from app.attachment.models import Attachment  # noqa: E402
+        from app.attachment.service import AttachmentService  # noqa: E402
+        from app.lightrag.models import AttachmentIndexOutbox  # noqa: E402
+
+        atts = []
+        for name in ("a", "b", "c"):
+            att = Attachment(
+                entry_id=self.entry.id,
+                filename=name,
+                original_filename=name,
+                file_path=name,
+                size=1,
+                content_type="text/plain",
+            )
+            self.db.add(att)
+            atts.append(att)
+        self.db.commit()
+
+        base = datetime.now(timezone.utc)
+        for att, statuses in ((atts[0], ["succeeded", "pending", "dead"]), (atts[1], ["processing"])):
+            for i, status in enumerate(statuses):
+                self.db.add(
+                    AttachmentIndexOutbox(
+                        attachment_id=att.id,
+                        entry_id=self.entry.id,
+                        op="upsert",
+                        status=status,
+                        created_at=base + timedelta(seconds=i),
+                        updated_at=base + timedelta(seconds=i),
+                    )
+                )
+        self.db.commit()
+
+        svc = AttachmentService(self.db)
+        kg_map = svc.get_latest_kg_index_map([a.id for a in atts])
+
+        self.assertEqual(set(kg_map), {atts[0].id, atts[1].id})
+        self.assertEqual(kg_map[atts[0].id].status, "dead")
+        self.assertEqual(kg_map[atts[1].id].status, "processing")
+        self.assertEqual(kg_map[atts[0].id].attempts, 0)
+        self.assertNotIsInstance(kg_map[atts[0].id], AttachmentIndexOutbox)
+        self.assertEqual(svc.get_latest_kg_index_map([]), {})
+        self.assertEqual(svc.get_latest_kg_index_map_window([a.id for a in atts]), kg_map)
+        self.assertEqual(svc.get_latest_kg_index_map_window([]), {})
+
+    def test_find_with_kg_pairs_each_attachment_with_latest_outbox(self) -> None:
+        from datetime import timedelta
+
+        from app.attachment.models import Attachment  # noqa: E402
+        from app.attachment.service import AttachmentService  # noqa: E402
+        from app.lightrag.models import AttachmentIndexOutbox  # noqa: E402
+
+        indexed = Attachment(
+            entry_id=self.entry.id, filename="a", original_filename="a", file_path="a", size=1, content_type="t"
+        )
+        plain = Attachment(
+            entry_id=self.entry.id, filename="b", original_filename="b", file_path="b", size=1, content_type="t"
+        )
+        self.db.add_all([indexed, plain])
+        self.db.commit()
+
+        base = datetime.now(timezone.utc)
+        for i, status in enumerate(["succeeded", "pending"]):
+            self.db.add(
+                AttachmentIndexOutbox(
+                    attachment_id=indexed.id,
+                    entry_id=self.entry.id,
+                    op="upsert",
+                    status=status,
+                    created_at=base + timedelta(seconds=i),
+                    updated_at=base + timedelta(seconds=i),
+                )
+            )
+        self.db.commit()
+
+        svc = AttachmentService(self.db)
+        rows = svc.find_all_with_kg()
+        by_id = {att.id: kg for att, kg in rows}
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(by_id[indexed.id].status, "pending")
+        self.assertIsNone(by_id[plain.id])
+
+        self.assertEqual(len(svc.find_by_entry_with_kg(self.entry.id)), 2)
+        self.assertEqual(svc.find_by_entry_with_kg(UUID("00000000-0000-0000-0000-000000000001")), [])
+
+    def test_find_all_summary_skips_heavy_columns(self) -> None:
+        from app.attachment.models import Attachment  # noqa: E402
+        from app.attachment.service import AttachmentService  # noqa: E402
+
+        att = Attachment(
+            entry_id=self.entry.id,
+            filename="a",
+            original_filename="a.pdf",
+            file_path="a",
+            size=7,
+            content_type="application/pdf",
+            parsed_text="x" * 1000,
+            parse_status="completed",
+        )
+        self.db.add(att)
+        self.db.commit()
+
+        rows = AttachmentService(self.db).find_all_summary()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].id, att.id)
+        self.assertEqual(rows[0].size, 7)
+        self.assertEqual(rows[0].original_filename, "a.pdf")
+        self.assertFalse(hasattr(rows[0], "parsed_text"))
+
+        self.assertEqual(AttachmentService(self.db).find_all_summary(Attachment.entry_id == att.id), [])
+
+    def test_find_by_id_reuses_identity_map(self) -> None:
+        from sqlalchemy import event
+
+        from app.attachment.models import Attachment  # noqa: E402
+        from app.attachment.service import AttachmentService  # noqa: E402
+
+        att = Attachment(
+            entry_id=self.entry.id, filename="a", original_filename="a", file_path="a", size=1, content_type="t"
+        )
+        self.db.add(att)
+        self.db.commit()
+
+        svc = AttachmentService(self.db)
+        first = svc.find_by_id(att.id)
+
+        statements: list[str] = []
+
+        def _count(_conn, _cursor, statement, *_args) -> None:  # noqa: ANN001
+            statements.append(statement)
+
+        engine = self.db.get_bind()
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            second = svc.find_by_id(att.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+
+        self.assertIs(first, second)
+        self.assertEqual(statements, [])
+
+        with self.assertRaises(ApiException) as ctx:
+            svc.find_by_id(UUID("00000000-0000-0000-0000-000000000001"))
+        self.assertEqual(ctx.exception.status_code, 404)
+
+    async def test_snapshot_cache_skips_db_until_delete(self) -> None:
+        from app.attachment.models import Attachment  # noqa: E402
+        from app.attachment.service import AttachmentService  # noqa: E402
+        from app.attachment import service as attachment_service_module  # noqa: E402
+
+        att = Attachment(
+            entry_id=self.entry.id, filename="a", original_filename="a.pdf", file_path="k", size=1, content_type="t"
+        )
+        self.db.add(att)
+        self.db.commit()
+        att_id = att.id
+
+        svc = AttachmentService(self.db)
+        first = svc.get_snapshot(att_id)
+        self.assertEqual((first.file_path, first.original_filename), ("k", "a.pdf"))
+
+        with patch.object(AttachmentService, "find_by_id", side_effect=AssertionError("should hit cache")):
+            self.assertIs(svc.get_snapshot(att_id), first)
+
+        with (
+            patch.object(attachment_service_module, "get_minio_client", return_value=(object(), "b")),
+            patch.object(attachment_service_module, "remove_object_safe", return_value=True),
+        ):
+            await svc.delete(att_id)
+
+        with self.assertRaises(ApiException) as ctx:
+            svc.get_snapshot(att_id)
+        self.assertEqual(ctx.exception.status_code, 404)
+
+    def test_parse_byte_range(self) -> None:
+        from app.attachment.service import AttachmentService  # noqa: E402
+
+        parse = AttachmentService.parse_byte_range
+        self.assertEqual(parse("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse("bytes=990-5000", 1000), (990, 999))
+        self.assertIsNone(parse(None, 1000))
+        self.assertIsNone(parse("bytes=1000-", 1000))
+        self.assertIsNone(parse("bytes=5-1", 1000))
+        self.assertIsNone(parse("bytes=0-1,5-9", 1000))
+        self.assertIsNone(parse("items=0-1", 1000))
+        self.assertIsNone(parse("bytes=a-b", 1000))
+
+    def test_get_object_stream_with_range_requests_partial_object(self) -> None:
+        from app.attachment.service import AttachmentService  # noqa: E402
+        from app.attachment import service as attachment_service_module  # noqa: E402
+
+        calls: list[dict] = []
+
+        class FakeClient:
+            def stat_object(self, _bucket: str, _object_key: str):
+                calls.append({"stat": True})
+                return SimpleNamespace(size=1000)
+
+            def get_object(self, _bucket: str, _object_key: str, offset: int = 0, length: int = 0):
+                if offset or length:
+                    calls.append({"offset": offset, "length": length})
+                    end = offset + length - 1 if length else 999
+                    return SimpleNamespace(headers={"Content-Range": f"bytes {offset}-{end}/1000"})
+                calls.append({})
+                return SimpleNamespace(headers={"Content-Length": "1000", "Content-Type": "application/pdf"})
+
+        svc = AttachmentService(self.db)
+        with patch.object(attachment_service_module, "get_minio_client", return_value=(FakeClient(), "b")):
+            _stream, info, byte_range = svc.get_object_stream("k", range_header="bytes=100-199")
+            self.assertEqual((info.size, byte_range), (1000, (100, 199)))
+            _stream, info, byte_range = svc.get_object_stream("k", range_header="bytes=900-")
+            self.assertEqual((info.size, byte_range), (1000, (900, 999)))
+            _stream, info, full_range = svc.get_object_stream("k")
+            self.assertEqual((info.size, info.content_type, full_range), (1000, "application/pdf", None))
+            self.assertEqual(calls, [{"offset": 100, "length": 100}, {"offset": 900, "length": 0}, {}])
+
+            # 只有后缀区间需要先 HEAD 取对象大小
+            calls.clear()
+            _stream, info, byte_range = svc.get_object_stream("k", range_header="bytes=-100")
+        self.assertEqual(byte_range, (900, 999))
+        self.assertEqual(calls, [{"stat": True}, {"offset": 900, "length": 100}])
+
+    def test_read_text_content_uses_single_bounded_get(self) -> None:
+        from app.attachment.service import AttachmentService  # noqa: E402
+        from app.attachment import service as attachment_service_module  # noqa: E402
+
+        class FakeStream:
+            def __init__(self, data: bytes) -> None:
+                self._data = data
+
+            def read(self) -> bytes:
+                return self._data
+
+            def close(self) -> None:
+                pass
+
+            def release_conn(self) -> None:
+                pass
+
+        calls: list[dict] = []
+
+        class FakeClient:
+            def __init__(self, data: bytes) -> None:
+                self.data = data
+
+            def stat_object(self, _bucket: str, _object_key: str):
+                raise AssertionError("stat_object should not be called")
+
+            def get_object(self, _bucket: str, _object_key: str, **kwargs):
+                calls.append(kwargs)
+                return FakeStream(self.data[kwargs["offset"]:kwargs["offset"] + kwargs["length"]])
+
+        svc = AttachmentService(self.db)
+        with patch.object(attachment_service_module, "get_minio_client", return_value=(FakeClient(b"hello"), "b")):
+            self.assertEqual(svc.read_text_content("k", 5), "hello")
+        self.assertEqual(calls, [{"offset": 0, "length": 6}])
+
+        with patch.object(attachment_service_module, "get_minio_client", return_value=(FakeClient(b"hello!"), "b")):
+            with self.assertRaises(ApiException) as ctx:
+                svc.read_text_content("k", 5)
+        self.assertEqual(ctx.exception.code, 41310)
+
+    async def test_upload_unseekable_file_records_streamed_size_without_stat(self) -> None:
+        from app.attachment.service import AttachmentService  # noqa: E402
+        from app.attachment import service as attachment_service_module  # noqa: E402
+
+        class Unseekable(io.BytesIO):
+            def seek(self, *_args, **_kwargs):
+                raise io.UnsupportedOperation("seek")
+
+        upload_kwargs: dict = {}
+
+        class FakeClient:
+            def put_object(self, **kwargs):
+                upload_kwargs.update(kwargs)
+                data = kwargs["data"]
+                while data.read(2):
+                    pass
+
+            def stat_object(self, _bucket: str, _object_key: str):
+                raise AssertionError("stat_object should not be called")
+
+        svc = AttachmentService(self.db)
+        fake_file = SimpleNamespace(filename="a.txt", content_type="text/plain", file=Unseekable(b"hello"))
+        with patch.object(attachment_service_module, "get_minio_client", return_value=(FakeClient(), "b")):
+            att = await svc.upload(self.entry.id, fake_file)
+
+        self.assertEqual(att.size, 5)
+        self.assertEqual(att.sha256, hashlib.sha256(b"hello").hexdigest())
+        self.assertEqual(upload_kwargs["length"], -1)
+        self.assertEqual(upload_kwargs["num_parallel_uploads"], 4)
+        self.assertEqual(upload_kwargs["part_size"], 16 * 1024 * 1024)
+
+    def test_upload_part_size_grows_for_large_files(self) -> None:
+        from app.attachment.service import _upload_part_size  # noqa: E402
+
+        settings = SimpleNamespace(minio_part_size_mb=16, minio_large_part_size_mb=64, minio_large_file_threshold_mb=256)
+        mib = 1024 * 1024
+        self.assertEqual(_upload_part_size(settings, 0), 16 * mib)
+        self.assertEqual(_upload_part_size(settings, 256 * mib), 16 * mib)
+        self.assertEqual(_upload_part_size(settings, 256 * mib + 1), 64 * mib)
+        settings.minio_part_size_mb = 1
+        self.assertEqual(_upload_part_size(settings, 10), 5 * mib)
+
+    async def test_upload_stream_pipes_async_chunks_and_enforces_limit(self) -> None:
+        from app.attachment.service import AttachmentService  # noqa: E402
+        from app.attachment import service as attachment_service_module  # noqa: E402
+
+        received: list[bytes] = []
+
+        class FakeClient:
+            def put_object(self, **kwargs):
+                data = kwargs["data"]
+                while chunk := data.read(3):
+                    received.append(chunk)
+
+        async def body(parts):
+            for part in parts:
+                yield part
+
+        svc = AttachmentService(self.db)
+        with (
+            patch.object(attachment_service_module, "get_minio_client", return_value=(FakeClient(), "b")),
+            patch.object(attachment_service_module, "remove_object_safe", return_value=True) as rm,
+        ):
+            att = await svc.upload_stream(
+                self.entry.id, body([b"he", b"llo", b" world"]), filename="a.txt", content_type="text/plain"
+            )
+            self.assertEqual(b"".join(received), b"hello world")
+            self.assertEqual(att.size, 11)
+            self.assertEqual(att.sha256, hashlib.sha256(b"hello world").hexdigest())
+            self.assertEqual(att.original_filename, "a.txt")
+
+            with (
+                patch.object(
+                    attachment_service_module,
+                    "get_settings",
+                    return_value=SimpleNamespace(
+                        docling_max_file_size_mb=1,
+                        minio_upload_parallelism=4,
+                        minio_part_size_mb=16,
+                        minio_large_part_size_mb=64,
+                        minio_large_file_threshold_mb=256,
+                    ),
+                ),
+                self.assertRaises(ApiException) as ctx,
+            ):
+                await svc.upload_stream(
+                    self.entry.id, body([b"x" * (1024 * 1024), b"y"]), filename="big.txt", content_type="text/plain"
+                )
+        self.assertEqual(ctx.exception.status_code, 413)
+        rm.assert_called_once()
@@ -0,0 +1,293 @@
+"""Unit tests for attachment parse worker helpers."""
+from __future__ import annotations
+
+import io
+import os
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from tests._bootstrap import bootstrap_backend_imports, reset_caches
+from tests._db import make_session
+
+
+bootstrap_backend_imports()
+
+
+class AdaptiveBatchSizeTests(unittest.TestCase):
+    def _make_worker(self, *, batch_size: int, max_batch_size: int):
+        from app.attachment.worker import Worker, WorkerConfig
+
+        cfg = WorkerConfig(
+            enabled=True,
+            poll_interval_ms=10,
+            batch_size=batch_size,
+            max_attempts=3,
+            lock_ttl_sec=60,
+            worker_id="w1",
+            max_batch_size=max_batch_size,
+        )
+        return Worker(cfg, session_factory=lambda: None)
+
+    def test_grows_on_full_batches_up_to_cap(self) -> None:
+        worker = self._make_worker(batch_size=2, max_batch_size=5)
+
+        worker._adapt_batch_size(2)
+        self.assertEqual(worker.batch_size, 4)
+        worker._adapt_batch_size(4)
+        self.assertEqual(worker.batch_size, 5)
+        worker._adapt_batch_size(5)
+        self.assertEqual(worker.batch_size, 5)
+
+    def test_shrinks_on_sparse_batches_down_to_one(self) -> None:
+        worker = self._make_worker(batch_size=8, max_batch_size=8)
+
+        worker._adapt_batch_size(4)
+        self.assertEqual(worker.batch_size, 8)
+        worker._adapt_batch_size(1)
+        self.assertEqual(worker.batch_size, 4)
+        for _ in range(5):
+            worker._adapt_batch_size(0)
+        self.assertEqual(worker.batch_size, 1)
+
+    def test_initial_batch_size_is_clamped_to_cap(self) -> None:
+        worker = self._make_worker(batch_size=50, max_batch_size=8)
+        self.assertEqual(worker.batch_size, 8)
+
+
+class ProcessOneTests(unittest.TestCase):
+    def setUp(self) -> None:
+        reset_caches()
+        self.db = make_session()
+
+        from app.attachment.models import Attachment
+        from app.entry.models import Entry, TimeMode
+        from app.entry_type.models import EntryType
+
+        et = EntryType(code="t", name="T", graph_enabled=True, ai_enabled=True, enabled=True)
+        self.db.add(et)
+        self.db.commit()
+        entry = Entry(title="e", type_id=et.id, time_mode=TimeMode.POINT, time_at=datetime.now(timezone.utc))
+        self.db.add(entry)
+        self.db.commit()
+        self.attachment = Attachment(
+            entry_id=entry.id,
+            filename="a.md",
+            original_filename="a.md",
+            file_path="k/a.md",
+            size=3,
+            content_type="text/markdown",
+            parse_status="pending",
+        )
+        self.db.add(self.attachment)
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_downloads_object_to_temp_file_and_parses_it(self) -> None:
+        from app.attachment import parser as parser_module
+        from app.attachment.worker import Worker, WorkerConfig
+        from app.common import storage as storage_module
+
+        payload = b"# title\n" * 300_000
+
+        class FakeResponse(io.BytesIO):
+            def release_conn(self) -> None:
+                pass
+
+        class FakeClient:
+            def get_object(self, _bucket, _key):
+                return FakeResponse(payload)
+
+        seen: dict = {}
+
+        def fake_parse(path, _content_type):
+            with open(path, "rb") as f:
+                seen["data"] = f.read()
+            seen["suffix"] = path.rsplit(".", 1)[-1]
+            return "parsed"
+
+        cfg = WorkerConfig(
+            enabled=True, poll_interval_ms=10, batch_size=1, max_attempts=3, lock_ttl_sec=60, worker_id="w1"
+        )
+        outbox = SimpleNamespace(
+            id=self.attachment.id, attachment_id=self.attachment.id, entry_id=self.attachment.entry_id, attempts=1
+        )
+        with (
+            patch.object(storage_module, "get_minio_client", return_value=(FakeClient(), "b")),
+            patch.object(parser_module, "parse_document", side_effect=fake_parse),
+        ):
+            completion = Worker(cfg, session_factory=lambda: self.db)._process_one(
+                self.db, None, outbox, self.attachment, datetime.now(timezone.utc)
+            )
+
+        self.assertEqual(completion.action, "succeeded")
+        self.assertEqual(seen["data"], payload)
+        self.assertEqual(seen["suffix"], "md")
+        self.db.refresh(self.attachment)
+        self.assertEqual(self.attachment.parse_status, "completed")
+        self.assertEqual(self.attachment.parsed_text, "parsed")
+
+    def test_run_once_marks_claimed_batch_processing_in_one_commit(self) -> None:
+        from app.attachment.models import AttachmentParseOutbox
+        from app.attachment.outbox_repo import ParseCompletion
+        from app.attachment.worker import Worker, WorkerConfig
+
+        self.db.add(
+            AttachmentParseOutbox(
+                attachment_id=self.attachment.id, entry_id=self.attachment.entry_id, status="pending"
+            )
+        )
+        self.db.commit()
+
+        cfg = WorkerConfig(
+            enabled=True, poll_interval_ms=10, batch_size=1, max_attempts=3, lock_ttl_sec=60, worker_id="w1"
+        )
+        worker = Worker(cfg, session_factory=lambda: self.db)
+        seen: list[str] = []
+
+        def fake_process(_db, _repo, outbox, attachment, _now, download):
+            seen.append(attachment.parse_status)
+            download.result()
+            return ParseCompletion(outbox_id=outbox.id, action="succeeded")
+
+        with (
+            patch.object(worker, "_download", return_value="/nonexistent/a.md") as download,
+            patch.object(worker, "_process_one", side_effect=fake_process),
+        ):
+            self.assertEqual(worker.run_once(), 1)
+
+        self.assertEqual(seen, ["processing"])
+        download.assert_called_once_with("k/a.md", "a.md")
+        outbox = self.db.query(AttachmentParseOutbox).one()
+        self.assertEqual(outbox.status, "succeeded")
+
+    def test_run_once_pipelines_downloads_and_removes_temp_files(self) -> None:
+        from app.attachment import parser as parser_module
+        from app.attachment.models import Attachment, AttachmentParseOutbox
+        from app.attachment.worker import Worker, WorkerConfig
+        from app.common import storage as storage_module
+
+        second = Attachment(
+            entry_id=self.attachment.entry_id,
+            filename="b.md",
+            original_filename="b.md",
+            file_path="k/b.md",
+            size=3,
+            content_type="text/markdown",
+            parse_status="pending",
+        )
+        self.db.add(second)
+        self.db.commit()
+        first_id, second_id = self.attachment.id, second.id
+        for att in (self.attachment, second):
+            self.db.add(AttachmentParseOutbox(attachment_id=att.id, entry_id=att.entry_id, status="pending"))
+        self.db.commit()
+
+        class FakeResponse(io.BytesIO):
+            def release_conn(self) -> None:
+                pass
+
+        class FakeClient:
+            def get_object(self, _bucket, key):
+                if key == "k/b.md":
+                    raise RuntimeError("gone")
+                return FakeResponse(key.encode())
+
+        paths: list[str] = []
+
+        def fake_parse(path, _content_type):
+            paths.append(path)
+            with open(path, "rb") as f:
+                return f.read().decode()
+
+        cfg = WorkerConfig(
+            enabled=True, poll_interval_ms=10, batch_size=2, max_attempts=3, lock_ttl_sec=60, worker_id="w1"
+        )
+        with (
+            patch.object(storage_module, "get_minio_client", return_value=(FakeClient(), "b")),
+            patch.object(parser_module, "parse_document", side_effect=fake_parse),
+        ):
+            self.assertEqual(Worker(cfg, session_factory=lambda: self.db).run_once(), 2)
+
+        first = self.db.get(Attachment, first_id)
+        second = self.db.get(Attachment, second_id)
+        self.assertEqual(first.parse_status, "completed")
+        self.assertEqual(first.parsed_text, "k/a.md")
+        self.assertEqual(second.parse_status, "pending")
+        self.assertEqual(second.parse_last_error, "gone")
+        self.assertEqual(len(paths), 1)
+        self.assertFalse(os.path.exists(paths[0]))
+
+    def test_run_once_marks_finished_items_when_a_later_item_raises(self) -> None:
+        from app.attachment.models import Attachment, AttachmentParseOutbox
+        from app.attachment.outbox_repo import ParseCompletion
+        from app.attachment.worker import Worker, WorkerConfig
+
+        second = Attachment(
+            entry_id=self.attachment.entry_id,
+            filename="b.md",
+            original_filename="b.md",
+            file_path="k/b.md",
+            size=3,
+            content_type="text/markdown",
+            parse_status="pending",
+        )
+        self.db.add(second)
+        self.db.commit()
+        first_id, second_id = self.attachment.id, second.id
+        for att in (self.attachment, second):
+            self.db.add(AttachmentParseOutbox(attachment_id=att.id, entry_id=att.entry_id, status="pending"))
+        self.db.commit()
+
+        cfg = WorkerConfig(
+            enabled=True, poll_interval_ms=10, batch_size=2, max_attempts=3, lock_ttl_sec=60, worker_id="w1"
+        )
+        worker = Worker(cfg, session_factory=lambda: self.db)
+
+        def fake_process(_db, _repo, outbox, attachment, _now, _download):
+            if attachment.id != first_id:
+                raise RuntimeError("boom")
+            return ParseCompletion(outbox_id=outbox.id, action="succeeded")
+
+        with (
+            patch.object(worker, "_download", return_value="/nonexistent/a.md"),
+            patch.object(worker, "_process_one", side_effect=fake_process),
+        ):
+            with self.assertRaises(RuntimeError):
+                worker.run_once()
+
+        statuses = {o.attachment_id: o.status for o in self.db.query(AttachmentParseOutbox).all()}
+        self.assertEqual(statuses[first_id], "succeeded")
+        self.assertEqual(statuses[second_id], "processing")
+
+    def test_handle_error_recovers_from_failed_commit(self) -> None:
+        from sqlalchemy.exc import IntegrityError
+
+        from app.attachment.worker import Worker, WorkerConfig
+
+        cfg = WorkerConfig(
+            enabled=True, poll_interval_ms=10, batch_size=1, max_attempts=3, lock_ttl_sec=60, worker_id="w1"
+        )
+        outbox = SimpleNamespace(
+            id=self.attachment.id, attachment_id=self.attachment.id, entry_id=self.attachment.entry_id, attempts=1
+        )
+        attachment_id = self.attachment.id
+        # 制造一次失败的 flush，使会话进入待回滚状态
+        self.attachment.filename = None
+        with self.assertRaises(IntegrityError):
+            self.db.flush()
+
+        completion = Worker(cfg, session_factory=lambda: self.db)._handle_error(
+            self.db, None, outbox, self.attachment, "commit failed", datetime.now(timezone.utc)
+        )
+
+        self.assertEqual(completion.action, "retry")
+        self.db.expire_all()
+        self.assertEqual(self.db.get(type(self.attachment), attachment_id).parse_last_error, "commit failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import hashlib
+import unittest
+
+from tests._bootstrap import bootstrap_backend_imports
+
+
+bootstrap_backend_imports()
+
+
+class ColorUtilsTests(unittest.TestCase):
+    def test_pick_material_600_color_keeps_sha256_mapping(self) -> None:
+        from app.common.color_utils import MATERIAL_600_PALETTE, pick_material_600_color
+
+        for key in ["python", "  Python ", "机器学习", "a" * 300]:
+            with self.subTest(key=key):
+                raw = key.strip().lower()
+                digest = hashlib.sha256(raw.encode("utf-8")).digest()
+                expected = MATERIAL_600_PALETTE[int.from_bytes(digest[:4], "big") % len(MATERIAL_600_PALETTE)]
+                self.assertEqual(pick_material_600_color(key), expected)
+
+        self.assertEqual(pick_material_600_color(None), MATERIAL_600_PALETTE[0])
+        self.assertEqual(pick_material_600_color("   "), MATERIAL_600_PALETTE[0])
+
+    def test_is_valid_hex_color(self) -> None:
+        from app.common.color_utils import is_valid_hex_color
+
+        for value in ["#000000", "#A1b2C3", "#ffffff"]:
+            with self.subTest(value=value):
+                self.assertTrue(is_valid_hex_color(value))
+        for value in [None, "", "#", "#fff", "000000", "#0000000", "#00000g", "#aabbcc\n", "#１２３４５６", "# 12345"]:
+            with self.subTest(value=value):
+                self.assertFalse(is_valid_hex_color(value))
+
+
+if __name__ == "__main__":
+    unittest.main()
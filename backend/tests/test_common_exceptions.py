@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import unittest
+from uuid import UUID
 
 from tests._bootstrap import bootstrap_backend_imports, reset_caches
 
@@ -27,6 +28,10 @@ class ExceptionHandlersTests(unittest.TestCase):
         def http_exc():
             raise HTTPException(status_code=403, detail="Forbidden")
 
+        @app.get("/api_exc_uuid")
+        def api_exc_uuid():
+            raise ApiException(status_code=409, code=40901, message="Y", details={"id": UUID(int=1)})
+
         @app.get("/boom")
         def boom():
             raise RuntimeError("boom")
@@ -47,6 +52,12 @@ class ExceptionHandlersTests(unittest.TestCase):
         self.assertEqual(payload["message"], "X")
         self.assertEqual(payload["data"], {"d": 1})
 
+    def test_api_exception_details_serialize_uuid(self) -> None:
+        client = TestClient(self._make_app())
+        resp = client.get("/api_exc_uuid")
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.json()["data"], {"id": "00000000-0000-0000-0000-000000000001"})
+
     def test_starlette_http_exception_handler(self) -> None:
         client = TestClient(self._make_app())
         resp = client.get("/http_exc")
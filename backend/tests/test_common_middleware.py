@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+from tests._bootstrap import bootstrap_backend_imports, reset_caches
+
+
+bootstrap_backend_imports()
+reset_caches()
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.attachment import middleware as upload_middleware_module  # noqa: E402
+from app.attachment.middleware import MULTIPART_OVERHEAD_BYTES  # noqa: E402
+from app.attachment.router import router as attachment_router  # noqa: E402
+from app.common.exceptions import register_exception_handlers  # noqa: E402
+from app.common.middleware import install_middleware  # noqa: E402
+
+
+class InstallMiddlewareTests(unittest.TestCase):
+    ORIGIN = "http://localhost:5173"
+
+    def setUp(self) -> None:
+        app = FastAPI()
+        install_middleware(app, cors_origins=[self.ORIGIN])
+        register_exception_handlers(app)
+        app.include_router(attachment_router)
+        self.client = TestClient(app)
+
+    def test_oversized_cross_origin_upload_413_carries_cors_headers(self) -> None:
+        url = f"/api/attachments/entry/{uuid4()}/stream?filename=a.txt"
+        with patch.object(
+            upload_middleware_module, "get_settings", return_value=SimpleNamespace(docling_max_file_size_mb=0)
+        ):
+            resp = self.client.put(
+                url,
+                content=b"x" * (MULTIPART_OVERHEAD_BYTES + 1),
+                headers={"Origin": self.ORIGIN},
+            )
+
+        self.assertEqual(resp.status_code, 413)
+        self.assertEqual(resp.json()["code"], 41300)
+        self.assertEqual(resp.headers.get("access-control-allow-origin"), self.ORIGIN)
+
+    def test_cors_disabled_without_origins(self) -> None:
+        app = FastAPI()
+        install_middleware(app, cors_origins=[])
+
+        self.assertEqual([m.cls.__name__ for m in app.user_middleware], ["UploadSizeLimitMiddleware"])
+
+
+if __name__ == "__main__":
+    unittest.main()
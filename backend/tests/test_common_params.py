@@ -33,3 +33,9 @@ class ParseUuidCsvTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_uuid_csv("not-a-uuid")
 
+
+    def test_repeated_ids_reuse_cached_uuid(self) -> None:
+        u1 = "00000000-0000-0000-0000-000000000001"
+        first = parse_uuid_csv(u1)[0]
+        second = parse_uuid_csv(f"{u1},")[0]
+        self.assertIs(first, second)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+
+from tests._bootstrap import bootstrap_backend_imports, reset_caches
+
+
+bootstrap_backend_imports()
+reset_caches()
+
+from app.common.request_context import get_request_id, reset_request_id, set_request_id  # noqa: E402
+
+
+class RequestContextTests(unittest.TestCase):
+    def test_prefers_request_state(self) -> None:
+        request = SimpleNamespace(state=SimpleNamespace(request_id="from-state"))
+        token = set_request_id("from-context")
+        try:
+            self.assertEqual(get_request_id(request), "from-state")
+            self.assertEqual(get_request_id(), "from-context")
+        finally:
+            reset_request_id(token)
+
+    def test_falls_back_to_context_variable(self) -> None:
+        request = SimpleNamespace(state=SimpleNamespace())
+        self.assertIsNone(get_request_id(request))
+        token = set_request_id("worker-1")
+        try:
+            self.assertEqual(get_request_id(request), "worker-1")
+        finally:
+            reset_request_id(token)
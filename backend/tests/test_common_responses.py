@@ -26,3 +26,10 @@ class ApiResponseTests(unittest.TestCase):
         self.assertEqual(r.message, "Bad")
         self.assertEqual(r.data, {"x": 2})
 
+
+    def test_fail_content_matches_model_dump(self) -> None:
+        self.assertEqual(
+            ApiResponse.fail_content(40001, "Bad", {"x": 2}),
+            ApiResponse.fail(code=40001, message="Bad", data={"x": 2}).model_dump(),
+        )
+        self.assertEqual(ApiResponse.fail_content(404, "Not Found"), ApiResponse.fail(404, "Not Found").model_dump())
@@ -22,6 +22,12 @@ class ToCamelTests(unittest.TestCase):
     def test_to_camel_ignores_empty_segments(self) -> None:
         self.assertEqual(to_camel("a__b"), "aB")
 
+    def test_to_camel_is_memoized(self) -> None:
+        to_camel("created_at")
+        hits = to_camel.cache_info().hits
+        self.assertEqual(to_camel("created_at"), "createdAt")
+        self.assertEqual(to_camel.cache_info().hits, hits + 1)
+
 
 class ModelAliasTests(unittest.TestCase):
     def test_camel_model_dumps_by_alias(self) -> None:
@@ -49,11 +49,12 @@ class StorageTests(unittest.TestCase):
         captured: dict[str, object] = {}
 
         class FakeMinio:
-            def __init__(self, endpoint: str, access_key: str, secret_key: str, secure: bool):
+            def __init__(self, endpoint: str, access_key: str, secret_key: str, secure: bool, http_client=None):
                 captured["endpoint"] = endpoint
                 captured["access_key"] = access_key
                 captured["secret_key"] = secret_key
                 captured["secure"] = secure
+                captured["http_client"] = http_client
 
             def bucket_exists(self, bucket: str) -> bool:  # noqa: ARG002
                 return True
@@ -68,6 +69,37 @@ class StorageTests(unittest.TestCase):
         self.assertEqual(captured["endpoint"], "example.com:9000")
         self.assertEqual(captured["secure"], True)
 
+    def test_get_minio_client_uses_shared_pool(self) -> None:
+        os.environ["MINIO_ENDPOINT"] = "localhost:9000"
+        os.environ["MINIO_ACCESS_KEY"] = "ak"
+        os.environ["MINIO_SECRET_KEY"] = "sk"
+        os.environ["MINIO_BUCKET"] = "b"
+        os.environ["MINIO_POOL_MAXSIZE"] = "32"
+        reset_caches()
+
+        captured: dict[str, object] = {}
+
+        class FakeMinio:
+            def __init__(self, *_args, http_client=None, **_kwargs):
+                captured["http_client"] = http_client
+
+            def bucket_exists(self, bucket: str) -> bool:  # noqa: ARG002
+                return True
+
+        try:
+            with patch("app.common.storage.Minio", FakeMinio):
+                from app.common.storage import get_minio_client  # noqa: E402
+
+                first = get_minio_client()
+                second = get_minio_client()
+        finally:
+            os.environ.pop("MINIO_POOL_MAXSIZE", None)
+
+        self.assertIs(first, second)
+        pool = captured["http_client"]
+        self.assertEqual(pool.connection_pool_kw["maxsize"], 32)
+        self.assertFalse(pool.connection_pool_kw["block"])
+
     def test_get_minio_client_creates_bucket(self) -> None:
         os.environ["MINIO_ENDPOINT"] = "localhost:9000"
         os.environ["MINIO_ACCESS_KEY"] = "ak"
@@ -126,6 +158,28 @@ class StorageTests(unittest.TestCase):
             with self.assertRaises(StorageError):
                 get_minio_client()
 
+    def test_get_public_minio_client_signs_for_public_endpoint(self) -> None:
+        os.environ["MINIO_ENDPOINT"] = "minio:9000"
+        os.environ["MINIO_ACCESS_KEY"] = "ak"
+        os.environ["MINIO_SECRET_KEY"] = "sk"
+        os.environ["MINIO_BUCKET"] = "mindatlas"
+        reset_caches()
+
+        from app.common.storage import get_public_minio_client  # noqa: E402
+
+        self.assertIsNone(get_public_minio_client())
+
+        os.environ["MINIO_PUBLIC_ENDPOINT"] = "https://files.example.com"
+        reset_caches()
+        try:
+            client = get_public_minio_client()
+            url = client.presigned_get_object("mindatlas", "k/a.pdf")
+        finally:
+            os.environ.pop("MINIO_PUBLIC_ENDPOINT", None)
+
+        self.assertIs(client, get_public_minio_client())
+        self.assertTrue(url.startswith("https://files.example.com/mindatlas/k/a.pdf?"))
+
     def test_remove_object_safe_returns_true_on_not_found(self) -> None:
         reset_caches()
         from app.common.storage import remove_object_safe  # noqa: E402
@@ -159,3 +213,34 @@ class StorageTests(unittest.TestCase):
         with patch("app.common.storage.S3Error", FakeS3Error):
             ok = remove_object_safe(FakeClient(), "b", "k")
         self.assertFalse(ok)
+
+    def test_remove_objects_safe_batches_and_ignores_not_found(self) -> None:
+        reset_caches()
+        from minio.deleteobjects import DeleteError  # noqa: E402
+
+        from app.common.storage import remove_objects_safe  # noqa: E402
+
+        calls: list[list[str]] = []
+
+        class FakeClient:
+            def remove_objects(self, _bucket: str, delete_objects):  # noqa: ANN001
+                names = [obj.name for obj in delete_objects]
+                calls.append(names)
+                yield DeleteError(code="NoSuchKey", message=None, name="k/a", version_id=None)
+                yield DeleteError(code="AccessDenied", message=None, name="k/b", version_id=None)
+
+        failed = remove_objects_safe(FakeClient(), "b", ["k/a", "k/b", "k/c", "k/a"])
+
+        self.assertEqual(calls, [["k/a", "k/b", "k/c"]])
+        self.assertEqual(failed, {"k/b"})
+
+    def test_remove_objects_safe_transport_error_fails_all(self) -> None:
+        reset_caches()
+        from app.common.storage import remove_objects_safe  # noqa: E402
+
+        class FakeClient:
+            def remove_objects(self, _bucket: str, _delete_objects):  # noqa: ANN001
+                raise ConnectionError("down")
+
+        self.assertEqual(remove_objects_safe(FakeClient(), "b", ["k/a", "k/b"]), {"k/a", "k/b"})
+        self.assertEqual(remove_objects_safe(FakeClient(), "b", []), set())
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timezone
+
+from tests._bootstrap import bootstrap_backend_imports, reset_caches
+from tests._db import make_session
+
+
+bootstrap_backend_imports()
+reset_caches()
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.common.exceptions import register_exception_handlers  # noqa: E402
+from app.database import get_db  # noqa: E402
+from app.entry.router import router as entry_router  # noqa: E402
+from app.entry.schemas import EntryResponse  # noqa: E402
+
+
+class EntryApiTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db = make_session()
+
+        from app.entry.models import Entry, TimeMode  # noqa: E402
+        from app.entry_type.models import EntryType  # noqa: E402
+        from app.tag.models import Tag  # noqa: E402
+
+        et = EntryType(code="t", name="T", color="#E53935", graph_enabled=True, ai_enabled=True, enabled=True)
+        tag = Tag(name="x", color="#1E88E5")
+        self.db.add_all([et, tag])
+        self.db.commit()
+
+        self.entries = [
+            Entry(
+                title=f"e{i}",
+                summary="s" if i else None,
+                content="c",
+                type_id=et.id,
+                time_mode=TimeMode.POINT,
+                time_at=datetime(2026, 1, 1 + i, tzinfo=timezone.utc),
+                tags=[tag] if i else [],
+            )
+            for i in range(3)
+        ]
+        self.db.add_all(self.entries)
+        self.db.commit()
+
+        app = FastAPI()
+        register_exception_handlers(app)
+        app.include_router(entry_router)
+
+        def _override_get_db():  # noqa: ANN001
+            yield self.db
+
+        app.dependency_overrides[get_db] = _override_get_db
+        self.client = TestClient(app)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def _expected(self, entry) -> dict:
+        return EntryResponse.model_validate(entry).model_dump(by_alias=True, mode="json")
+
+    def test_get_entry_matches_schema_dump(self) -> None:
+        entry = self.entries[1]
+        resp = self.client.get(f"/api/entries/{entry.id}")
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()["data"]
+        self.assertEqual(data, self._expected(entry))
+        self.assertEqual(data["type"]["code"], "t")
+        self.assertEqual([t["name"] for t in data["tags"]], ["x"])
+
+    def test_search_content_matches_schema_dump(self) -> None:
+        resp = self.client.get("/api/entries?size=10")
+
+        self.assertEqual(resp.status_code, 200)
+        payload = resp.json()["data"]
+        self.assertEqual(payload["totalElements"], 3)
+        by_id = {item["id"]: item for item in payload["content"]}
+        for entry in self.entries:
+            self.assertEqual(by_id[str(entry.id)], self._expected(entry))
+
+    def test_search_accepts_csv_and_repeated_tag_ids(self) -> None:
+        tag_id = str(self.entries[1].tags[0].id)
+        other = "00000000-0000-0000-0000-000000000001"
+
+        for query in (f"tagIds={tag_id},{other}", f"tagIds={tag_id}&tagIds={other}"):
+            resp = self.client.get(f"/api/entries?{query}")
+            self.assertEqual(resp.status_code, 200, query)
+            self.assertEqual(resp.json()["data"]["totalElements"], 2, query)
+
+    def test_search_invalid_tag_ids_returns_422(self) -> None:
+        resp = self.client.get("/api/entries?tagIds=not-a-uuid")
+
+        self.assertEqual(resp.status_code, 422)
+        self.assertEqual(resp.json()["code"], 42200)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from tests._bootstrap import bootstrap_backend_imports, reset_caches
+
+
+bootstrap_backend_imports()
+reset_caches()
+
+from app.entry.models import TimeMode  # noqa: E402
+from app.entry.schemas import EntryRequest  # noqa: E402
+
+
+class EntryRequestTimeValidationTests(unittest.TestCase):
+    def _request(self, **kwargs) -> EntryRequest:
+        return EntryRequest(title="t", type_id=uuid4(), **kwargs)
+
+    def test_point_requires_time_at(self) -> None:
+        with self.assertRaisesRegex(ValidationError, "time_at is required"):
+            self._request(time_mode=TimeMode.POINT)
+        req = self._request(time_mode=TimeMode.POINT, time_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+        self.assertIs(req.time_mode, TimeMode.POINT)
+
+    def test_range_requires_ordered_bounds(self) -> None:
+        early = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        late = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+        with self.assertRaisesRegex(ValidationError, "time_from and time_to are required"):
+            self._request(time_mode=TimeMode.RANGE, time_from=early)
+        with self.assertRaisesRegex(ValidationError, "time_from must be <= time_to"):
+            self._request(time_mode=TimeMode.RANGE, time_from=late, time_to=early)
+        req = self._request(timeMode="RANGE", timeFrom=early.isoformat(), timeTo=late.isoformat())
+        self.assertIs(req.time_mode, TimeMode.RANGE)
+
+    def test_none_mode_rejected(self) -> None:
+        with self.assertRaisesRegex(ValidationError, "time_mode cannot be NONE"):
+            self._request(time_mode=TimeMode.NONE)
@@ -247,6 +247,58 @@ class EntryServiceTests(unittest.TestCase):
             0,
         )
 
+    def test_delete_batches_attachment_cleanup(self) -> None:
+        from app.attachment.models import Attachment  # noqa: E402
+        from app.entry import service as entry_service_module  # noqa: E402
+        from app.entry.models import Entry, TimeMode  # noqa: E402
+        from app.entry.service import EntryService  # noqa: E402
+        from app.lightrag.models import AttachmentIndexOutbox  # noqa: E402
+
+        entry = Entry(
+            title="t",
+            content="c",
+            type_id=self.et.id,
+            time_mode=TimeMode.POINT,
+            time_at=datetime.now(timezone.utc),
+        )
+        self.db.add(entry)
+        self.db.commit()
+        atts = [
+            Attachment(
+                entry_id=entry.id,
+                filename=name,
+                original_filename=name,
+                file_path=f"k/{name}",
+                size=1,
+                content_type="text/plain",
+                index_to_knowledge_graph=indexed,
+            )
+            for name, indexed in (("a", True), ("b", True), ("c", False))
+        ]
+        self.db.add_all(atts)
+        self.db.commit()
+        indexed_ids = {atts[0].id, atts[1].id}
+
+        removed: list[str] = []
+
+        class FakeClient:
+            pass
+
+        with (
+            patch.object(entry_service_module, "get_minio_client", return_value=(FakeClient(), "b")),
+            patch.object(
+                entry_service_module, "remove_objects_safe", side_effect=lambda _c, _b, keys: removed.extend(keys)
+            ) as remove_objects,
+        ):
+            EntryService(self.db).delete(entry.id)
+
+        remove_objects.assert_called_once()
+        self.assertEqual(sorted(removed), ["k/a", "k/b", "k/c"])
+        self.assertEqual(self.db.query(Attachment).filter(Attachment.entry_id == entry.id).count(), 0)
+        outbox = self.db.query(AttachmentIndexOutbox).filter(AttachmentIndexOutbox.entry_id == entry.id).all()
+        self.assertEqual({o.attachment_id for o in outbox}, indexed_ids)
+        self.assertEqual({(o.op, o.status, o.attempts) for o in outbox}, {("delete", "pending", 0)})
+
     def test_delete_clears_entry_tag_association(self) -> None:
         from sqlalchemy import select  # noqa: E402
 
@@ -271,3 +323,42 @@ class EntryServiceTests(unittest.TestCase):
 
         rows_after = self.db.execute(select(entry_tag).where(entry_tag.c.entry_id == entry.id)).all()
         self.assertEqual(len(rows_after), 0)
+
+    def test_search_page_loads_type_and_tags_in_batched_queries(self) -> None:
+        from sqlalchemy import event  # noqa: E402
+
+        from app.entry.models import Entry, TimeMode  # noqa: E402
+        from app.entry.schemas import EntrySearchRequest  # noqa: E402
+        from app.entry.service import EntryService  # noqa: E402
+
+        for i in range(5):
+            self.db.add(
+                Entry(
+                    title=f"e{i}",
+                    content="c",
+                    type_id=self.et.id,
+                    time_mode=TimeMode.NONE,
+                    tags=[self.tag1, self.tag2] if i % 2 else [self.tag1],
+                )
+            )
+        self.db.commit()
+        self.db.expire_all()
+
+        statements: list[str] = []
+        engine = self.db.get_bind()
+
+        def _record(conn, cursor, statement, *args):  # noqa: ANN001
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            res = EntryService(self.db).search(EntrySearchRequest(page=0, size=10))
+            codes = {e.type.code for e in res["content"]}
+            tag_count = sum(len(e.tags) for e in res["content"])
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        self.assertEqual(codes, {"t"})
+        self.assertEqual(tag_count, 7)
+        # count + 分页查询 + 类型 IN 查询 + 标签 IN 查询，与条目数无关
+        self.assertEqual(len(statements), 4)
@@ -118,6 +118,7 @@ class LightRagOutboxTests(unittest.TestCase):
         )
         self.db.add(attachment)
         self.db.commit()
+        attachment_id = attachment.id
 
         from app.entry import service as entry_service_module  # noqa: E402
 
@@ -131,7 +132,7 @@ class LightRagOutboxTests(unittest.TestCase):
         delete_events = (
             self.db.query(AttachmentIndexOutbox)
             .filter(
-                AttachmentIndexOutbox.attachment_id == attachment.id,
+                AttachmentIndexOutbox.attachment_id == attachment_id,
                 AttachmentIndexOutbox.op == "delete",
             )
             .all()
@@ -10,13 +10,16 @@ export async function uploadAttachment(
   file: File,
   indexToKnowledgeGraph: boolean = false
 ): Promise<Attachment> {
-  const formData = new FormData()
-  formData.append('file', file)
-  formData.append('index_to_knowledge_graph', String(indexToKnowledgeGraph))
+  // Raw-body upload: the backend pipes the request stream straight to object storage
+  const params = new URLSearchParams({
+    filename: file.name,
+    index_to_knowledge_graph: String(indexToKnowledgeGraph),
+  })
 
-  const response = await fetch(`/api/attachments/entry/${encodeURIComponent(entryId)}`, {
-    method: 'POST',
-    body: formData,
+  const response = await fetch(`/api/attachments/entry/${encodeURIComponent(entryId)}/stream?${params}`, {
+    method: 'PUT',
+    headers: { 'Content-Type': file.type || 'application/octet-stream' },
+    body: file,
   })
 
   if (!response.ok) {